@@ -0,0 +1,64 @@
+"""Memory allocated per Homomorphism.compose and Homomorphism.apply call.
+
+Reports the blocks and bytes that tracemalloc sees kept alive by the
+results of each call, and the peak including temporaries. Run from the
+repository root:
+
+    python -m benchmark.allocations
+"""
+import random
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+from module_theory.zmodule import ZModule
+from module_theory.homomorphism import Homomorphism
+
+SIZE = 12
+CALLS = 200
+
+
+def random_homomorphism(domain: ZModule, codomain: ZModule) -> Homomorphism:
+    return Homomorphism([
+        [random.randint(-5, 5) for _ in range(domain.dimensions())]
+        for _ in range(codomain.dimensions())
+    ], domain, codomain)
+
+
+def measure(call: Callable[[], Any]) -> tuple[float, float, float]:
+    # Blocks and bytes kept alive per call, and peak bytes during a call
+    call()
+    results: list[Any] = []
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    results.append(call())
+    _, peak = tracemalloc.get_traced_memory()
+    for _ in range(CALLS - 1):
+        results.append(call())
+    after, _ = tracemalloc.get_traced_memory()
+    statistics = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+    tracemalloc.stop()
+    blocks = sum(max(statistic.count_diff, 0) for statistic in statistics)
+    return blocks / CALLS, (after - before) / CALLS, peak - before
+
+
+def main():
+    random.seed(0)
+    module = ZModule(SIZE // 2, [6] * (SIZE // 2))
+    left = random_homomorphism(module, module)
+    right = random_homomorphism(module, module)
+    element = module.element([random.randint(-9, 9) for _ in range(SIZE)])
+
+    print(f"{'call':>8} {'live blocks':>12} {'live bytes':>11} "
+          f"{'peak bytes':>11}")
+    for name, call in (
+        ("compose", lambda: left.compose(right)),
+        ("apply", lambda: left.apply(element)),
+    ):
+        blocks, size, peak = measure(call)
+        print(f"{name:>8} {blocks:>12.1f} {size:>11.0f} {peak:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
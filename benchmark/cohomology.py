@@ -0,0 +1,57 @@
+"""Compare serial and process-pool cohomology on a long random complex.
+
+Every differential is [[0, A], [0, 0]] for a random square block A, so
+consecutive differentials compose to zero. Run from the repository root:
+
+    python -m benchmark.cohomology
+"""
+import os
+import random
+import time
+from module_theory.zmodule import ZModule
+from module_theory.homomorphism import Homomorphism
+from module_theory.cochain_complex import CochainComplex
+from module_theory.cohomology import cohomology
+
+DEGREES = 12
+BLOCK_SIZE = 30
+ENTRY_BOUND = 5
+
+
+def random_complex() -> CochainComplex:
+    module = ZModule.free(2 * BLOCK_SIZE)
+    homomorphisms = [
+        Homomorphism([
+            [0] * BLOCK_SIZE + [
+                random.randint(-ENTRY_BOUND, ENTRY_BOUND)
+                for _ in range(BLOCK_SIZE)
+            ]
+            for _ in range(BLOCK_SIZE)
+        ] + [
+            [0] * (2 * BLOCK_SIZE) for _ in range(BLOCK_SIZE)
+        ], module, module)
+        for _ in range(DEGREES - 1)
+    ]
+    return CochainComplex([module] * DEGREES, homomorphisms)
+
+
+def elapsed(workers: int | None) -> float:
+    # A fresh complex each time, so that no factorization is cached
+    random.seed(0)
+    cochain_complex = random_complex()
+    start = time.perf_counter()
+    cohomology(cochain_complex, workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'workers':>8} {'time, s':>10}")
+    print(f"{'serial':>8} {elapsed(None):>10.3f}")
+    workers = 2
+    while workers <= (os.cpu_count() or 1):
+        print(f"{workers:>8} {elapsed(workers):>10.3f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Compare row echelon and Hermite normal forms behind kernels and quotients.
+
+Reports the average and largest number of digits of the kernel and image
+rows found by KernelAndImageCalculator, and the time taken by the steps
+SubmoduleQuotient runs on its generators: reduction, then preimage_many
+of elements of their span. Run from the repository root:
+
+    python -m benchmark.hermite_normal_form
+"""
+import random
+import timeit
+from module_theory.zmodule import ZModule
+from module_theory.homomorphism import Homomorphism
+from module_theory._internal.hermite_normal_form import (
+    HermiteNormalFormCalculator
+)
+from module_theory._internal.kernel_and_image import KernelAndImageCalculator
+from module_theory._internal.reduction import reduction
+from module_theory._internal.row_echelon import RowEchelonCalculator
+
+CALCULATORS = (RowEchelonCalculator, HermiteNormalFormCalculator)
+MATRIX_COUNT = 15
+COLUMN_COUNT = 14
+ENTRY_BOUND = 9
+# Generator count, dimension of the module and rank of their span
+QUOTIENT_SIZES = ((12, 8, 6), (30, 20, 15), (60, 40, 30))
+TARGET_COUNT = 20
+REPEAT = 3
+
+
+def random_matrix(row_count: int, column_count: int) -> list[list[int]]:
+    return [
+        [random.randint(-ENTRY_BOUND, ENTRY_BOUND)
+         for _ in range(column_count)]
+        for _ in range(row_count)
+    ]
+
+
+def digits(rows: list[list[int]]) -> list[int]:
+    return [len(str(abs(value))) for row in rows for value in row if value]
+
+
+def low_rank_elements(count: int, dimension: int,
+                      rank: int) -> list[ZModule.Element]:
+    module = ZModule.free(dimension)
+    combinations = random_matrix(count, rank)
+    basis = random_matrix(rank, dimension)
+    return [
+        module.element([
+            sum(coefficient * row[column]
+                for coefficient, row in zip(combination, basis))
+            for column in range(dimension)
+        ])
+        for combination in combinations
+    ]
+
+
+def quotient_steps(elements: list[ZModule.Element],
+                   targets: list[ZModule.Element],
+                   calculator: type[RowEchelonCalculator]):
+    generators = reduction(elements, echelon_calculator=calculator)
+    Homomorphism.from_canonical_generator_images(
+        generators
+    ).preimage_many(targets)
+
+
+def main():
+    random.seed(0)
+    matrices = [
+        random_matrix(random.randint(6, 10), COLUMN_COUNT)
+        for _ in range(MATRIX_COUNT)
+    ]
+    print(f"{MATRIX_COUNT} matrices of 6-10 rows and {COLUMN_COUNT} "
+          f"columns, entries in [-{ENTRY_BOUND}, {ENTRY_BOUND}]")
+    print(f"{'calculator':>28} {'kernel digits':>14} {'max':>4}"
+          f" {'image digits':>13} {'max':>4} {'time, s':>9}")
+    for calculator in CALCULATORS:
+        kernel_digits: list[int] = []
+        image_digits: list[int] = []
+        for matrix in matrices:
+            kernel_and_image = KernelAndImageCalculator(matrix, calculator)
+            kernel_digits += digits(kernel_and_image.kernel)
+            image_digits += digits(kernel_and_image.image)
+        time = min(timeit.repeat(
+            lambda: [KernelAndImageCalculator(matrix, calculator)
+                     for matrix in matrices],
+            number=1,
+            repeat=REPEAT
+        ))
+        print(f"{calculator.__name__:>28}"
+              f" {sum(kernel_digits) / len(kernel_digits):>14.2f}"
+              f" {max(kernel_digits):>4}"
+              f" {sum(image_digits) / len(image_digits):>13.2f}"
+              f" {max(image_digits):>4} {time:>9.4f}")
+
+    print()
+    print("reduction and preimage_many, as in SubmoduleQuotient")
+    print(f"{'generators':>10} {'dimension':>10} {'rank':>5}"
+          + "".join(f" {calculator.__name__ + ', s':>30}"
+                    for calculator in CALCULATORS))
+    for count, dimension, rank in QUOTIENT_SIZES:
+        elements = low_rank_elements(count, dimension, rank)
+        targets = [
+            sum(random.sample(elements, 3), elements[0].module.zero_element())
+            for _ in range(TARGET_COUNT)
+        ]
+        times = [
+            min(timeit.repeat(
+                lambda: quotient_steps(elements, targets, calculator),
+                number=1,
+                repeat=REPEAT
+            ))
+            for calculator in CALCULATORS
+        ]
+        print(f"{count:>10} {dimension:>10} {rank:>5}"
+              + "".join(f" {time:>30.4f}" for time in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare Smith normal form strategies on dense random integer matrices.
+
+Run from the repository root:
+
+    python -m benchmark.smith_normal_form
+"""
+import random
+import timeit
+from module_theory._internal.matrix_manipulator import ChangeMatrix
+from module_theory._internal.smith_normal_form import (
+    SmithNormalFormCalculator, SmithNormalFormStrategy
+)
+
+SIZES = (10, 20, 40, 60)
+ENTRY_BOUND = 20
+REPEAT = 3
+
+
+def random_matrix(size: int) -> list[list[int]]:
+    return [
+        [random.randint(-ENTRY_BOUND, ENTRY_BOUND) for _ in range(size)]
+        for _ in range(size)
+    ]
+
+
+def best_time(array: list[list[int]],
+              strategy: SmithNormalFormStrategy) -> float:
+    return min(timeit.repeat(
+        lambda: SmithNormalFormCalculator(
+            array, change_matrices=ChangeMatrix.NONE, strategy=strategy
+        ).invariants(),
+        number=1,
+        repeat=REPEAT
+    ))
+
+
+def main():
+    random.seed(0)
+    print(f"{'size':>6} {'elimination, s':>16} {'modular, s':>12}")
+    for size in SIZES:
+        array = random_matrix(size)
+        elimination = SmithNormalFormCalculator(
+            array, change_matrices=ChangeMatrix.NONE
+        ).invariants()
+        modular = SmithNormalFormCalculator(
+            array, change_matrices=ChangeMatrix.NONE,
+            strategy=SmithNormalFormStrategy.MODULAR
+        ).invariants()
+        assert elimination == modular, "strategies disagree"
+        elimination_time = best_time(array,
+                                     SmithNormalFormStrategy.ELIMINATION)
+        modular_time = best_time(array, SmithNormalFormStrategy.MODULAR)
+        print(f"{size:>6} {elimination_time:>16.4f} {modular_time:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
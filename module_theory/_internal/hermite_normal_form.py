@@ -0,0 +1,110 @@
+from module_theory._internal.matrix import Matrix
+from module_theory._internal.matrix_manipulator import ChangeMatrix
+from module_theory._internal.row_echelon import RowEchelonCalculator
+
+
+class HermiteNormalFormCalculator(RowEchelonCalculator):
+    """Hermite normal form, built one row at a time as in Kannan-Bachem.
+
+    Each row is added to the Hermite normal form of the rows before it: its
+    entry in a pivot column is cleared by Euclid's algorithm against that
+    pivot row alone, it becomes a pivot row once its leading column has no
+    pivot, and the entries above the pivots that changed are reduced to
+    [0, pivot) again. Every intermediate matrix is thus in Hermite normal
+    form, so its entries stay bounded by the minors of the rows added so
+    far instead of growing with the number of elimination steps.
+
+    When the inverse change matrix is tracked, the rows that vanish are
+    added the same way, with their columns in that matrix, so the rows
+    below the rank, which span the left kernel, are in Hermite normal form
+    too. The result is the Hermite normal form of [A | I].
+    """
+
+    def _calculate(self) -> None:
+        # The matrix and the column of the pivot of each row, in row order;
+        # rows from len(self._pivots) on are zero or not added yet
+        self._pivots: list[tuple[Matrix, int]] = []
+        self._row_rank = 0
+        for row_index in range(self._row_count()):
+            if self._add_row(self._matrix(), row_index, 0, self._row_rank):
+                self._row_rank += 1
+            elif (ChangeMatrix.INVERSE_ROW
+                    in self._matrix_manipulator.change_matrices):
+                self._add_row(
+                    self._matrix_manipulator.inverse_row_change_matrix,
+                    row_index, self._row_rank, len(self._pivots)
+                )
+
+    def _add_row(self, matrix: Matrix, row_index: int,
+                 first_position: int, last_position: int) -> bool:
+        # Adds the row against the pivot rows in [first_position,
+        # last_position), whose pivots lie in matrix; returns whether it
+        # became a pivot row, rather than zero in matrix
+        changed_positions: set[int] = set()
+        position = first_position
+        while True:
+            nonzero_columns = matrix.nonzero_columns_in_row(row_index)
+            if not nonzero_columns:
+                self._reduce(changed_positions)
+                return False
+            leading_column = nonzero_columns[0]
+            while (position < last_position
+                   and self._pivots[position][1] < leading_column):
+                position += 1
+            if (position == last_position
+                    or self._pivots[position][1] > leading_column):
+                break
+            self._clear_entry(matrix, position, row_index, leading_column)
+            changed_positions.add(position)
+            position += 1
+
+        # Rows from position on move down to make room
+        for index in range(row_index, position, -1):
+            self._matrix_manipulator.exchange_rows(index, index - 1)
+        self._pivots.insert(position, (matrix, leading_column))
+        if matrix.entry(position, leading_column) < 0:
+            self._matrix_manipulator.multiply_row_by_negative_one(position)
+        self._reduce({
+            changed + 1 if changed >= position else changed
+            for changed in changed_positions
+        } | {position})
+        return True
+
+    def _clear_entry(self, matrix: Matrix, pivot_row_index: int,
+                     row_index: int, column_index: int):
+        # Euclid's algorithm on the two rows, leaving the gcd at the pivot
+        while matrix.entry(row_index, column_index):
+            quotient = (matrix.entry(row_index, column_index)
+                        // matrix.entry(pivot_row_index, column_index))
+            self._matrix_manipulator.add_multiple_of_row(
+                row_index, pivot_row_index, -quotient
+            )
+            if matrix.entry(row_index, column_index):
+                self._matrix_manipulator.exchange_rows(
+                    pivot_row_index, row_index
+                )
+        if matrix.entry(pivot_row_index, column_index) < 0:
+            self._matrix_manipulator.multiply_row_by_negative_one(
+                pivot_row_index
+            )
+
+    def _reduce(self, changed_positions: set[int]):
+        # The pivot rows at changed_positions have new entries and pivots,
+        # so their columns are reduced in full; elsewhere only the rows
+        # changed so far can have entries outside [0, pivot)
+        changed_rows = set(changed_positions)
+        for position, (matrix, column_index) in enumerate(self._pivots):
+            if position in changed_positions:
+                row_indices: range | list[int] = range(position)
+            else:
+                row_indices = sorted(
+                    index for index in changed_rows if index < position
+                )
+            pivot = matrix.entry(position, column_index)
+            for row_index in row_indices:
+                quotient = matrix.entry(row_index, column_index) // pivot
+                if quotient:
+                    self._matrix_manipulator.add_multiple_of_row(
+                        row_index, position, -quotient
+                    )
+                    changed_rows.add(row_index)
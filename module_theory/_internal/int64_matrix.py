@@ -0,0 +1,178 @@
+from __future__ import annotations
+from collections.abc import Iterator, Sequence
+from typing import Any
+import numpy
+from module_theory._internal.matrix import Matrix
+
+# Entries are kept strictly below this bound while stored as int64, so that a
+# sum of two admissible values can never overflow
+SAFE_MAGNITUDE = 2 ** 62
+
+
+class Int64Matrix(Matrix):
+    """Matrix stored as a numpy array.
+
+    Entries are held as numpy.int64 while they are small enough. Before each
+    elementary operation the magnitude of the result is bounded from the
+    current entries; if the bound may exceed SAFE_MAGNITUDE, the array is
+    promoted to Python integers (dtype=object) and stays promoted.
+    """
+
+    def __init__(self, array: Sequence[Sequence[int]]):
+        rows = [list(row) for row in array]
+        if any(abs(value) >= SAFE_MAGNITUDE for row in rows for value in row):
+            dtype: Any = object
+        else:
+            dtype = numpy.int64
+        values = numpy.array(rows, dtype=dtype)
+        self._values: numpy.ndarray[Any, Any] = values.reshape(
+            len(rows), len(rows[0]) if rows else 0
+        )
+
+    @property
+    def array(self) -> list[list[int]]:  # pyright: ignore
+        return self._values.tolist()
+
+    @array.setter
+    def array(self, array: Sequence[Sequence[int]]):
+        self.__init__(array)
+
+    def is_promoted(self) -> bool:
+        return self._values.dtype == object
+
+    def copy(self) -> Int64Matrix:
+        matrix = Int64Matrix([])
+        matrix._values = self._values.copy()
+        return matrix
+
+    def row_count(self) -> int:
+        return self._values.shape[0]
+
+    def column_count(self) -> int:
+        return self._values.shape[1]
+
+    def entry(self, row_index: int, column_index: int) -> int:
+        return int(self._values[row_index, column_index])
+
+    def is_zero(self):
+        return not self._values.any()
+
+    def is_submatrix_zero(self, first_row: int, first_column: int) -> bool:
+        return not self._values[first_row:, first_column:].any()
+
+    def nonzero_rows_in_column(
+        self, column_index: int, first_row: int = 0
+    ) -> list[int]:
+        (indices,) = numpy.nonzero(self._values[first_row:, column_index])
+        return (indices + first_row).tolist()
+
+    def nonzero_columns_in_row(
+        self, row_index: int, first_column: int = 0
+    ) -> list[int]:
+        (indices,) = numpy.nonzero(self._values[row_index, first_column:])
+        return (indices + first_column).tolist()
+
+    def nonzero_entries(
+        self, first_row: int = 0, first_column: int = 0
+    ) -> Iterator[tuple[int, int, int]]:
+        submatrix = self._values[first_row:, first_column:]
+        row_indices, column_indices = numpy.nonzero(submatrix)
+        for row_index, column_index in zip(row_indices.tolist(),
+                                           column_indices.tolist()):
+            yield (row_index + first_row,
+                   column_index + first_column,
+                   int(submatrix[row_index, column_index]))
+
+    def minimal_nonzero_entry(
+        self, first_row: int, first_column: int
+    ) -> tuple[int, int] | None:
+        if self.is_promoted():
+            return super().minimal_nonzero_entry(first_row, first_column)
+        submatrix = self._values[first_row:, first_column:]
+        if not submatrix.any():
+            return None
+        magnitudes = numpy.abs(submatrix)
+        magnitudes[submatrix == 0] = SAFE_MAGNITUDE
+        # argmin picks the first minimum in row-major order
+        row_index, column_index = numpy.unravel_index(
+            int(numpy.argmin(magnitudes)), magnitudes.shape
+        )
+        return int(row_index) + first_row, int(column_index) + first_column
+
+    def exchange_rows(self, first_index: int, second_index: int):
+        self._values[[first_index, second_index]] = (
+            self._values[[second_index, first_index]]
+        )
+
+    def exchange_columns(self, first_index: int, second_index: int):
+        self._values[:, [first_index, second_index]] = (
+            self._values[:, [second_index, first_index]]
+        )
+
+    def multiply_row_by_negative_one(self, row_index: int):
+        self._values[row_index] *= -1
+
+    def multiply_column_by_negative_one(self, column_index: int):
+        self._values[:, column_index] *= -1
+
+    def add_multiple_of_row(
+        self, add_to_index: int, add_index: int, multiplier: int = 1
+    ):
+        self._ensure_capacity(self._values[add_to_index],
+                              self._values[add_index],
+                              multiplier)
+        self._values[add_to_index] += multiplier * self._values[add_index]
+
+    def add_multiple_of_column(
+        self, add_to_index: int, add_index: int, multiplier: int = 1
+    ):
+        self._ensure_capacity(self._values[:, add_to_index],
+                              self._values[:, add_index],
+                              multiplier)
+        self._values[:, add_to_index] += (
+            multiplier * self._values[:, add_index]
+        )
+
+    def multiply(self, other: Int64Matrix) -> Int64Matrix:
+        if self.column_count() != other.row_count():
+            raise ValueError("matrix dimensions mismatch")
+
+        left, right = self._values, other._values
+        if self.is_promoted() or other.is_promoted():
+            left, right = left.astype(object), right.astype(object)
+        elif left.size and right.size:
+            # Every entry of the product, and every partial sum, is bounded
+            # by the inner dimension times both maximal magnitudes
+            bound = (int(numpy.abs(left).max())
+                     * int(numpy.abs(right).max())
+                     * self.column_count())
+            if bound >= SAFE_MAGNITUDE:
+                left, right = left.astype(object), right.astype(object)
+
+        product = Int64Matrix([])
+        product._values = (left @ right).reshape(
+            self.row_count(), other.column_count()
+        )
+        return product
+
+    def transpose(self):
+        self._values = self._values.T.copy()
+
+    def immutable(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(tuple(row) for row in self._values.tolist())
+
+    def _ensure_capacity(self,
+                         add_to: numpy.ndarray[Any, Any],
+                         add: numpy.ndarray[Any, Any],
+                         multiplier: int):
+        if self.is_promoted() or not add.size:
+            return
+        # Bound |add_to + multiplier * add| by max|add_to| + |multiplier| *
+        # max|add| in Python integers, which cannot overflow
+        bound = (int(numpy.abs(add_to).max())
+                 + abs(multiplier) * int(numpy.abs(add).max()))
+        if bound >= SAFE_MAGNITUDE or abs(multiplier) >= SAFE_MAGNITUDE:
+            self._promote()
+
+    def _promote(self):
+        self._values = self._values.astype(object)
@@ -1,15 +1,33 @@
 from __future__ import annotations
 from collections.abc import Sequence
 from module_theory._internal.matrix import Matrix
+from module_theory._internal.matrix_manipulator import ChangeMatrix
 from module_theory._internal.row_echelon import RowEchelonCalculator
+from module_theory._internal.smith_normal_form_cache import cached_matrices
 
 
 class KernelAndImageCalculator:
-    def __init__(self, array: Sequence[Sequence[int]]):
-        matrix = Matrix(array)
-        matrix.transpose()
-        calculator = RowEchelonCalculator(matrix)
-        self.kernel = (calculator.inverse_change_matrix()
-                                 .array[calculator.row_rank():])
-        self.image = (calculator.row_echelon()
-                                .array[:calculator.row_rank()])
+    def __init__(self, array: Sequence[Sequence[int]] | Matrix,
+                 echelon_calculator: type[RowEchelonCalculator] = (
+                     RowEchelonCalculator
+                 )):
+        def calculate() -> list[list[list[int]]]:
+            if isinstance(array, Matrix):
+                matrix = array.copy()
+            else:
+                matrix = Matrix(array)
+            matrix.transpose()
+            calculator = echelon_calculator(matrix, ChangeMatrix.INVERSE_ROW)
+            return [
+                calculator.inverse_change_matrix()
+                          .array[calculator.row_rank():],
+                calculator.row_echelon().array[:calculator.row_rank()]
+            ]
+
+        kernel, image = cached_matrices(
+            "kernel_and_image_" + echelon_calculator.__name__,
+            array,
+            calculate
+        )
+        self.kernel: list[list[int]] = [list(row) for row in kernel]
+        self.image: list[list[int]] = [list(row) for row in image]
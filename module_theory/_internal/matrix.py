@@ -1,4 +1,6 @@
-from collections.abc import Sequence
+from __future__ import annotations
+from collections.abc import Iterator, Sequence
+from typing import Self
 
 
 class Matrix:
@@ -7,15 +9,78 @@ class Matrix:
             list(row) for row in array
         )
 
+    @classmethod
+    def identity(cls, size: int) -> Self:
+        return cls([
+            [1 if row == column else 0 for column in range(size)]
+            for row in range(size)
+        ])
+
+    def copy(self) -> Self:
+        return type(self)(self.array)
+
     def row_count(self) -> int:
         return len(self.array)
 
     def column_count(self) -> int:
         return len(self.array[0])
 
+    def entry(self, row_index: int, column_index: int) -> int:
+        return self.array[row_index][column_index]
+
     def is_zero(self):
         return all(not value for row in self.array for value in row)
 
+    def is_submatrix_zero(self, first_row: int, first_column: int) -> bool:
+        return all(
+            not value
+            for row in self.array[first_row:]
+            for value in row[first_column:]
+        )
+
+    def nonzero_rows_in_column(
+        self, column_index: int, first_row: int = 0
+    ) -> list[int]:
+        return [
+            row_index
+            for row_index in range(first_row, self.row_count())
+            if self.array[row_index][column_index]
+        ]
+
+    def nonzero_columns_in_row(
+        self, row_index: int, first_column: int = 0
+    ) -> list[int]:
+        row = self.array[row_index]
+        return [
+            column_index
+            for column_index in range(first_column, len(row))
+            if row[column_index]
+        ]
+
+    def nonzero_entries(
+        self, first_row: int = 0, first_column: int = 0
+    ) -> Iterator[tuple[int, int, int]]:
+        # Entries are listed in row-major order
+        for row_index in range(first_row, self.row_count()):
+            row = self.array[row_index]
+            for column_index in range(first_column, len(row)):
+                if row[column_index]:
+                    yield row_index, column_index, row[column_index]
+
+    def minimal_nonzero_entry(
+        self, first_row: int, first_column: int
+    ) -> tuple[int, int] | None:
+        # The first entry in row-major order wins a tie
+        min_nonzero_value = 0
+        position = None
+        for row_index, column_index, value in self.nonzero_entries(
+            first_row, first_column
+        ):
+            if position is None or abs(value) < min_nonzero_value:
+                min_nonzero_value = abs(value)
+                position = (row_index, column_index)
+        return position
+
     def exchange_rows(self, first_index: int, second_index: int):
         self.array[first_index], self.array[second_index] = (
             self.array[second_index], self.array[first_index]
@@ -1,42 +1,72 @@
+from __future__ import annotations
+from enum import Flag, auto
 from module_theory._internal.matrix import Matrix
 
 
+class ChangeMatrix(Flag):
+    NONE = 0
+    ROW = auto()
+    INVERSE_ROW = auto()
+    COLUMN = auto()
+    INVERSE_COLUMN = auto()
+    ALL = ROW | INVERSE_ROW | COLUMN | INVERSE_COLUMN
+
+
 class MatrixManipulator:
-    def __init__(self, matrix: Matrix):
+    def __init__(self, matrix: Matrix,
+                 change_matrices: ChangeMatrix = ChangeMatrix.ALL):
         self._matrix: Matrix = matrix
+        self._change_matrices: ChangeMatrix = change_matrices
 
-        self._row_change_matrix: Matrix = (
-            self._trivial_change_matrix(self.row_count())
+        # Only the requested change matrices are allocated and updated
+        self._row_change_matrix: Matrix | None = (
+            matrix.identity(self.row_count())
+            if ChangeMatrix.ROW in change_matrices else None
         )
-        self._inverse_row_change_matrix: Matrix = (
-            self._trivial_change_matrix(self.row_count())
+        self._inverse_row_change_matrix: Matrix | None = (
+            matrix.identity(self.row_count())
+            if ChangeMatrix.INVERSE_ROW in change_matrices else None
         )
-        self._column_change_matrix: Matrix = (
-            self._trivial_change_matrix(self.column_count())
+        self._column_change_matrix: Matrix | None = (
+            matrix.identity(self.column_count())
+            if ChangeMatrix.COLUMN in change_matrices else None
         )
-        self._inverse_column_change_matrix: Matrix = (
-            self._trivial_change_matrix(self.column_count())
+        self._inverse_column_change_matrix: Matrix | None = (
+            matrix.identity(self.column_count())
+            if ChangeMatrix.INVERSE_COLUMN in change_matrices else None
         )
 
     @property
     def matrix(self) -> Matrix:
         return self._matrix
 
+    @property
+    def change_matrices(self) -> ChangeMatrix:
+        return self._change_matrices
+
     @property
     def row_change_matrix(self) -> Matrix:
-        return self._row_change_matrix
+        return self._tracked(self._row_change_matrix, ChangeMatrix.ROW)
 
     @property
     def inverse_row_change_matrix(self) -> Matrix:
-        return self._inverse_row_change_matrix
+        return self._tracked(self._inverse_row_change_matrix,
+                             ChangeMatrix.INVERSE_ROW)
 
     @property
     def column_change_matrix(self) -> Matrix:
-        return self._column_change_matrix
+        return self._tracked(self._column_change_matrix, ChangeMatrix.COLUMN)
 
     @property
     def inverse_column_change_matrix(self) -> Matrix:
-        return self._inverse_column_change_matrix
+        return self._tracked(self._inverse_column_change_matrix,
+                             ChangeMatrix.INVERSE_COLUMN)
+
+    @staticmethod
+    def _tracked(matrix: Matrix | None, change_matrix: ChangeMatrix) -> Matrix:
+        if matrix is None:
+            raise RuntimeError(f"{change_matrix} is not tracked")
+        return matrix
 
     def _array(self) -> list[list[int]]:
         return self._matrix.array
@@ -49,20 +79,32 @@ class MatrixManipulator:
 
     def exchange_rows(self, first_index: int, second_index: int):
         self.matrix.exchange_rows(first_index, second_index)
-        self.inverse_row_change_matrix.exchange_rows(first_index, second_index)
-        self.row_change_matrix.exchange_columns(first_index, second_index)
+        if self._inverse_row_change_matrix is not None:
+            self._inverse_row_change_matrix.exchange_rows(first_index,
+                                                          second_index)
+        if self._row_change_matrix is not None:
+            self._row_change_matrix.exchange_columns(first_index,
+                                                     second_index)
 
     def exchange_columns(self, first_index: int, second_index: int):
         self.matrix.exchange_columns(first_index, second_index)
-        self.inverse_column_change_matrix.exchange_rows(
-            first_index, second_index
-        )
-        self.column_change_matrix.exchange_columns(first_index, second_index)
+        if self._inverse_column_change_matrix is not None:
+            self._inverse_column_change_matrix.exchange_rows(first_index,
+                                                             second_index)
+        if self._column_change_matrix is not None:
+            self._column_change_matrix.exchange_columns(first_index,
+                                                        second_index)
 
     def multiply_row_by_negative_one(self, row_index: int):
         self.matrix.multiply_row_by_negative_one(row_index)
-        self.inverse_row_change_matrix.multiply_row_by_negative_one(row_index)
-        self.row_change_matrix.multiply_column_by_negative_one(row_index)
+        if self._inverse_row_change_matrix is not None:
+            self._inverse_row_change_matrix.multiply_row_by_negative_one(
+                row_index
+            )
+        if self._row_change_matrix is not None:
+            self._row_change_matrix.multiply_column_by_negative_one(
+                row_index
+            )
 
     def add_multiple_of_row(
         self, add_to_index: int, add_index: int, multiplier: int = 1
@@ -71,12 +113,14 @@ class MatrixManipulator:
             self._row_rank = None
 
         self.matrix.add_multiple_of_row(add_to_index, add_index, multiplier)
-        self.inverse_row_change_matrix.add_multiple_of_row(add_to_index,
-                                                           add_index,
-                                                           multiplier)
-        self.row_change_matrix.add_multiple_of_column(add_index,
-                                                      add_to_index,
-                                                      -multiplier)
+        if self._inverse_row_change_matrix is not None:
+            self._inverse_row_change_matrix.add_multiple_of_row(add_to_index,
+                                                                add_index,
+                                                                multiplier)
+        if self._row_change_matrix is not None:
+            self._row_change_matrix.add_multiple_of_column(add_index,
+                                                           add_to_index,
+                                                           -multiplier)
 
     def add_multiple_of_column(
         self, add_to_index: int, add_index: int, multiplier: int = 1
@@ -85,46 +129,47 @@ class MatrixManipulator:
             self._row_rank = None
 
         self.matrix.add_multiple_of_column(add_to_index, add_index, multiplier)
-        self.inverse_column_change_matrix.add_multiple_of_row(add_index,
-                                                              add_to_index,
-                                                              -multiplier)
-        self.column_change_matrix.add_multiple_of_column(add_to_index,
-                                                         add_index,
-                                                         multiplier)
+        if self._inverse_column_change_matrix is not None:
+            self._inverse_column_change_matrix.add_multiple_of_row(
+                add_index, add_to_index, -multiplier
+            )
+        if self._column_change_matrix is not None:
+            self._column_change_matrix.add_multiple_of_column(add_to_index,
+                                                              add_index,
+                                                              multiplier)
 
     def reduce_rows_by_pivot(
         self, pivot_row_index: int, pivot_column_index: int
     ):
         pivot_value: int = (
-            self._array()[pivot_row_index][pivot_column_index]
+            self.matrix.entry(pivot_row_index, pivot_column_index)
         )
 
-        for row_index in range(pivot_row_index + 1, self.row_count()):
+        for row_index in self.matrix.nonzero_rows_in_column(
+            pivot_column_index, pivot_row_index + 1
+        ):
             multiplier: int = (
-                self._array()[row_index][pivot_column_index] // pivot_value
-            )
-            self.add_multiple_of_row(
-                row_index, pivot_row_index, -multiplier
+                self.matrix.entry(row_index, pivot_column_index) // pivot_value
             )
+            if multiplier:
+                self.add_multiple_of_row(
+                    row_index, pivot_row_index, -multiplier
+                )
 
     def reduce_columns_by_pivot(
         self, pivot_row_index: int, pivot_column_index: int
     ):
         pivot_value: int = (
-            self._array()[pivot_row_index][pivot_column_index]
+            self.matrix.entry(pivot_row_index, pivot_column_index)
         )
 
-        for column_index in range(pivot_column_index + 1, self.column_count()):
+        for column_index in self.matrix.nonzero_columns_in_row(
+            pivot_row_index, pivot_column_index + 1
+        ):
             multiplier: int = (
-                self._array()[pivot_row_index][column_index] // pivot_value
+                self.matrix.entry(pivot_row_index, column_index) // pivot_value
             )
-            self.add_multiple_of_column(
-                column_index, pivot_column_index, -multiplier
-            )
-
-    @staticmethod
-    def _trivial_change_matrix(row_count: int) -> Matrix:
-        return Matrix([
-            [1 if row == column else 0 for column in range(row_count)]
-            for row in range(row_count)
-        ])
+            if multiplier:
+                self.add_multiple_of_column(
+                    column_index, pivot_column_index, -multiplier
+                )
@@ -0,0 +1,496 @@
+from collections.abc import Iterator, Sequence
+from functools import cache
+from math import gcd, isqrt, prod
+from typing import Any
+import importlib.util
+
+# Residues modulo a number below this bound are stored as int64: the
+# product of two of them stays below 2^62
+WORD_MODULUS_BOUND = 2 ** 31
+# The determinant is factored by trial division by the primes below this
+TRIAL_DIVISION_BOUND = 2 ** 16
+# numpy is optional; with it, word-size residues of matrices with at least
+# this many entries are numpy arrays, below which lists are faster
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+NUMPY_ENTRY_THRESHOLD = 400
+
+# Rows of residues: a 2-D int64 array, or lists of Python integers
+Residues = Any
+
+
+def maximal_minor_determinant(
+    array: Sequence[Sequence[int]]
+) -> tuple[int, int]:
+    """Rank of the matrix and |det| of one of its maximal nonsingular minors.
+
+    Both are found modulo word-size primes. The rank modulo a prime is at
+    most the rank, and it is the rank once the product of the primes tried
+    exceeds the Hadamard bound of the minors, since every larger minor is
+    then divisible by a number greater than its absolute value. The
+    determinant of the minor found at the first prime of that rank is put
+    together from its residues by the Chinese remainder theorem.
+    """
+    matrix = [list(row) for row in array]
+    bound = _minor_bound(matrix)
+    rank = 0
+    rows: list[int] = []
+    columns: list[int] = []
+    determinant, modulus = 1, 1
+
+    for prime in _word_primes():
+        prime_rows, prime_columns, pivot_product = _echelon_modulo(
+            matrix, prime
+        )
+        if len(prime_rows) > rank or modulus == 1:
+            rank = len(prime_rows)
+            rows, columns = sorted(prime_rows), prime_columns
+            determinant, modulus = 0, 1
+        if sorted(prime_rows) == rows and prime_columns == columns:
+            residue = _permutation_sign(prime_rows) * pivot_product
+        else:
+            minor_rows, _, pivot_product = _echelon_modulo(
+                [[matrix[row][column] for column in columns]
+                 for row in rows],
+                prime
+            )
+            residue = (
+                _permutation_sign(minor_rows) * pivot_product
+                if len(minor_rows) == rank else 0
+            )
+        # Chinese remainder theorem, keeping determinant in [0, modulus)
+        determinant += modulus * (
+            (residue - determinant) * pow(modulus, -1, prime) % prime
+        )
+        modulus *= prime
+        if modulus > 2 * bound:
+            break
+
+    if 2 * determinant > modulus:
+        determinant -= modulus
+    return rank, abs(determinant)
+
+
+def invariant_factors_modulo(
+    array: Sequence[Sequence[int]], rank: int, modulus: int
+) -> tuple[int, ...]:
+    """Nonzero invariant factors of a matrix of the given rank.
+
+    The modulus must be a multiple of the product of the invariant factors,
+    e.g. the determinant of a maximal nonsingular minor. Then the matrix
+    [A | modulus * I] has the same first rank invariant factors as A, and
+    each of them divides the modulus. The modulus is factored by trial
+    division, and the part of the invariant factors at each prime power
+    p^e found is read off an elimination modulo p^e, on int64 residues when
+    p^e is word-size. A cofactor without small prime factors is handled by
+    an elimination modulo it with unit pivots, split by a gcd whenever an
+    entry shares a factor with it.
+    """
+    if modulus == 1:
+        return (1,) * rank
+
+    matrix = [list(row) for row in array]
+    prime_powers, cofactor = _factor(modulus)
+    diagonal = [1] * rank
+    for prime, exponent in prime_powers:
+        for index, factor in enumerate(
+            _local_invariant_factors(matrix, rank, prime, exponent)
+        ):
+            diagonal[index] *= factor
+    if cofactor > 1:
+        for index, factor in enumerate(
+            _cofactor_invariant_factors(matrix, rank, cofactor)
+        ):
+            diagonal[index] *= factor
+    return tuple(diagonal)
+
+
+def _minor_bound(matrix: list[list[int]]) -> int:
+    # Hadamard: no minor exceeds the product of the norms of its rows
+    bound = 1
+    for row in matrix:
+        norm_squared = sum(value * value for value in row)
+        if norm_squared:
+            bound *= isqrt(norm_squared - 1) + 1
+    return bound
+
+
+def _is_prime(number: int) -> bool:
+    # Miller-Rabin with the bases 2, 7 and 61 is exact below 2^32
+    if number < 2:
+        return False
+    for prime in (2, 3, 5, 7, 61):
+        if number % prime == 0:
+            return number == prime
+    odd_part, twos = number - 1, 0
+    while not odd_part % 2:
+        odd_part //= 2
+        twos += 1
+    for base in (2, 7, 61):
+        value = pow(base, odd_part, number)
+        if value in (1, number - 1):
+            continue
+        for _ in range(twos - 1):
+            value = value * value % number
+            if value == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _word_primes() -> Iterator[int]:
+    # The primes below WORD_MODULUS_BOUND, largest first
+    candidate = WORD_MODULUS_BOUND - 1
+    while candidate > 2:
+        if _is_prime(candidate):
+            yield candidate
+        candidate -= 2
+
+
+@cache
+def _small_primes() -> tuple[int, ...]:
+    sieve = bytearray([1]) * TRIAL_DIVISION_BOUND
+    sieve[:2] = b"\0\0"
+    for number in range(2, isqrt(TRIAL_DIVISION_BOUND - 1) + 1):
+        if sieve[number]:
+            sieve[number * number::number] = bytes(
+                len(range(number * number, TRIAL_DIVISION_BOUND, number))
+            )
+    return tuple(
+        number for number in range(TRIAL_DIVISION_BOUND) if sieve[number]
+    )
+
+
+@cache
+def _small_prime_product() -> int:
+    return prod(_small_primes())
+
+
+def _factor(number: int) -> tuple[list[tuple[int, int]], int]:
+    # Prime powers found by trial division, and the cofactor left over;
+    # only the primes dividing one gcd with their product are tried
+    prime_powers: list[tuple[int, int]] = []
+    common = gcd(number, _small_prime_product())
+    for prime in _small_primes():
+        if prime > common:
+            break
+        if common % prime:
+            continue
+        common //= prime
+        exponent = 0
+        while not number % prime:
+            number //= prime
+            exponent += 1
+        prime_powers.append((prime, exponent))
+    if 1 < number < TRIAL_DIVISION_BOUND ** 2:
+        # Without a factor below its square root, it is prime
+        prime_powers.append((number, 1))
+        number = 1
+    return prime_powers, number
+
+
+def _permutation_sign(indices: Sequence[int]) -> int:
+    inversions = sum(
+        1 for position, index in enumerate(indices)
+        for other in indices[position + 1:] if other < index
+    )
+    return -1 if inversions % 2 else 1
+
+
+def _residues(matrix: list[list[int]], modulus: int) -> Residues:
+    rows = [[value % modulus for value in row] for row in matrix]
+    entry_count = len(rows) * len(rows[0]) if rows else 0
+    if (NUMPY_AVAILABLE and modulus < WORD_MODULUS_BOUND
+            and entry_count >= NUMPY_ENTRY_THRESHOLD):
+        import numpy
+        return numpy.array(rows, dtype=numpy.int64)
+    return rows
+
+
+def _exchange_rows(values: Residues, first: int, second: int):
+    if isinstance(values, list):
+        values[first], values[second] = values[second], values[first]
+    else:
+        values[[first, second]] = values[[second, first]]
+
+
+def _exchange_columns(values: Residues, first: int, second: int):
+    if isinstance(values, list):
+        for row in values:
+            row[first], row[second] = row[second], row[first]
+    else:
+        values[:, [first, second]] = values[:, [second, first]]
+
+
+def _nondivisible_position(
+    values: Residues, first_row: int, first_column: int, last_column: int,
+    divisor: int
+) -> tuple[int, int] | None:
+    # The first entry of values[first_row:, first_column:last_column] in
+    # row-major order that the divisor does not divide
+    if isinstance(values, list):
+        return next(
+            ((row_index, column_index)
+             for row_index in range(first_row, len(values))
+             for column_index in range(first_column, last_column)
+             if values[row_index][column_index] % divisor),
+            None
+        )
+    import numpy
+    positions = numpy.argwhere(
+        values[first_row:, first_column:last_column] % divisor
+    )
+    if not len(positions):
+        return None
+    row_index, column_index = positions[0]
+    return first_row + int(row_index), first_column + int(column_index)
+
+
+def _eliminate_below(values: Residues, pivot_index: int, column_index: int,
+                     inverse: int, modulus: int):
+    # Subtracts from each row below the pivot row the multiple of it that
+    # clears the column, given the inverse of the unit part of the pivot
+    # and with the entries of the column divisible by the pivot
+    pivot_row = values[pivot_index]
+    pivot = int(pivot_row[column_index])
+    divisor = pivot * inverse % modulus
+    if isinstance(values, list):
+        for row in values[pivot_index + 1:]:
+            factor = row[column_index] // divisor * inverse % modulus
+            if factor:
+                for index in range(column_index, len(row)):
+                    row[index] = (
+                        row[index] - factor * pivot_row[index]
+                    ) % modulus
+        return
+    factors = (
+        values[pivot_index + 1:, column_index] // divisor * inverse % modulus
+    )
+    values[pivot_index + 1:, column_index:] = (
+        values[pivot_index + 1:, column_index:]
+        - factors[:, None] * pivot_row[column_index:]
+    ) % modulus
+
+
+def _echelon_modulo(
+    matrix: list[list[int]], prime: int
+) -> tuple[list[int], list[int], int]:
+    # Pivot rows, as indices into matrix in pivot order, pivot columns and
+    # the product of the pivots of a row echelon form modulo the prime
+    values = _residues(matrix, prime)
+    row_count = len(matrix)
+    column_count = len(matrix[0]) if matrix else 0
+    row_order = list(range(row_count))
+    columns: list[int] = []
+    pivot_product = 1
+    for column_index in range(column_count):
+        pivot_index = len(columns)
+        if pivot_index == row_count:
+            break
+        position = _nondivisible_position(
+            values, pivot_index, column_index, column_index + 1, prime
+        )
+        if position is None:
+            continue
+        row_index = position[0]
+        _exchange_rows(values, pivot_index, row_index)
+        row_order[pivot_index], row_order[row_index] = (
+            row_order[row_index], row_order[pivot_index]
+        )
+        pivot = int(values[pivot_index][column_index])
+        pivot_product = pivot_product * pivot % prime
+        _eliminate_below(values, pivot_index, column_index,
+                         pow(pivot, -1, prime), prime)
+        columns.append(column_index)
+    return row_order[:len(columns)], columns, pivot_product
+
+
+def _local_invariant_factors(matrix: list[list[int]], rank: int,
+                             prime: int, exponent: int) -> list[int]:
+    # Over Z/p^e every entry is a unit times a power of p, so an entry of
+    # least valuation divides all others and clears its row and column in
+    # one pass; only the rows are cleared, since clearing the pivot row
+    # afterwards does not change the rest of the matrix
+    modulus = prime ** exponent
+    values = _residues(matrix, modulus)
+    column_count = len(matrix[0]) if matrix else 0
+    diagonal: list[int] = []
+    valuation = 0
+
+    for pivot_index in range(rank):
+        position = None
+        while position is None and valuation < exponent:
+            # Valuations of the pivots never decrease
+            divisor = prime ** (valuation + 1)
+            position = _nondivisible_position(
+                values, pivot_index, pivot_index, column_count, divisor
+            )
+            if position is None:
+                valuation += 1
+        if position is None:
+            # The remaining invariant factors vanish modulo p^e, and their
+            # p-parts divide it, so they are equal to it
+            diagonal.extend([modulus] * (rank - pivot_index))
+            break
+        row_index, column_index = position
+        _exchange_rows(values, pivot_index, row_index)
+        _exchange_columns(values, pivot_index, column_index)
+        unit = int(values[pivot_index][pivot_index]) // prime ** valuation
+        _eliminate_below(values, pivot_index, pivot_index,
+                         pow(unit, -1, modulus), modulus)
+        diagonal.append(prime ** valuation)
+
+    return diagonal
+
+
+def _cofactor_invariant_factors(matrix: list[list[int]], rank: int,
+                                modulus: int) -> list[int]:
+    # As _local_invariant_factors, for a modulus that could not be
+    # factored: the first nonzero entry left is either a unit, and a pivot,
+    # or shares a proper factor with the modulus, which is then split
+    values = _residues(matrix, modulus)
+    column_count = len(matrix[0]) if matrix else 0
+    diagonal: list[int] = []
+
+    for pivot_index in range(rank):
+        position = _nondivisible_position(
+            values, pivot_index, pivot_index, column_count, modulus
+        )
+        if position is None:
+            diagonal.extend([modulus] * (rank - pivot_index))
+            break
+        row_index, column_index = position
+        divisor = gcd(int(values[row_index][column_index]), modulus)
+        if divisor > 1:
+            if gcd(divisor, modulus // divisor) > 1:
+                return _gcd_invariant_factors(
+                    matrix, rank, modulus
+                )
+            return [
+                first * second for first, second in zip(
+                    _cofactor_invariant_factors(matrix, rank, divisor),
+                    _cofactor_invariant_factors(
+                        matrix, rank, modulus // divisor
+                    )
+                )
+            ]
+        _exchange_rows(values, pivot_index, row_index)
+        _exchange_columns(values, pivot_index, column_index)
+        _eliminate_below(
+            values, pivot_index, pivot_index,
+            pow(int(values[pivot_index][pivot_index]), -1, modulus), modulus
+        )
+        diagonal.append(1)
+
+    return diagonal
+
+
+def _gcd_invariant_factors(
+    matrix: list[list[int]], rank: int, modulus: int
+) -> list[int]:
+    # gcd of each invariant factor with a modulus whose factors could not
+    # be separated; the elimination uses extended-gcd steps, since a pivot
+    # need not divide the other entries
+    matrix = [[_reduce(value, modulus) for value in row] for row in matrix]
+    row_count = len(matrix)
+    column_count = len(matrix[0]) if matrix else 0
+    diagonal: list[int] = []
+
+    for pivot_index in range(rank):
+        position = next(
+            ((row_index, column_index)
+             for row_index in range(pivot_index, row_count)
+             for column_index in range(pivot_index, column_count)
+             if matrix[row_index][column_index]),
+            None
+        )
+        if position is None:
+            diagonal.extend([modulus] * (rank - pivot_index))
+            break
+        row_index, column_index = position
+        _exchange_rows(matrix, pivot_index, row_index)
+        _exchange_columns(matrix, pivot_index, column_index)
+
+        while True:
+            _clear_column(matrix, pivot_index, modulus)
+            _clear_row(matrix, pivot_index, modulus)
+            if any(matrix[row_index][pivot_index]
+                   for row_index in range(pivot_index + 1, row_count)):
+                continue
+
+            # In Z/modulus the pivot generates the same ideal as its gcd
+            # with the modulus, which must divide every remaining entry
+            divisor = gcd(matrix[pivot_index][pivot_index], modulus)
+            nondivisible_row = next(
+                (row_index for row_index in range(pivot_index + 1, row_count)
+                 if any(value % divisor
+                        for value in matrix[row_index][pivot_index + 1:])),
+                None
+            )
+            if nondivisible_row is None:
+                break
+            pivot_row = matrix[pivot_index]
+            for index, value in enumerate(matrix[nondivisible_row]):
+                pivot_row[index] = _reduce(pivot_row[index] + value, modulus)
+
+        diagonal.append(gcd(matrix[pivot_index][pivot_index], modulus))
+
+    return diagonal
+
+
+def _reduce(value: int, modulus: int) -> int:
+    # Symmetric residue, to keep magnitudes at most modulus / 2
+    value %= modulus
+    return value - modulus if 2 * value > modulus else value
+
+
+def _extended_gcd(first: int, second: int) -> tuple[int, int, int]:
+    # Returns (g, x, y) with x * first + y * second == g == gcd(first, second)
+    old_remainder, remainder = first, second
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while remainder:
+        quotient = old_remainder // remainder
+        old_remainder, remainder = (
+            remainder, old_remainder - quotient * remainder
+        )
+        old_x, x = x, old_x - quotient * x
+        old_y, y = y, old_y - quotient * y
+    if old_remainder < 0:
+        return -old_remainder, -old_x, -old_y
+    return old_remainder, old_x, old_y
+
+
+def _elimination_step(first: int, second: int) -> tuple[int, int, int, int]:
+    # Coefficients (a, b, c, d) of a unimodular transformation with
+    # a * first + b * second == gcd and c * first + d * second == 0
+    if second % first == 0:
+        return 1, 0, -(second // first), 1
+    divisor, x, y = _extended_gcd(first, second)
+    return x, y, -(second // divisor), first // divisor
+
+
+def _clear_column(matrix: list[list[int]], pivot_index: int, modulus: int):
+    pivot_row = matrix[pivot_index]
+    for row in matrix[pivot_index + 1:]:
+        if not row[pivot_index]:
+            continue
+        a, b, c, d = _elimination_step(pivot_row[pivot_index],
+                                       row[pivot_index])
+        for index in range(pivot_index, len(row)):
+            pivot_value, value = pivot_row[index], row[index]
+            pivot_row[index] = _reduce(a * pivot_value + b * value, modulus)
+            row[index] = _reduce(c * pivot_value + d * value, modulus)
+
+
+def _clear_row(matrix: list[list[int]], pivot_index: int, modulus: int):
+    pivot_row = matrix[pivot_index]
+    for column_index in range(pivot_index + 1, len(pivot_row)):
+        if not pivot_row[column_index]:
+            continue
+        a, b, c, d = _elimination_step(pivot_row[pivot_index],
+                                       pivot_row[column_index])
+        for row in matrix[pivot_index:]:
+            pivot_value, value = row[pivot_index], row[column_index]
+            row[pivot_index] = _reduce(a * pivot_value + b * value, modulus)
+            row[column_index] = _reduce(c * pivot_value + d * value, modulus)
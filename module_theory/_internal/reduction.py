@@ -1,10 +1,14 @@
 from collections.abc import Sequence
 from module_theory.zmodule import ZModule
 from module_theory._internal.matrix import Matrix
+from module_theory._internal.matrix_manipulator import ChangeMatrix
 from module_theory._internal.row_echelon import RowEchelonCalculator
 
 
-def reduction(elements: Sequence[ZModule.Element]) -> list[ZModule.Element]:
+def reduction(
+    elements: Sequence[ZModule.Element],
+    echelon_calculator: type[RowEchelonCalculator] = RowEchelonCalculator
+) -> list[ZModule.Element]:
     if not elements:
         return []
 
@@ -12,7 +16,9 @@ def reduction(elements: Sequence[ZModule.Element]) -> list[ZModule.Element]:
         element.coordinates for element in elements
     ])
 
-    reduced_matrix = RowEchelonCalculator(matrix).row_echelon()
+    reduced_matrix = echelon_calculator(
+        matrix, ChangeMatrix.NONE
+    ).row_echelon()
 
     module = elements[0].module
 
@@ -1,10 +1,21 @@
 from module_theory._internal.matrix import Matrix
-from module_theory._internal.matrix_manipulator import MatrixManipulator
+from module_theory._internal.matrix_manipulator import (
+    ChangeMatrix, MatrixManipulator
+)
 
 
 class RowEchelonCalculator:
-    def __init__(self, matrix: Matrix):
-        self._matrix_manipulator: MatrixManipulator = MatrixManipulator(matrix)
+    def __init__(self, matrix: Matrix,
+                 change_matrices: ChangeMatrix = (
+                     ChangeMatrix.ROW | ChangeMatrix.INVERSE_ROW
+                 )):
+        # Only row operations are performed, so column change matrices are
+        # never tracked; pass ChangeMatrix.NONE if only the echelon form
+        # and the rank are needed
+        self._matrix_manipulator: MatrixManipulator = MatrixManipulator(
+            matrix, change_matrices & (ChangeMatrix.ROW
+                                       | ChangeMatrix.INVERSE_ROW)
+        )
         self._complete = False
         self._calculate()
         self._complete = True
@@ -34,40 +45,64 @@ class RowEchelonCalculator:
     def _column_count(self) -> int:
         return self._matrix_manipulator.matrix.column_count()
 
-    def _prepare_row_reduce_step(
-        self, pivot_row_index: int, pivot_column_index: int
-    ):
-        pivot_column_nonzero_entries = [
-            (index, abs(row[pivot_column_index]))
-            for (index, row) in enumerate(self._array())
-            if index >= pivot_row_index and row[pivot_column_index] != 0
+    def _matrix(self) -> Matrix:
+        return self._matrix_manipulator.matrix
+
+    def _row_reduce_step(
+        self,
+        pivot_row_index: int,
+        pivot_column_index: int,
+        nonzero_rows: list[int]
+    ) -> list[int]:
+        matrix = self._matrix()
+        minimal_row = min(nonzero_rows, key=lambda index: (
+            abs(matrix.entry(index, pivot_column_index)), index
+        ))
+        self._matrix_manipulator.exchange_rows(pivot_row_index, minimal_row)
+
+        # After the exchange, the old pivot row sits at minimal_row
+        rows_below = [
+            index for index in nonzero_rows
+            if index not in (pivot_row_index, minimal_row)
         ]
-        min_nonzero_entry = min([
-            value for (_, value) in pivot_column_nonzero_entries
-        ])
-        for (index, entry) in pivot_column_nonzero_entries:
-            if entry == min_nonzero_entry:
-                self._matrix_manipulator.exchange_rows(pivot_row_index, index)
-                return
+        if minimal_row != pivot_row_index and pivot_row_index in nonzero_rows:
+            rows_below.append(minimal_row)
+
+        pivot = matrix.entry(pivot_row_index, pivot_column_index)
+        remaining_rows = [pivot_row_index]
+        for row_index in sorted(rows_below):
+            quotient = matrix.entry(row_index, pivot_column_index) // pivot
+            if quotient:
+                self._matrix_manipulator.add_multiple_of_row(
+                    row_index, pivot_row_index, -quotient
+                )
+            if matrix.entry(row_index, pivot_column_index):
+                remaining_rows.append(row_index)
 
-        raise Exception("Found no nonzero entry in pivot column")
+        return remaining_rows
 
     def _row_reduce(self, pivot_row_index: int, pivot_column_index: int):
-        while any(row[pivot_column_index] != 0
-                  for row in self._array()[pivot_row_index + 1:]):
-            self._prepare_row_reduce_step(pivot_row_index, pivot_column_index)
-            self._matrix_manipulator.reduce_rows_by_pivot(
-                pivot_row_index, pivot_column_index
-                )
+        # Only rows that are nonzero in the pivot column can change there, so
+        # the set of such rows is computed once and then updated from each
+        # reduction step instead of rescanning the column
+        nonzero_rows = self._matrix().nonzero_rows_in_column(
+            pivot_column_index, pivot_row_index
+        )
+        while nonzero_rows != [pivot_row_index]:
+            nonzero_rows = self._row_reduce_step(
+                pivot_row_index, pivot_column_index, nonzero_rows
+            )
 
     def _calculate(self) -> None:
         pivot_row_index = 0
         pivot_column_index = 0
 
         while pivot_row_index < self._row_count():
-            while pivot_column_index < self._column_count() and all(
-                row[pivot_column_index] == 0
-                for row in self._array()[pivot_row_index:]
+            while (
+                pivot_column_index < self._column_count()
+                and not self._matrix().nonzero_rows_in_column(
+                    pivot_column_index, pivot_row_index
+                )
             ):
                 pivot_column_index += 1
 
@@ -75,6 +110,8 @@ class RowEchelonCalculator:
                 break
 
             self._row_reduce(pivot_row_index, pivot_column_index)
+            # The pivot column is now zero below the pivot row
             pivot_row_index += 1
+            pivot_column_index += 1
 
         self._row_rank = pivot_row_index
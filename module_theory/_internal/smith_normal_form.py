@@ -1,15 +1,47 @@
 from __future__ import annotations
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from module_theory._internal.matrix import Matrix
-from module_theory._internal.matrix_manipulator import MatrixManipulator
+from module_theory._internal.matrix_manipulator import (
+    ChangeMatrix, MatrixManipulator
+)
+from module_theory._internal.modular_smith_normal_form import (
+    invariant_factors_modulo, maximal_minor_determinant
+)
 from dataclasses import dataclass
+from enum import Enum, auto
+
+
+class SmithNormalFormStrategy(Enum):
+    # Elementary operations over the integers; supports change matrices
+    ELIMINATION = auto()
+    # Invariants only: the determinant of a maximal nonsingular minor is
+    # found modulo word-size primes, and the invariants modulo the prime
+    # powers dividing it, so that entries stay bounded
+    MODULAR = auto()
 
 
 class SmithNormalFormCalculator:
-    def __init__(self, array: Sequence[Sequence[int]],
-                 /, calculate_instantly: bool = True):
-        matrix = Matrix(array)
-        self._matrix_manipulator: MatrixManipulator = MatrixManipulator(matrix)
+    def __init__(self, array: Sequence[Sequence[int]] | Matrix,
+                 /, calculate_instantly: bool = True,
+                 matrix_type: type[Matrix] = Matrix,
+                 change_matrices: ChangeMatrix = ChangeMatrix.ALL,
+                 strategy: SmithNormalFormStrategy = (
+                     SmithNormalFormStrategy.ELIMINATION
+                 )):
+        if (strategy is SmithNormalFormStrategy.MODULAR
+                and change_matrices != ChangeMatrix.NONE):
+            raise ValueError(
+                "the modular strategy does not compute change matrices"
+            )
+        self._strategy: SmithNormalFormStrategy = strategy
+        self._diagonal: tuple[int, ...] | None = None
+        if isinstance(array, Matrix):
+            matrix = array.copy()
+        else:
+            matrix = matrix_type(array)
+        self._matrix_manipulator: MatrixManipulator = MatrixManipulator(
+            matrix, change_matrices
+        )
         self._complete = False
         if calculate_instantly:
             self._calculate()
@@ -18,13 +50,15 @@ class SmithNormalFormCalculator:
     def smith_normal_form(self) -> SmithNormalForm:
         if not self._complete:
             raise RuntimeError("Not calculated yet")
+        if self._matrix_manipulator.change_matrices != ChangeMatrix.ALL:
+            raise RuntimeError(
+                "Not all change matrices are tracked, use invariants() "
+                "and change_matrix() instead"
+            )
         matrix = self._matrix_manipulator.matrix.immutable()
         return SmithNormalForm(
             matrix=matrix,
-            diagonal=tuple(
-                row[row_index] for row_index, row
-                in enumerate(matrix[:self.rank()])
-            ),
+            diagonal=self.diagonal(),
             row_change_matrix=self._row_change_matrix().immutable(),
             inverse_row_change_matrix=(self._inverse_row_change_matrix()
                                            .immutable()),
@@ -35,6 +69,40 @@ class SmithNormalFormCalculator:
             unit_entry_count=self.unit_entry_count()
         )
 
+    def invariants(self) -> SmithNormalFormInvariants:
+        return SmithNormalFormInvariants(
+            diagonal=self.diagonal(),
+            rank=self.rank(),
+            unit_entry_count=self.unit_entry_count()
+        )
+
+    def change_matrix(
+        self, change_matrix: ChangeMatrix
+    ) -> tuple[tuple[int, ...], ...]:
+        return self._selected_change_matrix(change_matrix).immutable()
+
+    def change_matrix_entries(
+        self, change_matrix: ChangeMatrix
+    ) -> Iterator[tuple[int, int, int]]:
+        # Nonzero entries in row-major order, without a dense copy
+        return self._selected_change_matrix(change_matrix).nonzero_entries()
+
+    def _selected_change_matrix(self, change_matrix: ChangeMatrix) -> Matrix:
+        if not self._complete:
+            raise RuntimeError("Not calculated yet")
+        match change_matrix:
+            case ChangeMatrix.ROW:
+                matrix = self._row_change_matrix()
+            case ChangeMatrix.INVERSE_ROW:
+                matrix = self._inverse_row_change_matrix()
+            case ChangeMatrix.COLUMN:
+                matrix = self._column_change_matrix()
+            case ChangeMatrix.INVERSE_COLUMN:
+                matrix = self._inverse_column_change_matrix()
+            case _:
+                raise ValueError("exactly one change matrix must be given")
+        return matrix
+
     def _row_change_matrix(self) -> Matrix:
         return self._matrix_manipulator.row_change_matrix
 
@@ -47,6 +115,13 @@ class SmithNormalFormCalculator:
     def _inverse_column_change_matrix(self) -> Matrix:
         return self._matrix_manipulator.inverse_column_change_matrix
 
+    def diagonal(self) -> tuple[int, ...]:
+        if self._diagonal is not None:
+            return self._diagonal
+        return tuple(
+            self._matrix().entry(index, index) for index in range(self.rank())
+        )
+
     def rank(self) -> int:
         if not self._complete:
             raise RuntimeError("Not calculated yet")
@@ -66,27 +141,19 @@ class SmithNormalFormCalculator:
     def _column_count(self) -> int:
         return self._matrix_manipulator.matrix.column_count()
 
+    def _matrix(self) -> Matrix:
+        return self._matrix_manipulator.matrix
+
     def _move_minimal_nonzero_entry(self, pivot_index: int):
-        min_nonzero_value = None
-        min_nonzero_value_row = pivot_index
-        min_nonzero_value_column = pivot_index
+        position = self._matrix().minimal_nonzero_entry(
+            pivot_index, pivot_index
+        )
 
-        for row_index, row in enumerate(self._array()):
-            if row_index < pivot_index:
-                continue
-            for column_index, value in enumerate(row):
-                if column_index < pivot_index:
-                    continue
-                if value == 0:
-                    continue
-                if not min_nonzero_value or abs(value) < min_nonzero_value:
-                    min_nonzero_value = abs(value)
-                    min_nonzero_value_row = row_index
-                    min_nonzero_value_column = column_index
-
-        if not min_nonzero_value:
+        if position is None:
             raise Exception("Found no nonzero entry")
 
+        min_nonzero_value_row, min_nonzero_value_column = position
+
         self._matrix_manipulator.exchange_rows(
             pivot_index, min_nonzero_value_row
         )
@@ -96,32 +163,32 @@ class SmithNormalFormCalculator:
 
     def _find_nondivisible_entry(self, pivot_index: int) -> tuple[int, int,
                                                                   int] | None:
-        pivot = self._array()[pivot_index][pivot_index]
+        pivot = self._matrix().entry(pivot_index, pivot_index)
 
-        for row_index, row in enumerate(self._array()):
-            if row_index < pivot_index:
-                continue
-            for column_index, value in enumerate(row):
-                if column_index < pivot_index:
-                    continue
-                if value % pivot:
-                    return row_index, column_index, value // pivot
+        for row_index, column_index, value in self._matrix().nonzero_entries(
+            pivot_index, pivot_index
+        ):
+            if value % pivot:
+                return row_index, column_index, value // pivot
 
         return None
 
     def _smith_normal_form_step(self, pivot_index: int):
-        # while True:
-        for _ in range(100):
+        while True:
             self._move_minimal_nonzero_entry(pivot_index)
             self._matrix_manipulator.reduce_rows_by_pivot(
                 pivot_index, pivot_index
             )
-            if any(row[pivot_index] for row in self._array()[pivot_index+1:]):
+            if self._matrix().nonzero_rows_in_column(
+                pivot_index, pivot_index + 1
+            ):
                 continue
             self._matrix_manipulator.reduce_columns_by_pivot(
                 pivot_index, pivot_index
             )
-            if any(self._array()[pivot_index][pivot_index+1:]):
+            if self._matrix().nonzero_columns_in_row(
+                pivot_index, pivot_index + 1
+            ):
                 continue
 
             nondivisible_entry = self._find_nondivisible_entry(pivot_index)
@@ -131,30 +198,41 @@ class SmithNormalFormCalculator:
             (nondivisible_row, nondivisible_column,
              quotient) = nondivisible_entry
 
+            # Bring the pivot into the nondivisible row, then replace the
+            # nondivisible entry by its remainder modulo the pivot
             self._matrix_manipulator.add_multiple_of_row(
                 nondivisible_row, pivot_index, 1
             )
             self._matrix_manipulator.add_multiple_of_column(
-                pivot_index, nondivisible_column, quotient
+                nondivisible_column, pivot_index, -quotient
             )
 
     def _calculate(self):
-        pivot_index = 0
+        if self._strategy is SmithNormalFormStrategy.MODULAR:
+            self._calculate_modular()
+            return
         self._unit_entry_count = 0
+        self._reduce_residual(0)
 
-        while any(
-            value
-            for row in self._array()[pivot_index:]
-            for value in row[pivot_index:]
-        ):
+    def _calculate_modular(self):
+        array = self._matrix().array
+        rank, determinant = maximal_minor_determinant(array)
+        self._diagonal = invariant_factors_modulo(array, rank, determinant)
+        self._rank = rank
+        self._unit_entry_count = self._diagonal.count(1)
+
+    def _reduce_residual(self, pivot_index: int):
+        # Diagonalize the submatrix starting at (pivot_index, pivot_index),
+        # assuming everything to the left and above is already diagonal
+        while not self._matrix().is_submatrix_zero(pivot_index, pivot_index):
             self._smith_normal_form_step(pivot_index)
 
-            if self._array()[pivot_index][pivot_index] < 0:
+            if self._matrix().entry(pivot_index, pivot_index) < 0:
                 self._matrix_manipulator.multiply_row_by_negative_one(
                     pivot_index
                 )
 
-            if self._array()[pivot_index][pivot_index] == 1:
+            if self._matrix().entry(pivot_index, pivot_index) == 1:
                 self._unit_entry_count += 1
 
             pivot_index += 1
@@ -172,3 +250,17 @@ class SmithNormalForm:
     inverse_column_change_matrix: tuple[tuple[int, ...], ...]
     rank: int
     unit_entry_count: int
+
+    def invariants(self) -> SmithNormalFormInvariants:
+        return SmithNormalFormInvariants(
+            diagonal=self.diagonal,
+            rank=self.rank,
+            unit_entry_count=self.unit_entry_count
+        )
+
+
+@dataclass(frozen=True)
+class SmithNormalFormInvariants:
+    diagonal: tuple[int, ...]
+    rank: int
+    unit_entry_count: int
@@ -0,0 +1,325 @@
+from __future__ import annotations
+from collections.abc import Callable, Iterable, Iterator, Sequence
+import hashlib
+import os
+import tempfile
+import zlib
+from module_theory._internal.matrix import Matrix
+from module_theory._internal.smith_normal_form import (
+    SmithNormalForm, SmithNormalFormInvariants
+)
+
+# Setting this environment variable to a directory enables the cache
+CACHE_DIRECTORY_VARIABLE = "MODULE_THEORY_CACHE"
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+FILE_SUFFIX = ".snf"
+FORMAT_HEADER = b"SNF2"
+
+IntegerMatrix = tuple[tuple[int, ...], ...]
+
+
+class SmithNormalFormCache:
+    """Content-addressed cache of factorization results on local disk.
+
+    Entries are keyed by a hash of the kind of computation and of the input
+    matrix, and hold a list of integer matrices, stored as zlib-compressed
+    zigzag varints, with only the nonzero entries of matrices that are
+    mostly zero, such as the change matrices of sparse inputs. Files are
+    written to a temporary name and renamed into place, so concurrent
+    readers never see a partial entry, and a file that cannot be decoded is
+    treated as missing. Reading an entry refreshes its
+    modification time; once the directory grows past max_bytes, the least
+    recently used entries are evicted. The size of the directory is
+    scanned once and then kept as a running total of the entries written
+    by this instance, so it is scanned again only when the total exceeds
+    max_bytes; entries written by other processes in the meantime are
+    counted at that scan.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str],
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.directory: str = os.fspath(directory)
+        self.max_bytes: int = max_bytes
+        # Running total of the size of the directory, None until scanned
+        self._size: int | None = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(kind: str, matrix: Sequence[Sequence[int]] | Matrix) -> str:
+        payload = bytearray(kind.encode())
+        payload.append(0)
+        if isinstance(matrix, Matrix):
+            _encode(payload, (matrix.row_count(), matrix.column_count()))
+            entries: Iterable[tuple[int, int, int]] = matrix.nonzero_entries()
+        else:
+            _encode(payload, (len(matrix), len(matrix[0]) if matrix else 0))
+            entries = (
+                (row_index, column_index, value)
+                for row_index, row in enumerate(matrix)
+                for column_index, value in enumerate(row)
+                if value
+            )
+        for entry in entries:
+            _encode(payload, entry)
+        return hashlib.blake2b(payload, digest_size=20).hexdigest()
+
+    def load(self, key: str) -> list[IntegerMatrix] | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        try:
+            matrices = _decode_matrices(data)
+        except (ValueError, IndexError, zlib.error):
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return matrices
+
+    def store(self, key: str, matrices: Sequence[Sequence[Sequence[int]]]):
+        if self._size is None:
+            self._size = self.size()
+        path = self._path(key)
+        data = _encode_matrices(matrices)
+        try:
+            replaced_size = os.stat(path).st_size
+        except OSError:
+            replaced_size = 0
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            self._remove(temporary_path)
+            raise
+        self._size += len(data) - replaced_size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def size(self) -> int:
+        self._size = sum(size for _, _, size in self._entries())
+        return self._size
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            self._remove(path)
+        self._size = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + FILE_SUFFIX)
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        entries: list[tuple[str, float, int]] = []
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if not entry.name.endswith(FILE_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        # Other processes may evict at the same time: missing files are fine
+        for path, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+        self._size = total
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_active_cache: SmithNormalFormCache | None = None
+_configured = False
+
+
+def set_cache(cache: SmithNormalFormCache | None):
+    global _active_cache, _configured
+    _active_cache = cache
+    _configured = True
+
+
+def active_cache() -> SmithNormalFormCache | None:
+    if not _configured:
+        directory = os.environ.get(CACHE_DIRECTORY_VARIABLE)
+        set_cache(SmithNormalFormCache(directory) if directory else None)
+    return _active_cache
+
+
+def cached_matrices(
+    kind: str,
+    matrix: Sequence[Sequence[int]] | Matrix,
+    calculate: Callable[[], Sequence[Sequence[Sequence[int]]]]
+) -> list[IntegerMatrix]:
+    cache = active_cache()
+    if cache is None:
+        return [_immutable(result) for result in calculate()]
+    key = cache.key(kind, matrix)
+    matrices = cache.load(key)
+    if matrices is None:
+        matrices = [_immutable(result) for result in calculate()]
+        cache.store(key, matrices)
+    return matrices
+
+
+def cached_smith_normal_form(
+    kind: str,
+    matrix: Sequence[Sequence[int]] | Matrix,
+    calculate: Callable[[], SmithNormalForm]
+) -> SmithNormalForm:
+    def matrices() -> list[IntegerMatrix]:
+        result = calculate()
+        return [
+            result.matrix,
+            (result.diagonal,),
+            result.row_change_matrix,
+            result.inverse_row_change_matrix,
+            result.column_change_matrix,
+            result.inverse_column_change_matrix,
+            ((result.rank, result.unit_entry_count),)
+        ]
+
+    (matrix_result, (diagonal,), row_change_matrix, inverse_row_change_matrix,
+     column_change_matrix, inverse_column_change_matrix,
+     ((rank, unit_entry_count),)) = cached_matrices(kind, matrix, matrices)
+    return SmithNormalForm(
+        matrix=matrix_result,
+        diagonal=diagonal,
+        row_change_matrix=row_change_matrix,
+        inverse_row_change_matrix=inverse_row_change_matrix,
+        column_change_matrix=column_change_matrix,
+        inverse_column_change_matrix=inverse_column_change_matrix,
+        rank=rank,
+        unit_entry_count=unit_entry_count
+    )
+
+
+def cached_smith_normal_form_invariants(
+    kind: str,
+    matrix: Sequence[Sequence[int]] | Matrix,
+    calculate: Callable[[], SmithNormalFormInvariants]
+) -> SmithNormalFormInvariants:
+    def matrices() -> list[IntegerMatrix]:
+        result = calculate()
+        return [(result.diagonal,), ((result.rank, result.unit_entry_count),)]
+
+    (diagonal,), ((rank, unit_entry_count),) = cached_matrices(
+        kind, matrix, matrices
+    )
+    return SmithNormalFormInvariants(
+        diagonal=diagonal, rank=rank, unit_entry_count=unit_entry_count
+    )
+
+
+def _immutable(matrix: Sequence[Sequence[int]]) -> IntegerMatrix:
+    return tuple(tuple(row) for row in matrix)
+
+
+def _encode(payload: bytearray, values: Iterable[int]):
+    # Zigzag varints: small magnitudes of either sign take few bytes
+    for value in values:
+        value = 2 * value if value >= 0 else -2 * value - 1
+        while value >= 0x80:
+            payload.append(value & 0x7f | 0x80)
+            value >>= 7
+        payload.append(value)
+
+
+def _decode(payload: bytes) -> Iterator[int]:
+    value = 0
+    shift = 0
+    for byte in payload:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        yield value >> 1 if not value & 1 else -(value >> 1) - 1
+        value = 0
+        shift = 0
+    if shift:
+        raise ValueError("truncated varint")
+
+
+def _encode_matrices(matrices: Sequence[Sequence[Sequence[int]]]) -> bytes:
+    # Each matrix is its shape and number of nonzero entries, then either
+    # all entries in row-major order or, for a matrix that is mostly zero,
+    # each nonzero entry after the number of zeros before it
+    payload = bytearray()
+    _encode(payload, (len(matrices),))
+    for matrix in matrices:
+        row_count, column_count = len(matrix), len(matrix[0]) if matrix else 0
+        values = [value for row in matrix for value in row]
+        nonzero_count = len(values) - values.count(0)
+        _encode(payload, (row_count, column_count, nonzero_count))
+        if not _is_sparse(row_count * column_count, nonzero_count):
+            _encode(payload, values)
+            continue
+        zero_count = 0
+        for value in values:
+            if value:
+                _encode(payload, (zero_count, value))
+                zero_count = 0
+            else:
+                zero_count += 1
+    return FORMAT_HEADER + zlib.compress(payload)
+
+
+def _is_sparse(entry_count: int, nonzero_count: int) -> bool:
+    # Each nonzero entry takes two values in the sparse encoding
+    return 2 * nonzero_count < entry_count
+
+
+def _decode_matrices(data: bytes) -> list[IntegerMatrix]:
+    if not data.startswith(FORMAT_HEADER):
+        raise ValueError("unknown cache file format")
+    values = _decode(zlib.decompress(data[len(FORMAT_HEADER):]))
+
+    def take() -> int:
+        value = next(values, None)
+        if value is None:
+            raise ValueError("truncated cache file")
+        return value
+
+    matrices: list[IntegerMatrix] = []
+    for _ in range(take()):
+        row_count, column_count, nonzero_count = take(), take(), take()
+        entry_count = row_count * column_count
+        if _is_sparse(entry_count, nonzero_count):
+            entries = [0] * entry_count
+            position = -1
+            for _ in range(nonzero_count):
+                zero_count = take()
+                if zero_count < 0:
+                    raise ValueError("negative run of zeros")
+                position += zero_count + 1
+                entries[position] = take()
+        else:
+            entries = [take() for _ in range(entry_count)]
+        matrices.append(tuple(
+            tuple(entries[index:index + column_count])
+            for index in range(0, entry_count, column_count)
+        ) if column_count else ((),) * row_count)
+    if next(values, None) is not None:
+        raise ValueError("trailing data in cache file")
+    return matrices
@@ -0,0 +1,234 @@
+from __future__ import annotations
+from collections.abc import Iterable, Iterator, Sequence
+from module_theory._internal.matrix import Matrix
+
+
+class SparseMatrix(Matrix):
+    """Matrix stored as one dictionary {column: value} per row.
+
+    Each column also keeps the set of rows where it is nonzero, so that row
+    and column operations cost time proportional to the number of nonzero
+    entries they touch rather than to the dimensions of the matrix.
+    """
+
+    def __init__(self, array: Sequence[Sequence[int]]):
+        self._column_count: int = len(array[0]) if array else 0
+        self._rows: list[dict[int, int]] = [
+            {index: value for index, value in enumerate(row) if value}
+            for row in array
+        ]
+        self._columns: list[set[int]] = [
+            set() for _ in range(self._column_count)
+        ]
+        for row_index, row in enumerate(self._rows):
+            for column_index in row:
+                self._columns[column_index].add(row_index)
+
+    @classmethod
+    def from_entries(
+        cls,
+        row_count: int,
+        column_count: int,
+        entries: Iterable[tuple[int, int, int]]
+    ) -> SparseMatrix:
+        matrix = cls([])
+        matrix._column_count = column_count
+        matrix._rows = [{} for _ in range(row_count)]
+        matrix._columns = [set() for _ in range(column_count)]
+        for row_index, column_index, value in entries:
+            if not (0 <= row_index < row_count
+                    and 0 <= column_index < column_count):
+                raise ValueError(
+                    f"entry ({row_index}, {column_index}) is out of bounds"
+                )
+            value += matrix._rows[row_index].get(column_index, 0)
+            matrix._set(row_index, column_index, value)
+        return matrix
+
+    @classmethod
+    def identity(cls, size: int) -> SparseMatrix:
+        return cls.from_entries(
+            size, size, ((index, index, 1) for index in range(size))
+        )
+
+    @property
+    def array(self) -> list[list[int]]:  # pyright: ignore
+        dense = [[0] * self._column_count for _ in self._rows]
+        for row_index, row in enumerate(self._rows):
+            for column_index, value in row.items():
+                dense[row_index][column_index] = value
+        return dense
+
+    @array.setter
+    def array(self, array: Sequence[Sequence[int]]):
+        self.__init__(array)
+
+    def copy(self) -> SparseMatrix:
+        return SparseMatrix.from_entries(
+            self.row_count(), self.column_count(), self.nonzero_entries()
+        )
+
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    def column_count(self) -> int:
+        return self._column_count
+
+    def nonzero_count(self) -> int:
+        return sum(len(row) for row in self._rows)
+
+    def row_nonzero_count(self, row_index: int) -> int:
+        return len(self._rows[row_index])
+
+    def column_nonzero_count(self, column_index: int) -> int:
+        return len(self._columns[column_index])
+
+    def row_items(self, row_index: int) -> Iterable[tuple[int, int]]:
+        return self._rows[row_index].items()
+
+    def entry(self, row_index: int, column_index: int) -> int:
+        return self._rows[row_index].get(column_index, 0)
+
+    def is_zero(self):
+        return not any(self._rows)
+
+    def is_submatrix_zero(self, first_row: int, first_column: int) -> bool:
+        return not any(
+            row_index >= first_row
+            for rows in self._columns[first_column:]
+            for row_index in rows
+        )
+
+    def nonzero_rows_in_column(
+        self, column_index: int, first_row: int = 0
+    ) -> list[int]:
+        return sorted(
+            row_index for row_index in self._columns[column_index]
+            if row_index >= first_row
+        )
+
+    def nonzero_columns_in_row(
+        self, row_index: int, first_column: int = 0
+    ) -> list[int]:
+        return sorted(
+            column_index for column_index in self._rows[row_index]
+            if column_index >= first_column
+        )
+
+    def nonzero_entries(
+        self, first_row: int = 0, first_column: int = 0
+    ) -> Iterator[tuple[int, int, int]]:
+        for row_index in range(first_row, self.row_count()):
+            row = self._rows[row_index]
+            for column_index in sorted(row):
+                if column_index >= first_column:
+                    yield row_index, column_index, row[column_index]
+
+    def exchange_rows(self, first_index: int, second_index: int):
+        if first_index == second_index:
+            return
+        first_row = self._rows[first_index]
+        second_row = self._rows[second_index]
+        for column_index in first_row.keys() - second_row.keys():
+            self._columns[column_index].discard(first_index)
+            self._columns[column_index].add(second_index)
+        for column_index in second_row.keys() - first_row.keys():
+            self._columns[column_index].discard(second_index)
+            self._columns[column_index].add(first_index)
+        self._rows[first_index], self._rows[second_index] = (
+            second_row, first_row
+        )
+
+    def exchange_columns(self, first_index: int, second_index: int):
+        if first_index == second_index:
+            return
+        for row_index in self._columns[first_index] | self._columns[
+            second_index
+        ]:
+            row = self._rows[row_index]
+            first_value = row.pop(first_index, 0)
+            second_value = row.pop(second_index, 0)
+            if second_value:
+                row[first_index] = second_value
+            if first_value:
+                row[second_index] = first_value
+        self._columns[first_index], self._columns[second_index] = (
+            self._columns[second_index], self._columns[first_index]
+        )
+
+    def multiply_row_by_negative_one(self, row_index: int):
+        row = self._rows[row_index]
+        for column_index in row:
+            row[column_index] *= -1
+
+    def multiply_column_by_negative_one(self, column_index: int):
+        for row_index in self._columns[column_index]:
+            self._rows[row_index][column_index] *= -1
+
+    def add_multiple_of_row(
+        self, add_to_index: int, add_index: int, multiplier: int = 1
+    ):
+        if not multiplier:
+            return
+        add_to_row = self._rows[add_to_index]
+        for column_index, add_value in list(self._rows[add_index].items()):
+            self._set(
+                add_to_index,
+                column_index,
+                add_to_row.get(column_index, 0) + multiplier * add_value
+            )
+
+    def add_multiple_of_column(
+        self, add_to_index: int, add_index: int, multiplier: int = 1
+    ):
+        if not multiplier:
+            return
+        for row_index in list(self._columns[add_index]):
+            row = self._rows[row_index]
+            self._set(
+                row_index,
+                add_to_index,
+                row.get(add_to_index, 0) + multiplier * row[add_index]
+            )
+
+    def multiply(self, other: SparseMatrix) -> SparseMatrix:
+        if self.column_count() != other.row_count():
+            raise ValueError("matrix dimensions mismatch")
+
+        product = SparseMatrix.from_entries(
+            self.row_count(), other.column_count(), ()
+        )
+        for row_index, row in enumerate(self._rows):
+            product_row = product._rows[row_index]
+            for middle_index, value in row.items():
+                for column_index, other_value in other.row_items(middle_index):
+                    product._set(
+                        row_index,
+                        column_index,
+                        product_row.get(column_index, 0) + value * other_value
+                    )
+        return product
+
+    def transpose(self):
+        row_count = self.row_count()
+        self._rows = [
+            {row_index: self._rows[row_index][column_index]
+             for row_index in rows}
+            for column_index, rows in enumerate(self._columns)
+        ]
+        self._columns = [set() for _ in range(row_count)]
+        for row_index, row in enumerate(self._rows):
+            for column_index in row:
+                self._columns[column_index].add(row_index)
+        self._column_count = row_count
+
+    def immutable(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(tuple(row) for row in self.array)
+
+    def _set(self, row_index: int, column_index: int, value: int):
+        if value:
+            self._rows[row_index][column_index] = value
+            self._columns[column_index].add(row_index)
+        else:
+            self._rows[row_index].pop(column_index, None)
+            self._columns[column_index].discard(row_index)
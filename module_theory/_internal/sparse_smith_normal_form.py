@@ -0,0 +1,139 @@
+from __future__ import annotations
+from collections.abc import Sequence
+import heapq
+from module_theory._internal.matrix import Matrix
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory._internal.matrix_manipulator import ChangeMatrix
+from module_theory._internal.smith_normal_form import (
+    SmithNormalFormCalculator
+)
+
+
+class SparseSmithNormalFormCalculator(SmithNormalFormCalculator):
+    """Smith normal form of a sparse matrix.
+
+    All ±1 entries that can serve as pivots are eliminated first, in order of
+    increasing Markowitz cost (r - 1)(c - 1), where r and c are the numbers
+    of nonzero entries in the pivot row and column; this keeps fill-in low.
+    Every such pivot only needs a single elimination pass and no gcd steps.
+    The general reduction then runs on the remaining block only.
+    """
+
+    def __init__(self, array: Sequence[Sequence[int]] | Matrix,
+                 /, calculate_instantly: bool = True,
+                 change_matrices: ChangeMatrix = ChangeMatrix.ALL):
+        if isinstance(array, Matrix) and not isinstance(array, SparseMatrix):
+            array = array.array
+        super().__init__(array, calculate_instantly,
+                         matrix_type=SparseMatrix,
+                         change_matrices=change_matrices)
+
+    def _sparse_matrix(self) -> SparseMatrix:
+        matrix = self._matrix()
+        assert isinstance(matrix, SparseMatrix)
+        return matrix
+
+    def _calculate(self):
+        pivots = self._eliminate_unit_pivots()
+        self._move_pivots_to_diagonal(pivots)
+        self._unit_entry_count = len(pivots)
+        self._reduce_residual(len(pivots))
+
+    def _markowitz_cost(self, row_index: int, column_index: int) -> int:
+        matrix = self._sparse_matrix()
+        return (
+            (matrix.row_nonzero_count(row_index) - 1)
+            * (matrix.column_nonzero_count(column_index) - 1)
+        )
+
+    def _eliminate_unit_pivots(self) -> list[tuple[int, int]]:
+        matrix = self._sparse_matrix()
+        manipulator = self._matrix_manipulator
+        pivot_rows: set[int] = set()
+        pivot_columns: set[int] = set()
+        pivots: list[tuple[int, int]] = []
+
+        candidates = [
+            (self._markowitz_cost(row_index, column_index),
+             row_index, column_index)
+            for row_index, column_index, value in matrix.nonzero_entries()
+            if value in (1, -1)
+        ]
+        heapq.heapify(candidates)
+
+        while candidates:
+            cost, row_index, column_index = heapq.heappop(candidates)
+            if row_index in pivot_rows or column_index in pivot_columns:
+                continue
+            unit = matrix.entry(row_index, column_index)
+            if unit not in (1, -1):
+                continue
+            current_cost = self._markowitz_cost(row_index, column_index)
+            if current_cost > cost:
+                # Fill-in made this candidate more expensive: requeue it
+                heapq.heappush(
+                    candidates, (current_cost, row_index, column_index)
+                )
+                continue
+
+            # Clear the pivot column with row operations. Rows of earlier
+            # pivots are already zero outside their pivot, so only rows
+            # without a pivot are touched.
+            affected_rows = [
+                index for index
+                in matrix.nonzero_rows_in_column(column_index)
+                if index != row_index
+            ]
+            for index in affected_rows:
+                manipulator.add_multiple_of_row(
+                    index, row_index,
+                    -matrix.entry(index, column_index) * unit
+                )
+            # The pivot column is now zero outside the pivot, so clearing
+            # the pivot row with column operations changes nothing else.
+            for index in matrix.nonzero_columns_in_row(row_index):
+                if index != column_index:
+                    manipulator.add_multiple_of_column(
+                        index, column_index,
+                        -matrix.entry(row_index, index) * unit
+                    )
+            if unit < 0:
+                manipulator.multiply_row_by_negative_one(row_index)
+
+            pivot_rows.add(row_index)
+            pivot_columns.add(column_index)
+            pivots.append((row_index, column_index))
+
+            # Fill-in may have produced new unit entries
+            for index in affected_rows:
+                for other_column in matrix.nonzero_columns_in_row(index):
+                    if (other_column not in pivot_columns
+                            and matrix.entry(index, other_column) in (1, -1)):
+                        heapq.heappush(candidates, (
+                            self._markowitz_cost(index, other_column),
+                            index, other_column
+                        ))
+
+        return pivots
+
+    def _move_pivots_to_diagonal(self, pivots: Sequence[tuple[int, int]]):
+        manipulator = self._matrix_manipulator
+        row_at = list(range(self._row_count()))
+        row_position = list(range(self._row_count()))
+        column_at = list(range(self._column_count()))
+        column_position = list(range(self._column_count()))
+
+        for index, (row_index, column_index) in enumerate(pivots):
+            position = row_position[row_index]
+            manipulator.exchange_rows(index, position)
+            row_at[index], row_at[position] = row_at[position], row_at[index]
+            row_position[row_at[index]] = index
+            row_position[row_at[position]] = position
+
+            position = column_position[column_index]
+            manipulator.exchange_columns(index, position)
+            column_at[index], column_at[position] = (
+                column_at[position], column_at[index]
+            )
+            column_position[column_at[index]] = index
+            column_position[column_at[position]] = position
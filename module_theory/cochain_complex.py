@@ -1,8 +1,13 @@
 from __future__ import annotations
-from collections.abc import Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
+import itertools
+from typing import TYPE_CHECKING
 from module_theory.zmodule import ZModule
 from module_theory.homomorphism import Homomorphism
 
+if TYPE_CHECKING:
+    from module_theory.collapse import CollapsedCochainComplex
+
 ARROW_START_SYMBOL = " --"
 ARROW_END_SYMBOL = "--> "
 HOMOMORPHISM_SYMBOL = "d"
@@ -25,6 +30,15 @@ class CochainComplex:
 
         self.modules: tuple[ZModule, ...] = tuple(modules)
         self.homomorphisms: tuple[Homomorphism, ...] = tuple(homomorphisms)
+        self._collapsed: CollapsedCochainComplex | None = None
+
+    def collapsed(self) -> CollapsedCochainComplex:
+        # Memoized, so that factorizations of the smaller differentials
+        # are reused by later calls
+        from module_theory.collapse import collapse_unit_pairs
+        if self._collapsed is None:
+            self._collapsed = collapse_unit_pairs(self)
+        return self._collapsed
 
     def left_pad(self, count: int = 1) -> CochainComplex:
         zero = ZModule.zero()
@@ -60,3 +74,77 @@ class CochainComplex:
         for index, homomorphism in enumerate(self.homomorphisms):
             repr_string += f"{HOMOMORPHISM_SYMBOL}{index+1}: {homomorphism}\n"
         return repr_string
+
+
+class StreamingCochainComplex:
+    """A cochain complex whose differentials are produced on demand.
+
+    differentials yields d_n: C^n -> C^(n+1) in order, one per degree,
+    and C^n is the domain of d_n; the last differential maps to the zero
+    module, or to whatever CochainComplex would accept. Iterating checks
+    that consecutive differentials compose and keeps none of them, so a
+    generator is consumed once.
+    """
+
+    def __init__(self, differentials: Iterable[Homomorphism]):
+        self._differentials = differentials
+
+    @classmethod
+    def from_callback(
+        cls, differential: Callable[[int], Homomorphism | None]
+    ) -> StreamingCochainComplex:
+        # differential(n) returns d_n, or None past the last degree
+        def differentials() -> Iterator[Homomorphism]:
+            for degree in itertools.count():
+                homomorphism = differential(degree)
+                if homomorphism is None:
+                    return
+                yield homomorphism
+
+        return cls(differentials())
+
+    @classmethod
+    def from_complex(
+        cls, cochain_complex: CochainComplex
+    ) -> StreamingCochainComplex:
+        return cls(cochain_complex.homomorphisms)
+
+    def __iter__(self) -> Iterator[Homomorphism]:
+        previous: Homomorphism | None = None
+        for homomorphism in self._differentials:
+            if previous is not None and not (
+                homomorphism.domain.is_identical_to(previous.codomain)
+            ):
+                raise ValueError(
+                    "the domain of a differential must be the codomain of "
+                    "the previous one"
+                )
+            previous = homomorphism
+            yield homomorphism
+
+    def modules(self) -> Iterator[ZModule]:
+        return (homomorphism.domain for homomorphism in self)
+
+    def left_pad(self, count: int = 1) -> StreamingCochainComplex:
+        if count < 1:
+            raise ValueError("count must be positive")
+        zero = ZModule.zero()
+
+        def differentials() -> Iterator[Homomorphism]:
+            iterator = iter(self)
+            first = next(iterator, None)
+            yield from (Homomorphism.zero(zero, zero),) * (count - 1)
+            if first is None:
+                yield Homomorphism.zero(zero, zero)
+                return
+            yield Homomorphism.zero(zero, first.domain)
+            yield first
+            yield from iterator
+
+        return StreamingCochainComplex(differentials())
+
+    def right_pad(self, count: int = 1) -> StreamingCochainComplex:
+        zero = ZModule.zero()
+        return StreamingCochainComplex(itertools.chain(
+            self, (Homomorphism.zero(zero, zero),) * count
+        ))
@@ -1,18 +1,613 @@
+from __future__ import annotations
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import Enum, auto
+from typing import NamedTuple
 from module_theory.zmodule import ZModule
-from module_theory.cochain_complex import CochainComplex
-from module_theory.operators.submodule_quotient import SubmoduleQuotient
+from module_theory.homomorphism import Homomorphism
+from module_theory.cochain_complex import (
+    CochainComplex, StreamingCochainComplex
+)
+from module_theory.collapse import (
+    CollapsedCochainComplex, has_unit_pair
+)
+from module_theory._internal.smith_normal_form import (
+    SmithNormalFormCalculator, SmithNormalFormInvariants
+)
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory._internal.sparse_smith_normal_form import (
+    SparseSmithNormalFormCalculator
+)
+from module_theory._internal.matrix_manipulator import ChangeMatrix
 
 
-def cohomology(cochain_complex: CochainComplex) -> list[ZModule]:
-    kernel_generator_sets: list[list[ZModule.Element]] = []
-    image_generator_sets: list[list[ZModule.Element]] = [[]]
+class CohomologyGroup(ZModule):
+    """A cohomology group together with lazily computed representatives.
 
-    for homomorphism in cochain_complex.homomorphisms:
-        kernel_generator_sets.append(homomorphism.kernel_generators())
-        image_generator_sets.append(homomorphism.canonical_generator_images())
+    representative_cocycles() returns one cocycle per generator, in the
+    order of the summands: first the free ones, then the torsion ones.
+    They are given either as a callable, found on first use, or as the
+    cocycles themselves. Like the SubmoduleQuotient the groups used to
+    be, a nonzero group has original_module, here C^n, and
+    quotient_generators, here the representative cocycles.
+    """
+
+    def __init__(self,
+                 rank: int,
+                 torsion_numbers: Sequence[int],
+                 representatives: Callable[[], list[ZModule.Element]]
+                 | list[ZModule.Element],
+                 original_module: ZModule | None = None):
+        super().__init__(rank, torsion_numbers)
+        self._representatives: (
+            Callable[[], list[ZModule.Element]] | None
+        ) = None
+        self._representative_cocycles: list[ZModule.Element] | None = None
+        if callable(representatives):
+            self._representatives = representatives
+        else:
+            self._representative_cocycles = representatives
+        if original_module is not None:
+            self.original_module = original_module
+
+    def representative_cocycles(self) -> list[ZModule.Element]:
+        if self._representative_cocycles is None:
+            assert self._representatives is not None
+            self._representative_cocycles = self._representatives()
+        return self._representative_cocycles
+
+    @property
+    def quotient_generators(self) -> list[ZModule.Element]:
+        return self.representative_cocycles()
+
+
+class _PackedSparseMatrix(NamedTuple):
+    row_count: int
+    column_count: int
+    entries: tuple[tuple[int, int, int], ...]
+
+
+# Matrices are sent to worker processes as plain tuples of integers
+_PackedMatrix = tuple[tuple[int, ...], ...] | _PackedSparseMatrix
+# Sparse vectors as (index, value) pairs: the kernel basis vectors, and the
+# columns of the kernel rows of the inverse column change matrix
+_CocycleLatticeData = tuple[
+    tuple[tuple[tuple[int, int], ...], ...],
+    tuple[tuple[tuple[int, int], ...], ...]
+]
+
+
+def _pack(matrix: Sequence[Sequence[int]] | SparseMatrix) -> _PackedMatrix:
+    if isinstance(matrix, SparseMatrix):
+        return _PackedSparseMatrix(
+            matrix.row_count(),
+            matrix.column_count(),
+            tuple(matrix.nonzero_entries())
+        )
+    return tuple(tuple(row) for row in matrix)
+
+
+def _calculator(
+    matrix: _PackedMatrix, change_matrices: ChangeMatrix
+) -> SmithNormalFormCalculator:
+    if isinstance(matrix, _PackedSparseMatrix):
+        return SparseSmithNormalFormCalculator(
+            SparseMatrix.from_entries(*matrix),
+            change_matrices=change_matrices
+        )
+    return SmithNormalFormCalculator(
+        matrix, change_matrices=change_matrices
+    )
+
+
+def _factor_invariants(matrix: _PackedMatrix) -> SmithNormalFormInvariants:
+    return _calculator(matrix, ChangeMatrix.NONE).invariants()
+
+
+def _factor_cocycle_lattice(matrix: _PackedMatrix) -> _CocycleLatticeData:
+    # Takes the extended matrix of a differential, see _CocycleLattice
+    calculator = _calculator(
+        matrix, ChangeMatrix.COLUMN | ChangeMatrix.INVERSE_COLUMN
+    )
+    rank = calculator.rank()
+    if isinstance(matrix, _PackedSparseMatrix):
+        column_count = matrix.column_count
+    else:
+        column_count = len(matrix[0]) if matrix else 0
+    basis: list[list[tuple[int, int]]] = [
+        [] for _ in range(column_count - rank)
+    ]
+    for row, column, value in calculator.change_matrix_entries(
+        ChangeMatrix.COLUMN
+    ):
+        if column >= rank:
+            basis[column - rank].append((row, value))
+    coordinate_columns: list[list[tuple[int, int]]] = [
+        [] for _ in range(column_count)
+    ]
+    for row, column, value in calculator.change_matrix_entries(
+        ChangeMatrix.INVERSE_COLUMN
+    ):
+        if row >= rank:
+            coordinate_columns[column].append((row - rank, value))
+    return (
+        tuple(tuple(vector) for vector in basis),
+        tuple(tuple(column) for column in coordinate_columns)
+    )
+
+
+def _nonzero_entries(
+    homomorphism: Homomorphism
+) -> Iterator[tuple[int, int, int]]:
+    if homomorphism.is_sparse():
+        return homomorphism.sparse_matrix().nonzero_entries()
+    return (
+        (row_index, column_index, value)
+        for row_index, row in enumerate(homomorphism.matrix)
+        for column_index, value in enumerate(row)
+        if value
+    )
+
+
+def _columns(homomorphism: Homomorphism) -> list[dict[int, int]]:
+    columns: list[dict[int, int]] = [
+        {} for _ in range(homomorphism.domain.dimensions())
+    ]
+    for row_index, column_index, value in _nonzero_entries(homomorphism):
+        columns[column_index][row_index] = value
+    return columns
+
+
+class _CocycleLattice:
+    """Kernel of a differential, lifted to the free cover of the modules.
+
+    With U E V = S the Smith normal form of the extended matrix E = [D | T],
+    where T holds the torsion relations of the codomain, the last columns
+    of V are a basis of ker E, and the last rows of V^-1 give coordinates
+    in that basis. ker E projects isomorphically onto the lifted cocycles.
+    Vectors are {index: value} dictionaries throughout.
+    """
+
+    def __init__(self, differential: Homomorphism,
+                 data: _CocycleLatticeData | None = None):
+        self.differential = differential
+        if data is None:
+            data = _factor_cocycle_lattice(
+                _pack(differential.extended_matrix())
+            )
+        self.basis, self.coordinate_columns = data
+        self._differential_columns: list[dict[int, int]] | None = None
+
+    def dimension(self) -> int:
+        return len(self.basis)
+
+    def coordinates(self, cocycle: dict[int, int]) -> dict[int, int]:
+        # Lift the cocycle to ker E, then read its coordinates
+        if self._differential_columns is None:
+            self._differential_columns = _columns(self.differential)
+        image: dict[int, int] = {}
+        for index, coordinate in cocycle.items():
+            for row, value in self._differential_columns[index].items():
+                image[row] = image.get(row, 0) + value * coordinate
+
+        codomain = self.differential.codomain
+        lift = dict(cocycle)
+        for row, value in image.items():
+            # The zero module has a coordinate that is neither
+            if row < codomain.rank:
+                quotient, remainder = 0, value
+            elif row < codomain.rank + len(codomain.torsion_numbers):
+                quotient, remainder = divmod(
+                    value, codomain.torsion_numbers[row - codomain.rank]
+                )
+            else:
+                continue
+            if remainder:
+                raise ValueError(
+                    "the composition of differentials is not zero"
+                )
+            if quotient:
+                lift[self.differential.domain.dimensions() + row
+                     - codomain.rank] = quotient
+
+        coordinates: dict[int, int] = {}
+        for index, coordinate in lift.items():
+            for row, value in self.coordinate_columns[index]:
+                coordinates[row] = coordinates.get(row, 0) + value * coordinate
+        return coordinates
+
+    def cocycle(self, coordinates: dict[int, int]) -> list[int]:
+        dimensions = self.differential.domain.dimensions()
+        cocycle = [0] * dimensions
+        for index, coordinate in coordinates.items():
+            for row, value in self.basis[index]:
+                if row < dimensions:
+                    cocycle[row] += value * coordinate
+        return cocycle
+
+
+def _coboundary_generators(incoming: Homomorphism | None,
+                           module: ZModule) -> list[dict[int, int]]:
+    # Columns of the incoming differential and the torsion relations of
+    # the module, as vectors of the free cover of the module
+    generators: list[dict[int, int]] = []
+    if incoming is not None and not incoming.domain.is_zero():
+        generators.extend(_columns(incoming))
+    for index, torsion in enumerate(module.torsion_numbers):
+        generators.append({module.rank + index: torsion})
+    return generators
+
+
+def _presentation(lattice: _CocycleLattice,
+                  incoming: Homomorphism | None) -> SparseMatrix:
+    # Coboundaries in coordinates of the cocycle basis, as columns
+    module = lattice.differential.domain
+    generators = _coboundary_generators(incoming, module)
+    return SparseMatrix.from_entries(
+        lattice.dimension(),
+        len(generators),
+        (
+            (row, column, value)
+            for column, generator in enumerate(generators)
+            for row, value in lattice.coordinates(generator).items()
+            if value
+        )
+    )
+
+
+def _general_invariants(
+    lattice: _CocycleLattice,
+    incoming: Homomorphism | None
+) -> tuple[int, list[int]]:
+    dimension = lattice.dimension()
+    presentation = _presentation(lattice, incoming)
+    if not dimension or not presentation.column_count():
+        return dimension, []
+    invariants = SparseSmithNormalFormCalculator(
+        presentation, change_matrices=ChangeMatrix.NONE
+    ).invariants()
+    return (
+        dimension - invariants.rank,
+        [value for value in invariants.diagonal if value >= 2]
+    )
+
+
+def _free_invariants(
+    module: ZModule,
+    incoming: SmithNormalFormInvariants | None,
+    outgoing: SmithNormalFormInvariants
+) -> tuple[int, list[int]]:
+    if incoming is None:
+        return module.rank - outgoing.rank, []
+    return (
+        module.rank - outgoing.rank - incoming.rank,
+        [value for value in incoming.diagonal if value >= 2]
+    )
+
+
+def _representatives(lattice: _CocycleLattice,
+                     incoming: Homomorphism | None) -> list[ZModule.Element]:
+    # The columns of the row change matrix of the Smith normal form of the
+    # presentation span its cokernel one summand at a time
+    module = lattice.differential.domain
+    dimension = lattice.dimension()
+    if not dimension:
+        return []
+    presentation = _presentation(lattice, incoming)
+    if presentation.column_count():
+        calculator = SparseSmithNormalFormCalculator(
+            presentation, change_matrices=ChangeMatrix.ROW
+        )
+        rank = calculator.rank()
+        diagonal = calculator.diagonal()
+        generators: list[dict[int, int]] = [{} for _ in range(dimension)]
+        for row, column, value in calculator.change_matrix_entries(
+            ChangeMatrix.ROW
+        ):
+            generators[column][row] = value
+    else:
+        rank = 0
+        diagonal = ()
+        generators = [{column: 1} for column in range(dimension)]
+    return [
+        module.element(lattice.cocycle(generators[index]))
+        for index in [*range(rank, dimension), *(
+            index for index, value in enumerate(diagonal) if value >= 2
+        )]
+    ]
+
+
+class _LazyRepresentatives:
+    """Finds the representatives of H^n, and the lattice if need be.
+
+    A class rather than a closure, so that cohomology groups pickle.
+    """
+
+    def __init__(self,
+                 incoming: Homomorphism | None,
+                 outgoing: Homomorphism,
+                 lattices: dict[int, _CocycleLattice],
+                 index: int):
+        self.incoming = incoming
+        self.outgoing = outgoing
+        self.lattices = lattices
+        self.index = index
+
+    def __call__(self) -> list[ZModule.Element]:
+        return _representatives(
+            _lattice(self.lattices, self.index, self.outgoing),
+            self.incoming
+        )
+
+
+class _LiftedRepresentatives:
+    def __init__(self, collapsed: CollapsedCochainComplex, degree: int,
+                 group: CohomologyGroup):
+        self.collapsed = collapsed
+        self.degree = degree
+        self.group = group
+
+    def __call__(self) -> list[ZModule.Element]:
+        return [self.collapsed.lift(self.degree, cocycle)
+                for cocycle in self.group.representative_cocycles()]
+
+
+def cohomology(cochain_complex: CochainComplex,
+               workers: int | None = None,
+               collapse: bool = True) -> list[ZModule]:
+    """Cohomology groups of the complex, one per module.
+
+    For torsion-free modules H^n is read off the Smith normal forms of
+    d_{n-1} and d_n: its rank is dim C^n - rank d_n - rank d_{n-1}, and its
+    torsion is given by the nonunit diagonal entries of d_{n-1}. Each of
+    these invariants-only forms is computed once and reused for both
+    adjacent degrees. Otherwise H^n is the cokernel of the
+    presentation of the coboundaries in a basis of the lifted cocycles.
+
+    With workers given, the differentials are factored in a pool of that
+    many processes, and only the assembly runs in this one.
+
+    With collapse, unit pairs of free generators are removed first when
+    there are any, and representatives are lifted back to the complex.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be positive")
+
+    if collapse and has_unit_pair(cochain_complex):
+        collapsed = cochain_complex.collapsed()
+        return [
+            _lifted_group(collapsed, degree, group)
+            for degree, group in enumerate(
+                cohomology(collapsed, workers, collapse=False)
+            )
+        ]
+
+    modules = cochain_complex.modules
+    homomorphisms = cochain_complex.homomorphisms
+    lattices: dict[int, _CocycleLattice] = {}
+
+    def is_general(index: int) -> bool:
+        return bool(modules[index].torsion_numbers
+                    or homomorphisms[index].codomain.torsion_numbers)
+
+    lattice_indices = [
+        index for index, module in enumerate(modules)
+        if not module.is_zero() and is_general(index)
+    ]
+    invariant_indices = [
+        index for index in sorted({
+            adjacent
+            for index, module in enumerate(modules)
+            if not module.is_zero() and not is_general(index)
+            for adjacent in (index - 1, index) if adjacent >= 0
+        })
+        if not homomorphisms[index].has_smith_normal_form_invariants()
+    ]
+    task_count = len(lattice_indices) + len(invariant_indices)
+
+    # No pool is started without tasks, nor more processes than tasks
+    if workers is not None and task_count:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, task_count)
+        ) as executor:
+            lattice_futures: dict[int, Future[_CocycleLatticeData]] = {
+                index: executor.submit(
+                    _factor_cocycle_lattice,
+                    _pack(homomorphisms[index].extended_matrix())
+                )
+                for index in lattice_indices
+            }
+            invariant_futures: dict[
+                int, Future[SmithNormalFormInvariants]
+            ] = {
+                index: executor.submit(
+                    _factor_invariants,
+                    _pack(_matrix_of(homomorphisms[index]))
+                )
+                for index in invariant_indices
+            }
+            for index, future in lattice_futures.items():
+                lattices[index] = _CocycleLattice(
+                    homomorphisms[index], future.result()
+                )
+            # Memoized on the differentials, as in the serial case
+            for index, future in invariant_futures.items():
+                homomorphisms[index].smith_normal_form_invariants(
+                    future.result
+                )
 
     return [
-        SubmoduleQuotient(kernel_generator_set, image_generator_set)
-        for kernel_generator_set, image_generator_set
-        in zip(kernel_generator_sets, image_generator_sets)
+        _degree_group(
+            module,
+            homomorphisms[index - 1] if index else None,
+            homomorphisms[index],
+            lattices,
+            index
+        )
+        for index, module in enumerate(modules)
     ]
+
+
+def _lifted_group(collapsed: CollapsedCochainComplex, degree: int,
+                  group: ZModule) -> CohomologyGroup:
+    assert isinstance(group, CohomologyGroup)
+    return CohomologyGroup(
+        group.rank,
+        group.torsion_numbers,
+        _LiftedRepresentatives(collapsed, degree, group),
+        collapsed.original.modules[degree] if not group.is_zero() else None
+    )
+
+
+def cohomology_stream(
+    cochain_complex: StreamingCochainComplex | Iterable[Homomorphism],
+    representatives: bool = False
+) -> Iterator[ZModule]:
+    """Cohomology groups of a streamed complex, yielded degree by degree.
+
+    Only d_{n-1} and d_n are held while H^n is found, and d_{n-1} is
+    released as soon as H^n is yielded. With representatives, the
+    representative cocycles of each group are found before that;
+    otherwise representative_cocycles() raises RuntimeError.
+    """
+    if not isinstance(cochain_complex, StreamingCochainComplex):
+        cochain_complex = StreamingCochainComplex(cochain_complex)
+
+    incoming: Homomorphism | None = None
+    for outgoing in cochain_complex:
+        yield _degree_group(
+            outgoing.domain, incoming, outgoing, {}, 0,
+            _Representatives.EAGER if representatives
+            else _Representatives.RELEASED
+        )
+        incoming = outgoing
+
+
+def _released_differentials() -> list[ZModule.Element]:
+    raise RuntimeError(
+        "representative cocycles need representatives=True when streaming"
+    )
+
+
+class CohomologySession:
+    """Cohomology of a complex whose differentials are replaced one by one.
+
+    The cocycle lattice of each differential is kept, and so are the
+    groups found so far. Replacing d_n drops only what depends on it, so
+    the next call to cohomology() recomputes H^n and H^(n+1) alone; the
+    invariants of unchanged differentials are memoized on them.
+    """
+
+    def __init__(self, cochain_complex: CochainComplex):
+        self.cochain_complex = cochain_complex
+        self._lattices: dict[int, _CocycleLattice] = {}
+        self._groups: list[ZModule | None] = (
+            [None] * len(cochain_complex.modules)
+        )
+
+    def replace(self, index: int, homomorphism: Homomorphism):
+        homomorphisms = self.cochain_complex.homomorphisms
+        if not 0 <= index < len(homomorphisms):
+            raise ValueError("differential index out of range")
+        if not (
+            homomorphism.domain.is_identical_to(homomorphisms[index].domain)
+            and homomorphism.codomain.is_identical_to(
+                homomorphisms[index].codomain
+            )
+        ):
+            raise ValueError("domain and codomain mismatch")
+
+        self.cochain_complex = CochainComplex(
+            self.cochain_complex.modules,
+            homomorphisms[:index] + (homomorphism,)
+            + homomorphisms[index + 1:]
+        )
+        self._lattices.pop(index, None)
+        for degree in (index, index + 1):
+            if degree < len(self._groups):
+                self._groups[degree] = None
+
+    def cohomology(self) -> list[ZModule]:
+        homomorphisms = self.cochain_complex.homomorphisms
+        groups: list[ZModule] = []
+        modules = self.cochain_complex.modules
+        for index, group in enumerate(self._groups):
+            if group is None:
+                group = self._groups[index] = _degree_group(
+                    modules[index],
+                    homomorphisms[index - 1] if index else None,
+                    homomorphisms[index],
+                    self._lattices,
+                    index
+                )
+            groups.append(group)
+        return groups
+
+
+class _Representatives(Enum):
+    LAZY = auto()
+    # Found before the differentials are released
+    EAGER = auto()
+    RELEASED = auto()
+
+
+def _lattice(lattices: dict[int, _CocycleLattice], index: int,
+             differential: Homomorphism) -> _CocycleLattice:
+    # The cache may hold the lattice of a differential replaced since
+    lattice = lattices.get(index)
+    if lattice is None or lattice.differential is not differential:
+        lattice = lattices[index] = _CocycleLattice(differential)
+    return lattice
+
+
+def _degree_group(
+    module: ZModule,
+    incoming: Homomorphism | None,
+    outgoing: Homomorphism,
+    lattices: dict[int, _CocycleLattice],
+    index: int,
+    representatives: _Representatives = _Representatives.LAZY
+) -> CohomologyGroup:
+    # H^index, with the cocycle lattice of outgoing taken from and kept in
+    # lattices; the invariants of free degrees are memoized on the
+    # differentials
+    if module.is_zero():
+        return CohomologyGroup(0, (), [])
+
+    if module.torsion_numbers or outgoing.codomain.torsion_numbers:
+        rank, torsion_numbers = _general_invariants(
+            _lattice(lattices, index, outgoing), incoming
+        )
+    else:
+        rank, torsion_numbers = _free_invariants(
+            module,
+            incoming.smith_normal_form_invariants()
+            if incoming is not None else None,
+            outgoing.smith_normal_form_invariants()
+        )
+
+    original_module = module if rank or torsion_numbers else None
+    if representatives is _Representatives.RELEASED:
+        return CohomologyGroup(rank, torsion_numbers,
+                               _released_differentials, original_module)
+    if representatives is _Representatives.EAGER:
+        return CohomologyGroup(
+            rank,
+            torsion_numbers,
+            _representatives(_lattice(lattices, index, outgoing), incoming),
+            original_module
+        )
+    return CohomologyGroup(
+        rank,
+        torsion_numbers,
+        _LazyRepresentatives(incoming, outgoing, lattices, index),
+        original_module
+    )
+
+
+def _matrix_of(
+    homomorphism: Homomorphism
+) -> Sequence[Sequence[int]] | SparseMatrix:
+    if homomorphism.is_sparse():
+        return homomorphism.sparse_matrix()
+    return homomorphism.matrix
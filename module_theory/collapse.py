@@ -0,0 +1,254 @@
+from __future__ import annotations
+from collections.abc import Sequence
+import heapq
+from module_theory.zmodule import ZModule
+from module_theory.homomorphism import Homomorphism
+from module_theory.cochain_complex import CochainComplex
+from module_theory._internal.sparse_matrix import SparseMatrix
+
+# One elimination, for lifting: the removed coordinate of C^n, the unit
+# pivot and the rest of the pivot row of d_n at the time
+_Step = tuple[int, int, dict[int, int]]
+
+
+class CollapsedCochainComplex(CochainComplex):
+    """A smaller complex, chain homotopy equivalent to the original one.
+
+    It is obtained by removing pairs of free generators a of C^n and b of
+    C^(n+1) with d_n(a) = ±b + ..., one at a time. Each removal replaces d_n
+    by its Schur complement ε - γ e δ, where e = ±1 is the pivot, and drops
+    the matching row of d_(n-1) and column of d_(n+1). lift() sends cocycles
+    back through the homotopy equivalence, so cohomology classes and their
+    representatives correspond.
+    """
+
+    def __init__(self,
+                 original: CochainComplex,
+                 modules: Sequence[ZModule],
+                 homomorphisms: Sequence[Homomorphism],
+                 survivors: Sequence[Sequence[int]],
+                 steps: Sequence[Sequence[_Step]]):
+        super().__init__(modules, homomorphisms)
+        self.original = original
+        self._survivors = survivors
+        self._steps = steps
+
+    def collapsed_pair_count(self) -> int:
+        return sum(len(steps) for steps in self._steps)
+
+    def lift(self, degree: int, element: ZModule.Element) -> ZModule.Element:
+        if not element.module.is_identical_to(self.modules[degree]):
+            raise ValueError("element is not in the module of that degree")
+        module = self.original.modules[degree]
+        coordinates = [0] * module.dimensions()
+        for index, value in zip(self._survivors[degree], element.coordinates):
+            coordinates[index] = value
+        # Undo the eliminations, the last one first: each removed
+        # generator takes the value that makes the cocycle condition hold
+        for index, pivot, row in reversed(self._steps[degree]):
+            coordinates[index] = -pivot * sum(
+                value * coordinates[column] for column, value in row.items()
+            )
+        return module.element(coordinates)
+
+
+def has_unit_pair(cochain_complex: CochainComplex) -> bool:
+    """Whether collapse_unit_pairs would remove anything from the complex.
+
+    That is, whether some differential but the last has a ±1 entry between
+    free generators; the entries are only read, without building the
+    matrices the collapse works on.
+    """
+    modules = cochain_complex.modules
+    for degree, homomorphism in enumerate(
+        cochain_complex.homomorphisms[:-1]
+    ):
+        free_columns = modules[degree].rank
+        free_rows = modules[degree + 1].rank
+        if homomorphism.is_sparse():
+            if any(row_index < free_rows and column_index < free_columns
+                   and value in (1, -1)
+                   for row_index, column_index, value
+                   in homomorphism.sparse_matrix().nonzero_entries()):
+                return True
+        elif any(value in (1, -1)
+                 for row in homomorphism.matrix[:free_rows]
+                 for value in row[:free_columns]):
+            return True
+    return False
+
+
+def collapse_unit_pairs(
+    cochain_complex: CochainComplex
+) -> CollapsedCochainComplex:
+    """Remove unit pairs of free generators from every differential.
+
+    Columns with the fewest entries are taken first, and within a column
+    the pivot with the shortest row, which keeps the Schur complement
+    updates small. Columns an elimination changes are searched again, so
+    no unit entry between free generators is left. The last differential
+    is not reduced, since its codomain is not a module of the complex.
+    """
+    modules = cochain_complex.modules
+    homomorphisms = cochain_complex.homomorphisms
+    matrices = [_Matrix(homomorphism) for homomorphism in homomorphisms]
+    removed: list[set[int]] = [set() for _ in modules]
+    steps: list[list[_Step]] = [[] for _ in modules]
+
+    for degree in range(len(modules) - 1):
+        matrix = matrices[degree]
+        free_columns = modules[degree].rank
+        free_rows = modules[degree + 1].rank
+        queue = [
+            (len(matrix.columns[column]), column)
+            for column in range(free_columns)
+        ]
+        heapq.heapify(queue)
+        while queue:
+            size, column = heapq.heappop(queue)
+            if size != len(matrix.columns[column]):
+                # Changed since it was queued; it was queued again then
+                continue
+            pivot_row = min(
+                (row for row in matrix.columns[column]
+                 if row < free_rows and matrix.rows[row][column] in (1, -1)),
+                key=lambda row: len(matrix.rows[row]),
+                default=None
+            )
+            if pivot_row is None:
+                continue
+            pivot = matrix.rows[pivot_row][column]
+            row = matrix.eliminate(pivot_row, column, modules[degree + 1])
+            if degree:
+                matrices[degree - 1].remove_row(column)
+            matrices[degree + 1].remove_column(pivot_row)
+            removed[degree].add(column)
+            removed[degree + 1].add(pivot_row)
+            steps[degree].append((column, pivot, row))
+            for index in row:
+                if index < free_columns:
+                    heapq.heappush(
+                        queue, (len(matrix.columns[index]), index)
+                    )
+
+    survivors = [
+        [index for index in range(module.rank + len(module.torsion_numbers))
+         if index not in removed[degree]]
+        for degree, module in enumerate(modules)
+    ]
+    reduced_modules = [
+        ZModule(module.rank - len(removed[degree]), module.torsion_numbers)
+        for degree, module in enumerate(modules)
+    ]
+    reduced_homomorphisms = [
+        matrix.homomorphism(
+            homomorphism,
+            survivors[degree],
+            survivors[degree + 1] if degree + 1 < len(modules) else None,
+            reduced_modules[degree],
+            reduced_modules[degree + 1] if degree + 1 < len(modules)
+            else homomorphism.codomain
+        )
+        for degree, (matrix, homomorphism)
+        in enumerate(zip(matrices, homomorphisms))
+    ]
+    return CollapsedCochainComplex(
+        cochain_complex, reduced_modules, reduced_homomorphisms,
+        survivors, steps
+    )
+
+
+class _Matrix:
+    """Entries of a differential as {column: value} rows and column sets."""
+
+    def __init__(self, homomorphism: Homomorphism):
+        self.rows: list[dict[int, int]] = [
+            {} for _ in range(homomorphism.codomain.dimensions())
+        ]
+        self.columns: list[set[int]] = [
+            set() for _ in range(homomorphism.domain.dimensions())
+        ]
+        if homomorphism.is_sparse():
+            entries = homomorphism.sparse_matrix().nonzero_entries()
+        else:
+            entries = (
+                (row_index, column_index, value)
+                for row_index, row in enumerate(homomorphism.matrix)
+                for column_index, value in enumerate(row)
+                if value
+            )
+        for row_index, column_index, value in entries:
+            self.rows[row_index][column_index] = value
+            self.columns[column_index].add(row_index)
+
+    def eliminate(self, pivot_row: int, column: int,
+                  codomain: ZModule) -> dict[int, int]:
+        # Replace the other rows by the Schur complement, then remove the
+        # pivot row and column; the rest of the pivot row is returned
+        pivot = self.rows[pivot_row][column]
+        row = dict(self.rows[pivot_row])
+        del row[column]
+        rank = codomain.rank
+        for target in self.columns[column] - {pivot_row}:
+            factor = self.rows[target][column] * pivot
+            modulus = (
+                codomain.torsion_numbers[target - rank]
+                if target >= rank else None
+            )
+            for index, value in row.items():
+                self._add(target, index, -factor * value, modulus)
+        self.remove_row(pivot_row)
+        self.remove_column(column)
+        return row
+
+    def remove_row(self, row_index: int):
+        for column_index in self.rows[row_index]:
+            self.columns[column_index].discard(row_index)
+        self.rows[row_index] = {}
+
+    def remove_column(self, column_index: int):
+        for row_index in self.columns[column_index]:
+            del self.rows[row_index][column_index]
+        self.columns[column_index] = set()
+
+    def homomorphism(self,
+                     original: Homomorphism,
+                     column_survivors: Sequence[int],
+                     row_survivors: Sequence[int] | None,
+                     domain: ZModule,
+                     codomain: ZModule) -> Homomorphism:
+        columns = {index: new for new, index in enumerate(column_survivors)}
+        if row_survivors is None:
+            row_survivors = range(len(self.rows))
+        entries = [
+            (new_row, columns[column_index], value)
+            for new_row, row_index in enumerate(row_survivors)
+            for column_index, value in self.rows[row_index].items()
+        ]
+        # Rows are still reduced modulo the torsion of the codomain
+        if original.is_sparse():
+            return Homomorphism.from_normalized_sparse_matrix(
+                SparseMatrix.from_entries(
+                    codomain.dimensions(), domain.dimensions(), entries
+                ),
+                domain,
+                codomain
+            )
+        matrix = [[0] * domain.dimensions()
+                  for _ in range(codomain.dimensions())]
+        for row_index, column_index, value in entries:
+            matrix[row_index][column_index] = value
+        return Homomorphism(matrix, domain, codomain)
+
+    def _add(self, row_index: int, column_index: int, value: int,
+             modulus: int | None):
+        row = self.rows[row_index]
+        value += row.get(column_index, 0)
+        if modulus is not None:
+            value %= modulus
+        if value:
+            row[column_index] = value
+            self.columns[column_index].add(row_index)
+        else:
+            row.pop(column_index, None)
+            self.columns[column_index].discard(row_index)
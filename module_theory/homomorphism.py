@@ -1,39 +1,75 @@
 from __future__ import annotations
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+import importlib.util
+import itertools
+import operator
+from weakref import WeakValueDictionary
 
 from module_theory.zmodule import ZModule
 from module_theory._internal.smith_normal_form import (
-    SmithNormalForm, SmithNormalFormCalculator
+    SmithNormalForm, SmithNormalFormCalculator, SmithNormalFormInvariants
 )
+from module_theory._internal.matrix_manipulator import ChangeMatrix
 from module_theory._internal.kernel_and_image import KernelAndImageCalculator
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory._internal.sparse_smith_normal_form import (
+    SparseSmithNormalFormCalculator
+)
+from module_theory._internal.smith_normal_form_cache import (
+    cached_smith_normal_form, cached_smith_normal_form_invariants
+)
 from module_theory._internal.reduction import reduction
 
+if TYPE_CHECKING:
+    from module_theory._internal.int64_matrix import Int64Matrix
+
+# numpy is optional; with it, large batches in apply_many are multiplied
+# as int64 arrays
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+VECTORIZED_BATCH_SIZE = 16
+
 
 class Homomorphism:
+    __slots__ = (
+        "domain", "codomain", "_matrix", "_sparse_matrix", "_columns",
+        "_sparse_column_items", "_int64_transpose", "_smith_normal_form",
+        "_smith_normal_form_invariants", "_preimage_changes",
+        "_kernel_generators", "__weakref__"
+    )
+
     def __init__(self,
-                 matrix: Sequence[Sequence[int]],
+                 matrix: Sequence[Sequence[int]] | SparseMatrix,
                  domain: ZModule | None = None,
                  codomain: ZModule | None = None):
 
-        if not matrix or not matrix[0]:
-            raise ValueError(
-                "matrix must be a 2d list with at least one entry"
-            )
+        if isinstance(matrix, SparseMatrix):
+            domain_dimensions = matrix.column_count()
+            codomain_dimensions = matrix.row_count()
+            if not codomain_dimensions or not domain_dimensions:
+                raise ValueError(
+                    "matrix must have at least one entry"
+                )
+        else:
+            if not matrix or not matrix[0]:
+                raise ValueError(
+                    "matrix must be a 2d list with at least one entry"
+                )
 
-        domain_dimensions = len(matrix[0])
+            domain_dimensions = len(matrix[0])
 
-        if any(len(row) != domain_dimensions for row in matrix):
-            raise ValueError(
-                "All rows of matrix must have equal length"
-            )
+            if any(len(row) != domain_dimensions for row in matrix):
+                raise ValueError(
+                    "All rows of matrix must have equal length"
+                )
+
+            codomain_dimensions = len(matrix)
 
         if domain and domain_dimensions != domain.dimensions():
             raise ValueError(
                 "domain dimension mismatch"
             )
 
-        codomain_dimensions = len(matrix)
-
         if codomain and codomain_dimensions != codomain.dimensions():
             raise ValueError(
                 f"codomain dimension mismatch: " +
@@ -41,34 +77,127 @@ class Homomorphism:
                 f"found {codomain_dimensions}"
             )
 
-        self.domain: ZModule = domain or ZModule.free(domain_dimensions)
-        self.codomain: ZModule = codomain or ZModule.free(codomain_dimensions)
-        self.matrix: tuple[tuple[int, ...], ...] = tuple(
-            tuple(row) for row in matrix[:self.codomain.rank]
-        ) + tuple(
-            tuple(item % torsion for item in row)
-            for (row, torsion)
-            in zip(matrix[self.codomain.rank:], self.codomain.torsion_numbers)
-        ) or (tuple(0 for _ in range(self.domain.dimensions())),)
+        domain = domain or ZModule.free(domain_dimensions)
+        codomain = codomain or ZModule.free(codomain_dimensions)
+        if isinstance(matrix, SparseMatrix):
+            self._initialize(domain, codomain, None, matrix)
+            self._sparse_matrix = self._normalized_sparse_matrix(matrix)
+        else:
+            self._initialize(domain, codomain, tuple(
+                tuple(row) for row in matrix[:codomain.rank]
+            ) + tuple(
+                tuple(item % torsion for item in row)
+                for (row, torsion)
+                in zip(matrix[codomain.rank:], codomain.torsion_numbers)
+            ) or (tuple(0 for _ in range(domain.dimensions())),), None)
+
+    @classmethod
+    def from_normalized_matrix(
+        cls,
+        matrix: tuple[tuple[int, ...], ...],
+        domain: ZModule,
+        codomain: ZModule
+    ) -> Homomorphism:
+        # Trusted constructor for internal use: the matrix must match the
+        # dimensions of the modules and be reduced modulo the torsion of
+        # the codomain, since it is neither validated nor copied
+        homomorphism = cls.__new__(cls)
+        homomorphism._initialize(domain, codomain, matrix, None)
+        return homomorphism
+
+    @classmethod
+    def from_normalized_sparse_matrix(
+        cls,
+        matrix: SparseMatrix,
+        domain: ZModule,
+        codomain: ZModule
+    ) -> Homomorphism:
+        # As from_normalized_matrix, for a sparse matrix, which is kept
+        # rather than copied
+        homomorphism = cls.__new__(cls)
+        homomorphism._initialize(domain, codomain, None, matrix)
+        return homomorphism
+
+    def _initialize(self,
+                    domain: ZModule,
+                    codomain: ZModule,
+                    matrix: tuple[tuple[int, ...], ...] | None,
+                    sparse_matrix: SparseMatrix | None):
+        self.domain: ZModule = domain
+        self.codomain: ZModule = codomain
+        self._matrix: tuple[tuple[int, ...], ...] | None = matrix
+        self._sparse_matrix: SparseMatrix | None = sparse_matrix
+        self._columns: tuple[tuple[int, ...], ...] | None = None
+        self._sparse_column_items: list[list[tuple[int, int]]] | None = None
+        self._int64_transpose: Int64Matrix | None = None
         self._smith_normal_form: SmithNormalForm | None = None
+        self._smith_normal_form_invariants: (
+            SmithNormalFormInvariants | None
+        ) = None
+        self._preimage_changes: (
+            tuple[Homomorphism, Homomorphism] | None
+        ) = None
         self._kernel_generators: tuple[ZModule.Element, ...] | None = None
-        if self.domain.is_zero():
-            self._kernel_generators = (self.domain.zero_element(),)
+
+    @property
+    def matrix(self) -> tuple[tuple[int, ...], ...]:
+        if self._matrix is None:
+            assert self._sparse_matrix is not None
+            self._matrix = self._sparse_matrix.immutable()
+        return self._matrix
+
+    def is_sparse(self) -> bool:
+        return self._sparse_matrix is not None
+
+    def sparse_matrix(self) -> SparseMatrix:
+        if self._sparse_matrix is None:
+            return SparseMatrix(self.matrix)
+        return self._sparse_matrix
+
+    def _normalized_sparse_matrix(self, matrix: SparseMatrix) -> SparseMatrix:
+        if self.codomain.is_zero():
+            return SparseMatrix.from_entries(1, self.domain.dimensions(), ())
+
+        rank = self.codomain.rank
+        torsion_numbers = self.codomain.torsion_numbers
+        return SparseMatrix.from_entries(
+            matrix.row_count(),
+            matrix.column_count(),
+            (
+                (row_index, column_index,
+                 value if row_index < rank
+                 else value % torsion_numbers[row_index - rank])
+                for row_index, column_index, value in matrix.nonzero_entries()
+            )
+        )
 
     @staticmethod
     def zero(domain: ZModule,
              codomain: ZModule) -> Homomorphism:
-        return Homomorphism(tuple(
-            tuple(0 for _ in range(domain.dimensions()))
-            for _ in range(codomain.dimensions())
-        ), domain, codomain)
+        # Zero maps between interned modules are shared
+        shared = type(domain) is ZModule and type(codomain) is ZModule
+        if shared:
+            homomorphism = _zero_homomorphisms.get((domain, codomain))
+            if homomorphism is not None:
+                return homomorphism
+        row = (0,) * domain.dimensions()
+        homomorphism = Homomorphism.from_normalized_matrix(
+            (row,) * codomain.dimensions(), domain, codomain
+        )
+        if shared:
+            _zero_homomorphisms[(domain, codomain)] = homomorphism
+        return homomorphism
 
     def is_zero(self) -> bool:
+        if self._sparse_matrix is not None:
+            return self._sparse_matrix.is_zero()
         return all(value == 0 for row in self.matrix for value in row)
 
     @staticmethod
     def identity(module: ZModule) -> Homomorphism:
-        return Homomorphism(
+        if module.is_zero():
+            return Homomorphism.zero(module, module)
+        return Homomorphism.from_normalized_matrix(
             matrix=tuple(tuple(
                 1 if row == column else 0
                 for column in range(module.dimensions())
@@ -97,12 +226,92 @@ class Homomorphism:
     ) -> ZModule.Element:
         if len(element.coordinates) != self.domain.dimensions():
             raise ValueError("dimension mismatch")
-        return self.codomain.element([
-            sum(element_coordinate * basis_images
-                for (element_coordinate, basis_images) in zip(
-                    element.coordinates, row
-                ))
-            for row in self.matrix])
+        return ZModule.Element.from_normalized(
+            self.codomain, self.apply_many((element.coordinates,))[0]
+        )
+
+    def apply_many(
+        self,
+        coordinates: Sequence[Sequence[int]]
+    ) -> list[tuple[int, ...]]:
+        # Each row of coordinates is an element of the domain; each row of
+        # the result is its image. Images are accumulated from the columns
+        # of the matrix, skipping zero coordinates, and reduced modulo the
+        # torsion of the codomain once at the end.
+        domain_dimensions = self.domain.dimensions()
+        if any(len(row) != domain_dimensions for row in coordinates):
+            raise ValueError("dimension mismatch")
+
+        codomain_dimensions = self.codomain.dimensions()
+        images: list[list[int]] = []
+        if self._sparse_matrix is not None:
+            columns = self._sparse_columns()
+            for row in coordinates:
+                image = [0] * codomain_dimensions
+                for coordinate, column in zip(row, columns):
+                    if coordinate:
+                        for row_index, value in column:
+                            image[row_index] += coordinate * value
+                images.append(image)
+        elif NUMPY_AVAILABLE and len(coordinates) >= VECTORIZED_BATCH_SIZE:
+            from module_theory._internal.int64_matrix import Int64Matrix
+            images = Int64Matrix(coordinates).multiply(
+                self._int64_columns()
+            ).array
+        else:
+            columns = self._dense_columns()
+            for row in coordinates:
+                image = [0] * codomain_dimensions
+                for coordinate, column in zip(row, columns):
+                    if coordinate:
+                        image = [
+                            value + coordinate * column_value
+                            for value, column_value in zip(image, column)
+                        ]
+                images.append(image)
+
+        rank = self.codomain.rank
+        torsion_numbers = self.codomain.torsion_numbers
+        if not torsion_numbers:
+            return [tuple(image) for image in images]
+        return [
+            tuple(image[:rank]) + tuple(
+                value % torsion
+                for value, torsion in zip(image[rank:], torsion_numbers)
+            )
+            for image in images
+        ]
+
+    def _dense_columns(self) -> tuple[tuple[int, ...], ...]:
+        if self._columns is None:
+            self._columns = tuple(zip(*self.matrix))
+        return self._columns
+
+    def _int64_columns(self) -> Int64Matrix:
+        from module_theory._internal.int64_matrix import Int64Matrix
+        if self._int64_transpose is None:
+            self._int64_transpose = Int64Matrix(self._dense_columns())
+        return self._int64_transpose
+
+    def _sparse_columns(self) -> list[list[tuple[int, int]]]:
+        assert self._sparse_matrix is not None
+        if self._sparse_column_items is None:
+            columns: list[list[tuple[int, int]]] = [
+                [] for _ in range(self._sparse_matrix.column_count())
+            ]
+            for row_index, column_index, value in (
+                self._sparse_matrix.nonzero_entries()
+            ):
+                columns[column_index].append((row_index, value))
+            self._sparse_column_items = columns
+        return self._sparse_column_items
+
+    def _column_items(self) -> Sequence[Sequence[tuple[int, int]]] | None:
+        # The nonzero entries of each column as (row, value) pairs, for
+        # matrices that are not stored densely
+        if self._sparse_matrix is None:
+            return None
+        return self._sparse_columns()
 
     def canonical_generator_images(self) -> list[ZModule.Element]:
         return [
@@ -117,71 +326,168 @@ class Homomorphism:
         ):
             raise ValueError("domain and codomain mismatch")
 
-        return Homomorphism(
-            matrix=tuple(tuple(
-                sum(self.matrix[row_index][k] * other.matrix[k][column_index]
-                    for k in range(self.domain.dimensions()))
-                for column_index in range(other.domain.dimensions())
-            ) for row_index in range(self.codomain.dimensions())),
+        if (
+            self._sparse_matrix is not None
+            and other._sparse_matrix is not None
+        ):
+            return Homomorphism(
+                self._sparse_matrix.multiply(other._sparse_matrix),
+                domain=other.domain,
+                codomain=self.codomain
+            )
+
+        other_columns = other._column_items()
+        if other_columns is not None:
+            # Only the entries selected by the other matrix contribute
+            products = [
+                [sum(row[index] * value for index, value in items)
+                 for items in other_columns]
+                for row in self.matrix
+            ]
+        else:
+            columns = other._dense_columns()
+            products = [
+                [sum(map(operator.mul, row, column)) for column in columns]
+                for row in self.matrix
+            ]
+        rank = self.codomain.rank
+        product = tuple(tuple(row) for row in products[:rank]) + tuple(
+            tuple(value % torsion for value in row)
+            for row, torsion
+            in zip(products[rank:], self.codomain.torsion_numbers)
+        )
+        return Homomorphism.from_normalized_matrix(
+            product or ((0,) * other.domain.dimensions(),),
             domain=other.domain,
             codomain=self.codomain
         )
 
     def _get_smith_normal_form(self) -> SmithNormalForm:
         if not self._smith_normal_form:
-            self._smith_normal_form = (
-                SmithNormalFormCalculator(self.matrix).smith_normal_form()
-            )
+            sparse_matrix = self._sparse_matrix
+            if sparse_matrix is not None:
+                self._smith_normal_form = cached_smith_normal_form(
+                    "sparse_smith_normal_form", sparse_matrix,
+                    lambda: SparseSmithNormalFormCalculator(
+                        sparse_matrix
+                    ).smith_normal_form()
+                )
+            else:
+                self._smith_normal_form = cached_smith_normal_form(
+                    "smith_normal_form", self.matrix,
+                    lambda: SmithNormalFormCalculator(
+                        self.matrix
+                    ).smith_normal_form()
+                )
         return self._smith_normal_form
 
+    def has_smith_normal_form_invariants(self) -> bool:
+        return bool(
+            self._smith_normal_form or self._smith_normal_form_invariants
+        )
+
+    def smith_normal_form_invariants(
+        self,
+        calculate: Callable[[], SmithNormalFormInvariants] | None = None
+    ) -> SmithNormalFormInvariants:
+        # calculate, if given, replaces the factorization in this process,
+        # e.g. by one done elsewhere; the result is memoized either way
+        if self._smith_normal_form:
+            return self._smith_normal_form.invariants()
+        if not self._smith_normal_form_invariants:
+            # No change matrices are needed for the invariants alone
+            sparse_matrix = self._sparse_matrix
+            if sparse_matrix is not None:
+                invariants = cached_smith_normal_form_invariants(
+                    "sparse_smith_normal_form_invariants", sparse_matrix,
+                    calculate or (
+                        lambda: SparseSmithNormalFormCalculator(
+                            sparse_matrix, change_matrices=ChangeMatrix.NONE
+                        ).invariants()
+                    )
+                )
+            else:
+                invariants = cached_smith_normal_form_invariants(
+                    "smith_normal_form_invariants", self.matrix,
+                    calculate or (
+                        lambda: SmithNormalFormCalculator(
+                            self.matrix, change_matrices=ChangeMatrix.NONE
+                        ).invariants()
+                    )
+                )
+            self._smith_normal_form_invariants = invariants
+        return self._smith_normal_form_invariants
+
     def preimage(self, element: ZModule.Element) -> ZModule.Element | None:
-        if not element.module.is_identical_to(self.codomain):
+        return self.preimage_many((element,))[0]
+
+    def preimage_many(
+        self,
+        elements: Sequence[ZModule.Element]
+    ) -> list[ZModule.Element | None]:
+        # Solves for all elements at once: with U A V = S the Smith normal
+        # form of the matrix, x = V S^-1 U b, where None marks the elements
+        # outside of the image
+        if not all(element.module.is_identical_to(self.codomain)
+                   for element in elements):
             raise ValueError(
                 "The element must belong to the codomain of the homomorphism"
             )
-        # smith_matrix = self._get_smith_normal_form().matrix
         rank = self._get_smith_normal_form().rank
         diagonal_numbers = self._get_smith_normal_form().diagonal[:rank]
-        codomain_change_matrix = (self._get_smith_normal_form()
-                                      .inverse_row_change_matrix)
-        codomain_change_homomorphism = Homomorphism(
-            codomain_change_matrix, domain=element.module
+        codomain_change, domain_change = self._preimage_change_homomorphisms()
+        targets = codomain_change.apply_many(
+            [element.coordinates for element in elements]
         )
-        target = codomain_change_homomorphism.apply(element)
-
-        if any(target.coordinates[rank:]):
-            return None
-        if any(
-            coordinate % diagonal_number
-            for (coordinate, diagonal_number)
-            in zip(target.coordinates, diagonal_numbers)
-        ):
-            return None
 
-        preimage_changed = self.domain.element([
+        padding = [0] * (self.domain.dimensions() - rank)
+        solvable = [
+            not any(target[rank:]) and not any(
+                coordinate % diagonal_number
+                for (coordinate, diagonal_number)
+                in zip(target, diagonal_numbers)
+            )
+            for target in targets
+        ]
+        preimages = iter(domain_change.apply_many([
+            [
                 coordinate // diagonal_number
                 for (coordinate, diagonal_number)
-                in zip(target.coordinates, diagonal_numbers)
-            ] + [0] * (self.domain.dimensions() - rank)
-        )
-
-        domain_change_homomorphism = Homomorphism(
-            self._get_smith_normal_form().column_change_matrix,
-            domain=self.domain,
-            codomain=self.domain
-        )
+                in zip(target, diagonal_numbers)
+            ] + padding
+            for target, is_solvable in zip(targets, solvable)
+            if is_solvable
+        ]))
+        return [
+            ZModule.Element.from_normalized(self.domain, next(preimages))
+            if is_solvable else None
+            for is_solvable in solvable
+        ]
 
-        return domain_change_homomorphism.apply(preimage_changed)
+    def _preimage_change_homomorphisms(
+        self
+    ) -> tuple[Homomorphism, Homomorphism]:
+        if self._preimage_changes is None:
+            smith_normal_form = self._get_smith_normal_form()
+            self._preimage_changes = (
+                Homomorphism(
+                    smith_normal_form.inverse_row_change_matrix,
+                    domain=self.codomain
+                ),
+                Homomorphism(
+                    smith_normal_form.column_change_matrix,
+                    domain=self.domain,
+                    codomain=self.domain
+                )
+            )
+        return self._preimage_changes
 
     def kernel_generators(self) -> list[ZModule.Element]:
-        if not self._kernel_generators:
+        if not self._kernel_generators and self.domain.is_zero():
+            self._kernel_generators = (self.domain.zero_element(),)
+        elif not self._kernel_generators:
 
-            extended_matrix = tuple(
-                matrix_row + torsion_submatrix_row
-                for (matrix_row, torsion_submatrix_row)
-                in zip(self.matrix, self._torsion_submatrix())
-            )
-            kernel = KernelAndImageCalculator(extended_matrix).kernel
+            kernel = KernelAndImageCalculator(self.extended_matrix()).kernel
             self._kernel_generators = tuple(
                 self.domain.element(
                     coordinates_list[:self.domain.dimensions()]
@@ -197,6 +503,31 @@ class Homomorphism:
             "\n".join(str(row) for row in self.matrix)
         )
 
+    def extended_matrix(self) -> Sequence[Sequence[int]] | SparseMatrix:
+        # The matrix with the torsion relations of the codomain appended
+        # as extra columns
+        if self._sparse_matrix is not None:
+            rank = self.codomain.rank
+            domain_dimensions = self.domain.dimensions()
+            return SparseMatrix.from_entries(
+                self._sparse_matrix.row_count(),
+                domain_dimensions + len(self.codomain.torsion_numbers),
+                itertools.chain(
+                    self._sparse_matrix.nonzero_entries(),
+                    (
+                        (rank + index, domain_dimensions + index, -torsion)
+                        for index, torsion
+                        in enumerate(self.codomain.torsion_numbers)
+                    )
+                )
+            )
+
+        return tuple(
+            matrix_row + torsion_submatrix_row
+            for (matrix_row, torsion_submatrix_row)
+            in zip(self.matrix, self._torsion_submatrix())
+        )
+
     def _torsion_submatrix(self) -> tuple[tuple[int, ...], ...]:
         return (
             (
@@ -211,3 +542,8 @@ class Homomorphism:
                 for row_index, _ in enumerate(self.codomain.torsion_numbers)
             )
         ) or ((),)
+
+
+_zero_homomorphisms: WeakValueDictionary[
+    tuple[ZModule, ZModule], Homomorphism
+] = WeakValueDictionary()
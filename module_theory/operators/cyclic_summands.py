@@ -1,4 +1,6 @@
 from collections.abc import Sequence
+import itertools
+from typing import NamedTuple
 from module_theory.zmodule import ZModule
 from module_theory.cyclic_zmodule import (
     FreeCyclicZModule, TorsionCyclicZModule
@@ -12,3 +14,20 @@ def cyclic_summands(module: ZModule) -> Sequence[ZModule]:
     return ([FreeCyclicZModule()] * module.rank +
             [TorsionCyclicZModule(torsion)
              for torsion in module.torsion_numbers])
+
+
+class CyclicBlock(NamedTuple):
+    """multiplicity consecutive cyclic summands, all isomorphic to Z when
+    torsion is 0, or to Z/torsion otherwise."""
+    torsion: int
+    multiplicity: int
+
+
+def cyclic_blocks(module: ZModule) -> list[CyclicBlock]:
+    # The cyclic summands in order, with consecutive equal ones merged
+    blocks = [CyclicBlock(0, module.rank)] if module.rank else []
+    blocks.extend(
+        CyclicBlock(torsion, len([*group]))
+        for torsion, group in itertools.groupby(module.torsion_numbers)
+    )
+    return blocks
@@ -1,36 +1,207 @@
 from __future__ import annotations
+from collections.abc import Sequence
 from module_theory.zmodule import ZModule
 from module_theory.homomorphism import Homomorphism
+from module_theory._internal.sparse_matrix import SparseMatrix
 
 
-def direct_sum(*modules: ZModule) -> tuple[ZModule, tuple[Homomorphism, ...]]:
+class DirectSumEmbedding(Homomorphism):
+    """Embedding of a summand into a direct sum, stored as an index map.
+
+    Coordinate i of the summand is sent to coordinate indices[i] of the
+    direct sum. apply, compose and is_zero work on the indices; the matrix
+    is only built when it is asked for.
+    """
+    __slots__ = ("indices",)
+
+    def __init__(self, summand: ZModule, module: ZModule,
+                 indices: Sequence[int]):
+        self._initialize(summand, module, None, None)
+        self.indices: tuple[int, ...] = tuple(indices)
+
+    @property
+    def matrix(self) -> tuple[tuple[int, ...], ...]:
+        if self._matrix is None:
+            rows = [[0] * self.domain.dimensions()
+                    for _ in range(self.codomain.dimensions())]
+            for column, index in enumerate(self.indices):
+                rows[index][column] = 1
+            self._matrix = tuple(tuple(row) for row in rows)
+        return self._matrix
+
+    def sparse_matrix(self) -> SparseMatrix:
+        return SparseMatrix.from_entries(
+            self.codomain.dimensions(),
+            self.domain.dimensions(),
+            ((index, column, 1) for column, index in enumerate(self.indices))
+        )
+
+    def is_zero(self) -> bool:
+        return not self.indices
+
+    def projection(self) -> DirectSumProjection:
+        return DirectSumProjection(self.codomain, self.domain, self.indices)
+
+    def apply_many(
+        self,
+        coordinates: Sequence[Sequence[int]]
+    ) -> list[tuple[int, ...]]:
+        _check_dimensions(coordinates, self.domain)
+        rank = self.codomain.rank
+        torsion_numbers = self.codomain.torsion_numbers
+        images: list[tuple[int, ...]] = []
+        for row in coordinates:
+            image = [0] * self.codomain.dimensions()
+            for index, value in zip(self.indices, row):
+                image[index] = (
+                    value if index < rank
+                    else value % torsion_numbers[index - rank]
+                )
+            images.append(tuple(image))
+        return images
+
+    def compose(self, other: Homomorphism) -> Homomorphism:
+        _check_composable(self, other)
+        # The rows of the other matrix, moved to their indices
+        if other.is_sparse():
+            entries = [
+                (self.indices[row], column, value)
+                for row, column, value
+                in other.sparse_matrix().nonzero_entries()
+            ]
+        else:
+            entries = [
+                (index, column, value)
+                for index, row in zip(self.indices, other.matrix)
+                for column, value in enumerate(row)
+                if value
+            ]
+        return Homomorphism(SparseMatrix.from_entries(
+            self.codomain.dimensions(), other.domain.dimensions(), entries
+        ), other.domain, self.codomain)
+
+    def _column_items(self) -> Sequence[Sequence[tuple[int, int]]] | None:
+        return [[(index, 1)] for index in self.indices] or [[]]
+
+
+class DirectSumProjection(Homomorphism):
+    """Projection of a direct sum onto a summand, stored as an index map.
+
+    Coordinate i of the summand is read from coordinate indices[i] of the
+    direct sum. As for DirectSumEmbedding, the matrix is only built when it
+    is asked for.
+    """
+    __slots__ = ("indices",)
+
+    def __init__(self, module: ZModule, summand: ZModule,
+                 indices: Sequence[int]):
+        self._initialize(module, summand, None, None)
+        self.indices: tuple[int, ...] = tuple(indices)
+
+    @property
+    def matrix(self) -> tuple[tuple[int, ...], ...]:
+        if self._matrix is None:
+            self._matrix = tuple(
+                tuple(int(column == index)
+                      for column in range(self.domain.dimensions()))
+                for index in self.indices
+            ) or ((0,) * self.domain.dimensions(),)
+        return self._matrix
+
+    def sparse_matrix(self) -> SparseMatrix:
+        return SparseMatrix.from_entries(
+            self.codomain.dimensions(),
+            self.domain.dimensions(),
+            ((row, index, 1) for row, index in enumerate(self.indices))
+        )
+
+    def is_zero(self) -> bool:
+        return not self.indices
+
+    def apply_many(
+        self,
+        coordinates: Sequence[Sequence[int]]
+    ) -> list[tuple[int, ...]]:
+        _check_dimensions(coordinates, self.domain)
+        if not self.indices:
+            return [(0,) for _ in coordinates]
+        rank = self.codomain.rank
+        torsion_numbers = self.codomain.torsion_numbers
+        return [
+            tuple(row[index] for index in self.indices[:rank]) + tuple(
+                row[index] % torsion
+                for index, torsion
+                in zip(self.indices[rank:], torsion_numbers)
+            )
+            for row in coordinates
+        ]
+
+    def compose(self, other: Homomorphism) -> Homomorphism:
+        _check_composable(self, other)
+        if not self.indices:
+            return Homomorphism.zero(other.domain, self.codomain)
+        # The rows of the other matrix at the indices; they are already
+        # reduced modulo the same torsion numbers
+        if other.is_sparse():
+            sparse_matrix = other.sparse_matrix()
+            rows: list[tuple[int, ...]] = []
+            for index in self.indices:
+                row = [0] * other.domain.dimensions()
+                for column, value in sparse_matrix.row_items(index):
+                    row[column] = value
+                rows.append(tuple(row))
+        else:
+            rows = [other.matrix[index] for index in self.indices]
+        return Homomorphism.from_normalized_matrix(
+            tuple(rows), other.domain, self.codomain
+        )
+
+    def _column_items(self) -> Sequence[Sequence[tuple[int, int]]] | None:
+        columns: list[list[tuple[int, int]]] = [
+            [] for _ in range(self.domain.dimensions())
+        ]
+        for row, index in enumerate(self.indices):
+            columns[index].append((row, 1))
+        return columns
+
+
+def _check_dimensions(coordinates: Sequence[Sequence[int]],
+                      domain: ZModule):
+    if any(len(row) != domain.dimensions() for row in coordinates):
+        raise ValueError("dimension mismatch")
+
+
+def _check_composable(homomorphism: Homomorphism, other: Homomorphism):
+    if (
+        homomorphism.domain.rank != other.codomain.rank or
+        homomorphism.domain.torsion_numbers != other.codomain.torsion_numbers
+    ):
+        raise ValueError("domain and codomain mismatch")
+
+
+def direct_sum(
+    *modules: ZModule
+) -> tuple[ZModule, tuple[DirectSumEmbedding, ...]]:
     direct_sum_module = ZModule(
         rank=sum(module.rank for module in modules),
         torsion_numbers=[factor for module in modules
                          for factor in module.torsion_numbers]
     )
 
-    embeddings: list[Homomorphism] = []
+    embeddings: list[DirectSumEmbedding] = []
     free_part_position = 0
-    torsion_part_position = 0
+    torsion_part_position = direct_sum_module.rank
 
     for module in modules:
-        embedding_matrix = list(
-            list(row)
-            for row in Homomorphism.zero(module, direct_sum_module).matrix
-        )
-
-        for i in range(module.rank):
-            embedding_matrix[free_part_position + i][i] = 1
+        torsion_count = len(module.torsion_numbers)
+        embeddings.append(DirectSumEmbedding(
+            module,
+            direct_sum_module,
+            [*range(free_part_position, free_part_position + module.rank),
+             *range(torsion_part_position,
+                    torsion_part_position + torsion_count)]
+        ))
         free_part_position += module.rank
-
-        for i in range(len(module.torsion_numbers)):
-            embedding_matrix[direct_sum_module.rank +
-                             torsion_part_position + i][module.rank + i] = 1
-        torsion_part_position += len(module.torsion_numbers)
-
-        embeddings.append(
-            Homomorphism(embedding_matrix, module, direct_sum_module)
-        )
+        torsion_part_position += torsion_count
 
     return direct_sum_module, tuple(embeddings)
@@ -1,101 +1,183 @@
 from __future__ import annotations
-from collections.abc import Sequence
-from typing import Callable
+from collections.abc import Iterable, Sequence
 from math import gcd
+from typing import Callable, NamedTuple
 from module_theory.zmodule import ZModule
-from module_theory.cyclic_zmodule import (
-    FreeCyclicZModule, TorsionCyclicZModule
-)
 from module_theory.homomorphism import Homomorphism
-from module_theory.operators.direct_sum import direct_sum
-from module_theory.operators.cyclic_summands import cyclic_summands
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory.operators.cyclic_summands import (
+    CyclicBlock, cyclic_blocks
+)
 from module_theory.cochain_complex import CochainComplex
 
 
+class HomSummand(NamedTuple):
+    """A nontrivial cyclic summand of Hom(A, B).
+
+    It holds the maps that send the generator of the column-th cyclic
+    summand of A to a multiple of scale in the row-th one of B, and sits
+    at the given coordinate of Hom(A, B). torsion is 0 for a free summand.
+    For Hom(Z/p, Z/q) = Z/gcd(p, q) the scale is q / gcd(p, q), otherwise
+    it is 1.
+    """
+    row: int
+    column: int
+    coordinate: int
+    torsion: int
+    scale: int
+
+
 class Hom(ZModule):
     def __init__(self, domain: ZModule, codomain: ZModule):
         self.domain: ZModule = domain
         self.codomain: ZModule = codomain
         if self.domain.is_zero() or self.codomain.is_zero():
             super().__init__(0, ())
-            self._embeddings: tuple[Homomorphism, ...] = (
-                Homomorphism.zero(self.domain, self.codomain),
-            )
+            self._summands: tuple[HomSummand, ...] = ()
+            self._entry_indices: tuple[int, ...] = ()
+            self._scales: tuple[int, ...] = ()
             return
 
-        sum_of_cyclic, self._embeddings = direct_sum(*(
-            self._hom_of_cyclic_modules(domain_summand, codomain_summand)
-            for codomain_summand in cyclic_summands(self.codomain)
-            for domain_summand in cyclic_summands(self.domain)
-        ))
+        self._summands = self._layout(
+            cyclic_blocks(self.domain), cyclic_blocks(self.codomain)
+        )
+
+        super().__init__(
+            sum(not summand.torsion for summand in self._summands),
+            [summand.torsion for summand in self._summands if summand.torsion]
+        )
+        # Coordinate k of an element is entry _entry_indices[k] of the
+        # flattened matrix, divided by _scales[k]
+        self._entry_indices = tuple(
+            summand.row * self.domain.dimensions() + summand.column
+            for summand in self._summands
+        )
+        self._scales = tuple(summand.scale for summand in self._summands)
+
+    @classmethod
+    def _layout(cls, domain_blocks: Sequence[CyclicBlock],
+                codomain_blocks: Sequence[CyclicBlock]
+                ) -> tuple[HomSummand, ...]:
+        # The summands are laid out as in their direct sum: free ones
+        # first, then torsion ones. Since the free rows of the matrix come
+        # first, so do the free summands in row-major order. All rows of a
+        # block of the codomain share the same nontrivial summands, so
+        # these are found once per pair of blocks
+        layout: list[HomSummand] = []
+        first_row = 0
+        for codomain_block in codomain_blocks:
+            pattern: list[tuple[int, int, int]] = []
+            first_column = 0
+            for domain_block in domain_blocks:
+                summand = cls._hom_of_cyclic_types(
+                    domain_block.torsion, codomain_block.torsion
+                )
+                if summand is not None:
+                    pattern.extend(
+                        (column, *summand) for column in range(
+                            first_column,
+                            first_column + domain_block.multiplicity
+                        )
+                    )
+                first_column += domain_block.multiplicity
+            for row in range(first_row,
+                             first_row + codomain_block.multiplicity):
+                layout.extend([
+                    HomSummand(row, column, len(layout) + index, torsion,
+                               scale)
+                    for index, (column, torsion, scale) in enumerate(pattern)
+                ])
+            first_row += codomain_block.multiplicity
+        return tuple(layout)
 
-        super().__init__(sum_of_cyclic.rank, sum_of_cyclic.torsion_numbers)
-        assert self._embeddings is not None, "_embeddings is None!"
+    def summands(self) -> tuple[HomSummand, ...]:
+        return self._summands
 
     @staticmethod
-    def _hom_of_cyclic_modules(domain: ZModule, codomain: ZModule) -> ZModule:
-        # If domain and codomain are cyclic, then find Hom directly:
-        match (domain, codomain):
-            case (TorsionCyclicZModule(), FreeCyclicZModule()):
-                # Hom(Z/pZ, Z) is trivial
-                return ZModule.zero()
-            case (TorsionCyclicZModule(p), TorsionCyclicZModule(q)):
-                # Hom(Z/pZ, Z/qZ) = Z / gcd(p, q)Z
-                torsion = gcd(domain.torsion, codomain.torsion)
-                if torsion >= 2:
-                    return TorsionCyclicZModule(torsion)
-                else:
-                    return ZModule.zero()
-            case (FreeCyclicZModule(), _):
-                # Hom(Z, B) is isomorphic to B
-                return codomain
-            case _:
-                raise ValueError(
-                    "domain and codomain must be FreeCyclicZModule or " +
-                    "TorsionCyclicZModule"
-                )
+    def _hom_of_cyclic_types(domain_torsion: int,
+                             codomain_torsion: int) -> tuple[int, int] | None:
+        # Hom of two cyclic modules, given by their torsion (0 for Z), as
+        # its torsion and scale, or None if it is trivial
+        if not domain_torsion:
+            # Hom(Z, B) is isomorphic to B
+            return codomain_torsion, 1
+        if not codomain_torsion:
+            # Hom(Z/pZ, Z) is trivial
+            return None
+        # Hom(Z/pZ, Z/qZ) = Z / gcd(p, q)Z, generated by 1 -> q / gcd(p, q)
+        torsion = gcd(domain_torsion, codomain_torsion)
+        if torsion < 2:
+            return None
+        return torsion, codomain_torsion // torsion
 
     def element_from_homomorphism(
         self,
         homomorphism: Homomorphism
     ) -> ZModule.Element:
-        flattened_matrix = [value
-                            for row in homomorphism.matrix
-                            for value in row]
+        return self.elements_from_homomorphisms([homomorphism])[0]
+
+    def elements_from_homomorphisms(
+        self,
+        homomorphisms: Sequence[Homomorphism]
+    ) -> list[ZModule.Element]:
+        return [
+            self.element(self._gather(homomorphism))
+            if not self.is_zero() else self.zero_element()
+            for homomorphism in homomorphisms
+        ]
 
-        return sum(
-            embedding.apply(embedding.domain.element([value]))
-            for (value, embedding)
-            in zip(flattened_matrix, self._embeddings)
-        ) or self.zero_element()
+    def _gather(self, homomorphism: Homomorphism) -> list[int]:
+        if (homomorphism.domain.dimensions() != self.domain.dimensions() or
+                homomorphism.codomain.dimensions()
+                != self.codomain.dimensions()):
+            raise ValueError("dimension mismatch")
+        if homomorphism.is_sparse():
+            flattened: dict[int, int] | list[int] = {
+                row * self.domain.dimensions() + column: value
+                for row, column, value
+                in homomorphism.sparse_matrix().nonzero_entries()
+            }
+            entries = [flattened.get(index, 0)
+                       for index in self._entry_indices]
+        else:
+            flattened = [value for row in homomorphism.matrix for value in row]
+            entries = [flattened[index] for index in self._entry_indices]
+        # Entries of the trivial summands are ignored, as they must be 0
+        if any(value % scale for value, scale in zip(entries, self._scales)):
+            raise ValueError(
+                "homomorphism does not respect the torsion of its domain"
+            )
+        return [value // scale for value, scale in zip(entries, self._scales)]
 
     def homomorphism_from_element(
         self,
         element: ZModule.Element
     ) -> Homomorphism:
-        matrix = list(
-            list(row) for row
-            in Homomorphism.zero(self.domain, self.codomain).matrix
-        )
+        return self.homomorphisms_from_elements([element])[0]
 
-        # List matrix indices that correspond to nontrivial summands
-        coordinates_to_matrix_indices = [
-            (row_index, column_index)
-            for row_index in range(self.codomain.dimensions())
-            for column_index in range(self.domain.dimensions())
-            if not self._embeddings[
-                row_index * self.domain.dimensions() + column_index
-            ].is_zero()
-        ]
+    def homomorphisms_from_elements(
+        self,
+        elements: Sequence[ZModule.Element]
+    ) -> list[Homomorphism]:
+        return [self._scatter(element) for element in elements]
 
-        for (coordinate, (row, column)) in zip(
-            element.coordinates, coordinates_to_matrix_indices
+    def _scatter(self, element: ZModule.Element) -> Homomorphism:
+        if not element.module.is_identical_to(self):
+            raise ValueError("element must belong to this module")
+        if self.is_zero():
+            return Homomorphism.zero(self.domain, self.codomain)
+        column_count = self.domain.dimensions()
+        flattened = [0] * (self.codomain.dimensions() * column_count)
+        for index, scale, coordinate in zip(
+            self._entry_indices, self._scales, element.coordinates
         ):
-            matrix[row][column] = coordinate
-
-        return Homomorphism(
-            matrix, self.domain, self.codomain
-        )
+            flattened[index] = coordinate * scale
+        # Coordinates are reduced modulo gcd(p, q), so the scaled entries
+        # are reduced modulo the torsion q of the codomain
+        return Homomorphism.from_normalized_matrix(tuple(
+            tuple(flattened[start:start + column_count])
+            for start in range(0, len(flattened), column_count)
+        ), self.domain, self.codomain)
 
     # def standard_form(self) -> str:
     #     return super().__repr__()
@@ -110,11 +192,20 @@ def left_hom(
 ) -> CochainComplex:
     hom_modules = [Hom(hom_domain, module) for module in cochain_complex.modules]
 
-    induced_homomorphisms = _calcuate_induced_homomorphisms(
-        hom_modules,
-        cochain_complex.homomorphisms,
-        lambda source_homomorphism, complex_homomorphism: (
-            complex_homomorphism.compose(source_homomorphism)
+    # d_i^*(f) = d_i f: the summand at (r, c) goes to the ones at (s, c)
+    # with weight d_i[s][r], for the nonzero entries of column r
+    induced_homomorphisms = tuple(
+        _induced_homomorphism(
+            this_hom, next_hom,
+            lambda summand, columns=_grouped_entries(
+                complex_homomorphism, by_column=True
+            ): (
+                (row, summand.column, weight)
+                for row, weight in columns[summand.row]
+            )
+        )
+        for this_hom, next_hom, complex_homomorphism in zip(
+            hom_modules, hom_modules[1:], cochain_complex.homomorphisms
         )
     )
 
@@ -130,50 +221,84 @@ def right_hom(
         Hom(module, hom_codomain) for module in cochain_complex.modules
     ][::-1]
 
-    induced_homomorphisms = _calcuate_induced_homomorphisms(
-        hom_modules,
-        cochain_complex.homomorphisms[-2::-1],  # invert the order
-        lambda source_homomorphism, complex_homomorphism: (
-            source_homomorphism.compose(complex_homomorphism)
+    # d_i^*(f) = f d_i: the summand at (r, c) goes to the ones at (r, c')
+    # with weight d_i[c][c'], for the nonzero entries of row c
+    induced_homomorphisms = tuple(
+        _induced_homomorphism(
+            this_hom, next_hom,
+            lambda summand, rows=_grouped_entries(
+                complex_homomorphism, by_column=False
+            ): (
+                (summand.row, column, weight)
+                for column, weight in rows[summand.column]
+            )
+        )
+        for this_hom, next_hom, complex_homomorphism in zip(
+            hom_modules, hom_modules[1:],
+            cochain_complex.homomorphisms[-2::-1]  # invert the order
         )
     )
 
     return CochainComplex(hom_modules, induced_homomorphisms)
 
 
-def _calcuate_induced_homomorphisms(
-    hom_modules: Sequence[Hom],
-    original_homomorphisms: Sequence[Homomorphism],
-    homomorphism_mapping: Callable[[Homomorphism, Homomorphism], Homomorphism]
-) -> tuple[Homomorphism, ...]:
-    induced_homomorphisms: list[Homomorphism] = []
-
-    for (this_hom, next_hom, complex_homomorphism) in zip(
-        hom_modules, hom_modules[1:], original_homomorphisms
-    ):
-        # Calculate the matrices for the images of the canonical generators of
-        # Hom(D, C_i) under the action of d_i^*:
-        generating_homomorphisms = [
-            this_hom.homomorphism_from_element(generator)
-            for generator in this_hom.canonical_generators()
-        ]
+def _grouped_entries(
+    homomorphism: Homomorphism, by_column: bool
+) -> list[list[tuple[int, int]]]:
+    # The nonzero entries of the matrix as (row, value) pairs per column,
+    # or as (column, value) pairs per row
+    if homomorphism.is_sparse():
+        entries: Iterable[tuple[int, int, int]] = (
+            homomorphism.sparse_matrix().nonzero_entries()
+        )
+    else:
+        entries = (
+            (row_index, column_index, value)
+            for row_index, row in enumerate(homomorphism.matrix)
+            for column_index, value in enumerate(row)
+            if value
+        )
+    groups: list[list[tuple[int, int]]] = [[] for _ in range(
+        homomorphism.domain.dimensions() if by_column
+        else homomorphism.codomain.dimensions()
+    )]
+    for row_index, column_index, value in entries:
+        if by_column:
+            groups[column_index].append((row_index, value))
+        else:
+            groups[row_index].append((column_index, value))
+    return groups
 
-        images_of_generating_homomorphisms = [
-            homomorphism_mapping(homomorphism, complex_homomorphism)
-            for homomorphism in generating_homomorphisms
-        ]
 
-        # Now convert these matrices to their
-        # corresponding elements in Hom(D, C_{i+1}):
-        images_of_generators = [
-            next_hom.element_from_homomorphism(homomorphism)
-            for homomorphism in images_of_generating_homomorphisms
-        ]
+def _induced_homomorphism(
+    this_hom: Hom,
+    next_hom: Hom,
+    images: Callable[[HomSummand], Iterable[tuple[int, int, int]]]
+) -> Homomorphism:
+    # images gives the (row, column) positions a summand of this_hom is
+    # sent to, with their weights, one per nonzero entry of the
+    # differential. Positions without a summand of next_hom are trivial
+    # there, so the matrix is built in time linear in these entries
+    if this_hom.is_zero() or next_hom.is_zero():
+        return Homomorphism.zero(this_hom, next_hom)
 
-        induced_homomorphism = Homomorphism.from_canonical_generator_images(
-            images_of_generators, this_hom
-        )
+    summands = {
+        (image.row, image.column): image for image in next_hom.summands()
+    }
 
-        induced_homomorphisms.append(induced_homomorphism)
+    entries: list[tuple[int, int, int]] = []
+    for summand in this_hom.summands():
+        for row, column, weight in images(summand):
+            image = summands.get((row, column))
+            if image is None:
+                continue
+            value = weight * summand.scale
+            if image.torsion:
+                modulus = image.torsion * image.scale
+                value = value % modulus // image.scale
+            if value:
+                entries.append((image.coordinate, summand.coordinate, value))
 
-    return tuple(induced_homomorphisms)
+    return Homomorphism(SparseMatrix.from_entries(
+        next_hom.dimensions(), this_hom.dimensions(), entries
+    ), this_hom, next_hom)
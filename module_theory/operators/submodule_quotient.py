@@ -5,6 +5,8 @@ from collections.abc import Sequence
 from module_theory.zmodule import ZModule
 from module_theory.homomorphism import Homomorphism
 from module_theory._internal.smith_normal_form import SmithNormalFormCalculator
+from module_theory._internal.matrix_manipulator import ChangeMatrix
+from module_theory._internal.smith_normal_form_cache import cached_matrices
 from module_theory._internal.reduction import reduction
 import itertools
 
@@ -31,8 +33,9 @@ class SubmoduleQuotient(ZModule):
         )
 
         preimages = [projection_to_generators.domain.zero_element()]
-        for kernel_generator in kernel_generators:
-            preimage = projection_to_generators.preimage(kernel_generator)
+        for preimage in projection_to_generators.preimage_many(
+            kernel_generators
+        ):
             if preimage is None:
                 raise ValueError(
                     "images of generators do not span kernel_generators"
@@ -43,14 +46,24 @@ class SubmoduleQuotient(ZModule):
             Homomorphism.from_canonical_generator_images(preimages)
         )
 
-        smith_normal_form = SmithNormalFormCalculator(
-            projection_to_preimages.matrix
-        ).smith_normal_form()
-
-        change_matrix = Homomorphism(
-            smith_normal_form.inverse_row_change_matrix
+        def factorize() -> list[tuple[tuple[int, ...], ...]]:
+            calculator = SmithNormalFormCalculator(
+                projection_to_preimages.matrix,
+                change_matrices=ChangeMatrix.INVERSE_ROW
+            )
+            return [
+                (calculator.diagonal(),),
+                calculator.change_matrix(ChangeMatrix.INVERSE_ROW)
+            ]
+
+        (diagonal,), inverse_row_change_matrix = cached_matrices(
+            "smith_normal_form_inverse_row",
+            projection_to_preimages.matrix,
+            factorize
         )
 
+        change_matrix = Homomorphism(inverse_row_change_matrix)
+
         self.quotient_generators = (
             projection_to_generators.compose(change_matrix)
                                     .canonical_generator_images()
@@ -63,8 +76,7 @@ class SubmoduleQuotient(ZModule):
         rank = 0
         torsion_numbers: list[int] = []
         for (generator_order, quotient_torsion) in itertools.zip_longest(
-            orders_of_generators,
-            smith_normal_form.diagonal[:smith_normal_form.rank]
+            orders_of_generators, diagonal
         ):
             # First branch: this element spans some kernel generator
             if quotient_torsion:
@@ -1,15 +1,18 @@
-from collections.abc import Sequence
+import bisect
+import functools
 import itertools
 import math
+from weakref import WeakValueDictionary
 from module_theory.zmodule import ZModule
 from module_theory.homomorphism import Homomorphism
 from module_theory.cochain_complex import CochainComplex
-from module_theory.cyclic_zmodule import *
-from module_theory.operators.cyclic_summands import cyclic_summands
-from module_theory.operators.direct_sum import direct_sum
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory.operators.cyclic_summands import cyclic_blocks
 
 
 TENSOR_PRODUCT_SEPARATOR_SYMBOL = " ⊗ "
+# The torsion of a trivial cyclic summand, as opposed to 0 for Z
+TRIVIAL = 1
 
 
 class TensorProduct(ZModule):
@@ -17,94 +20,175 @@ class TensorProduct(ZModule):
         if len(multipliers) < 2:
             raise ValueError("At least 2 tensor multipliers must be provided")
         self.multipliers: tuple[ZModule, ...] = multipliers
-        module, embeddings = self._calculate_tensor_product()
-        super().__init__(module.rank, module.torsion_numbers)
-        self._embeddings: tuple[Homomorphism, ...] = embeddings
-
-    def _calculate_tensor_product(self):
-        cyclic_summand_representations = [
-            cyclic_summands(module) for module in self.multipliers
+        # Combinations of cyclic summands of the multipliers are numbered
+        # in lexicographic order, in mixed radix with these strides
+        self._strides: tuple[int, ...] = tuple(
+            math.prod(module.dimensions() for module in multipliers[index:])
+            for index in range(1, len(multipliers) + 1)
+        )
+        combinations, torsions = self._calculate_tensor_product()
+        super().__init__(
+            torsions.count(0),
+            [torsion for torsion in torsions if torsion]
+        )
+        # The combination of each coordinate: both the free and the torsion
+        # part are sorted, so coordinates are found by bisection
+        self._combinations: list[int] = [
+            combination
+            for combination, torsion in zip(combinations, torsions)
+            if not torsion
+        ] + [
+            combination
+            for combination, torsion in zip(combinations, torsions)
+            if torsion
         ]
 
-        cyclic_mutiplier_combinations = [*itertools.product(
-            *cyclic_summand_representations
-        )]
+    def _calculate_tensor_product(self) -> tuple[list[int], list[int]]:
+        # The nontrivial summands, as the numbers of their combinations and
+        # their torsions (0 for Z), in lexicographic order. The summands
+        # that complete a prefix only depend on the gcd of its torsion
+        # numbers, so they are found once per position and gcd, and
+        # prefixes with a trivial gcd are pruned without being expanded
+        blocks = [cyclic_blocks(module) for module in self.multipliers]
+        strides = self._strides
 
-        direct_summands = [
-            self._tensor_product_of_cyclic_modules(combination)
-            for combination in cyclic_mutiplier_combinations
-        ]
+        @functools.cache
+        def summands(position: int,
+                     torsion: int) -> tuple[list[int], list[int]]:
+            if position == len(blocks):
+                return [0], [torsion]
+            combinations: list[int] = []
+            torsions: list[int] = []
+            first_index = 0
+            for block in blocks[position]:
+                product = self._tensor_product_of_cyclic_types(
+                    torsion, block.torsion
+                )
+                if product != TRIVIAL:
+                    completions, completion_torsions = summands(
+                        position + 1, product
+                    )
+                    for index in range(first_index,
+                                       first_index + block.multiplicity):
+                        offset = index * strides[position]
+                        combinations.extend([
+                            offset + combination
+                            for combination in completions
+                        ])
+                    torsions.extend(completion_torsions * block.multiplicity)
+                first_index += block.multiplicity
+            return combinations, torsions
 
-        return direct_sum(*direct_summands)
+        return summands(0, 0)
 
     @staticmethod
-    def _tensor_product_of_cyclic_modules(
-        modules: Sequence[ZModule]
-    ) -> ZModule:
-        if any(module.is_zero() for module in modules):
-            return ZModule.zero()
-
-        rank = int(any(module.rank for module in modules))
-        torsion_numbers = [
-            number for module in modules for number in module.torsion_numbers
-        ]
-        if not torsion_numbers:
-            return ZModule.free(rank)
-
-        torsion = math.gcd(*torsion_numbers)
-
-        if torsion >= 2:
-            return TorsionCyclicZModule(torsion)
-        else:
-            return ZModule.zero()
+    def _tensor_product_of_cyclic_types(torsion: int,
+                                        other_torsion: int) -> int:
+        # Z ⊗ B = B and Z/p ⊗ Z/q = Z/gcd(p, q), which is TRIVIAL for a
+        # gcd of 1
+        if not torsion or not other_torsion:
+            return torsion or other_torsion
+        return math.gcd(torsion, other_torsion)
 
     def pure_tensor(self, *multipliers: ZModule.Element) -> ZModule.Element:
         if len(multipliers) != len(self.multipliers):
             raise ValueError("Mismatch in number of tensor multipliers")
 
-        combinations = [*itertools.product(
-            *(element.coordinates for element in multipliers)
-        )]
-        direct_summands = cyclic_summands(self)
+        if self.is_zero():
+            return self.zero_element()
 
-        summand_elements = [
-            summand.element([math.prod(combination)])
-            for (combination, summand) in zip(combinations, direct_summands)
+        nonzero_coordinates = [
+            [(index * stride, value)
+             for index, value in enumerate(element.coordinates) if value]
+            for element, stride in zip(multipliers, self._strides)
         ]
+        if math.prod(map(len, nonzero_coordinates)) > self.dimensions():
+            # There are fewer nontrivial summands than such combinations
+            coordinates = [1] * self.dimensions()
+            for element, stride in zip(multipliers, self._strides):
+                element_coordinates = element.coordinates
+                coordinates = [
+                    value * element_coordinates[
+                        combination // stride % len(element_coordinates)
+                    ]
+                    for value, combination
+                    in zip(coordinates, self._combinations)
+                ]
+            return self.element(coordinates)
+
+        # Only combinations of nonzero coordinates contribute
+        coordinates = [0] * self.dimensions()
+        for items in itertools.product(*nonzero_coordinates):
+            coordinate = self._coordinate(sum(offset for offset, _ in items))
+            if coordinate is not None:
+                coordinates[coordinate] = math.prod(
+                    value for _, value in items
+                )
+        return self.element(coordinates)
+
+    def _coordinate(self, combination: int) -> int | None:
+        # The coordinate of a nontrivial combination, or None
+        for low, high in ((0, self.rank),
+                          (self.rank, len(self._combinations))):
+            index = bisect.bisect_left(
+                self._combinations, combination, low, high
+            )
+            if index < high and self._combinations[index] == combination:
+                return index
+        return None
 
-        return sum(
-            embedding.apply(summand_element)
-            for (embedding, summand_element)
-            in zip(self._embeddings, summand_elements)
-        ) or self.zero_element()
+    def _indices(self, combination: int) -> list[int]:
+        # The index of the cyclic summand of each multiplier
+        indices: list[int] = []
+        for stride in self._strides:
+            index, combination = divmod(combination, stride)
+            indices.append(index)
+        return indices
 
     def homomorphism(self, *components: Homomorphism) -> Homomorphism:
-        if not all(
+        if len(components) != len(self.multipliers) or not all(
             component.domain.is_identical_to(multiplier)
             for (component, multiplier)
             in zip(components, self.multipliers)
         ):
             raise ValueError("Mismatch in number of components")
 
-        component_codomains = [
-            component.codomain for component in components
-        ]
-
-        codomain = TensorProduct(*component_codomains)
+        codomain = tensor_product(
+            *(component.codomain for component in components)
+        )
+        if self.is_zero() or codomain.is_zero():
+            return Homomorphism.zero(self, codomain)
 
-        canonical_generator_images: list[TensorProduct.Element] = [
-            codomain.pure_tensor(*(image_combination))
-            for image_combination, embedding in zip(
-                itertools.product(*(component.canonical_generator_images()
-                                    for component in components)),
-                self._embeddings
-            )
-            if not embedding.is_zero()
+        # The Kronecker product of the component matrices, restricted to
+        # the nontrivial summands: the image of the generator of a
+        # combination of columns has the product of the entries of the
+        # components at each combination of rows. Only nonzero entries are
+        # visited, and the torsion of the codomain reduces the result
+        columns = [
+            [[(row * stride, value) for row, value in column]
+             for column in _nonzero_columns(component)]
+            for component, stride in zip(components, codomain._strides)
         ]
+        entries: list[tuple[int, int, int]] = []
+        for coordinate, combination in enumerate(self._combinations):
+            for items in itertools.product(*(
+                component_columns[index]
+                for component_columns, index
+                in zip(columns, self._indices(combination))
+            )):
+                image_coordinate = codomain._coordinate(
+                    sum(offset for offset, _ in items)
+                )
+                if image_coordinate is not None:
+                    entries.append((
+                        image_coordinate,
+                        coordinate,
+                        math.prod(value for _, value in items)
+                    ))
 
-        return Homomorphism.from_canonical_generator_images(
-            canonical_generator_images, self
-        )
+        return Homomorphism(SparseMatrix.from_entries(
+            codomain.dimensions(), self.dimensions(), entries
+        ), self, codomain)
 
     # def standard_form(self) -> str:
     #     return super().__repr__()
@@ -116,18 +200,57 @@ class TensorProduct(ZModule):
     #     )
 
 
+# Keyed by the ids of the multipliers: modules of different types can be
+# equal, and a product must keep its own. Each product holds its
+# multipliers, so their ids are not reused while it is in the dictionary
+_tensor_products: WeakValueDictionary[
+    tuple[int, ...], TensorProduct
+] = WeakValueDictionary()
+
+
+def tensor_product(*multipliers: ZModule) -> TensorProduct:
+    """TensorProduct(*multipliers), shared while it is in use."""
+    key = tuple(map(id, multipliers))
+    product = _tensor_products.get(key)
+    if product is None:
+        product = TensorProduct(*multipliers)
+        _tensor_products[key] = product
+    return product
+
+
+def _nonzero_columns(
+    homomorphism: Homomorphism
+) -> list[list[tuple[int, int]]]:
+    # The (row, value) pairs of the nonzero entries of each column
+    columns: list[list[tuple[int, int]]] = [
+        [] for _ in range(homomorphism.domain.dimensions())
+    ]
+    if homomorphism.is_sparse():
+        for row, column, value in (
+            homomorphism.sparse_matrix().nonzero_entries()
+        ):
+            columns[column].append((row, value))
+    else:
+        for row, values in enumerate(homomorphism.matrix):
+            for column, value in enumerate(values):
+                if value:
+                    columns[column].append((row, value))
+    return columns
+
+
 def left_tensor_product(
     cochain_complex: CochainComplex,
     multiplier: ZModule
 ) -> CochainComplex:
     tensor_products = [
-            TensorProduct(multiplier, module)
+            tensor_product(multiplier, module)
             for module in cochain_complex.modules
         ]
+    identity = Homomorphism.identity(multiplier)
     tensor_homomorphisms = [
-        tensor_product.homomorphism(
-            Homomorphism.identity(multiplier), complex_homomorphism
-        ) for (tensor_product, complex_homomorphism)
+        product.homomorphism(
+            identity, complex_homomorphism
+        ) for (product, complex_homomorphism)
         in zip(tensor_products, cochain_complex.homomorphisms)
     ]
     return CochainComplex(tensor_products, tensor_homomorphisms)
@@ -138,13 +261,14 @@ def right_tensor_product(
     multiplier: ZModule
 ) -> CochainComplex:
     tensor_products = [
-            TensorProduct(module, multiplier)
+            tensor_product(module, multiplier)
             for module in cochain_complex.modules
         ]
+    identity = Homomorphism.identity(multiplier)
     tensor_homomorphisms = [
-        tensor_product.homomorphism(
-            complex_homomorphism, Homomorphism.identity(multiplier)
-        ) for (tensor_product, complex_homomorphism)
+        product.homomorphism(
+            complex_homomorphism, identity
+        ) for (product, complex_homomorphism)
         in zip(tensor_products, cochain_complex.homomorphisms)
     ]
     return CochainComplex(tensor_products, tensor_homomorphisms)
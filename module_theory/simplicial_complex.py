@@ -0,0 +1,169 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from collections.abc import Hashable, Iterable, Iterator
+from math import comb
+import os
+from module_theory.zmodule import ZModule
+from module_theory.homomorphism import Homomorphism
+from module_theory.cochain_complex import CochainComplex
+from module_theory._internal.sparse_matrix import SparseMatrix
+
+
+class SimplicialComplex:
+    """A simplicial complex given by its facets, with its cochain complex.
+
+    Vertices are numbered in order of first appearance, and a face with
+    vertex numbers v_0 < ... < v_k is stored as its index C(v_0, 1) + ...
+    + C(v_k, k + 1) in the combinatorial number system, one set of indices
+    per dimension. Facets are read once and never kept. Coordinate i of
+    C^k is the k-face with the i-th smallest index; faces() lists them in
+    that order.
+    """
+
+    def __init__(self, facets: Iterable[Iterable[Hashable]] = ()):
+        self._vertices: dict[Hashable, int] = {}
+        self._labels: list[Hashable] = []
+        # binomials[i][v] = C(v, i), extended as vertices and dimensions
+        # appear
+        self._binomials: list[list[int]] = [[]]
+        self._faces: list[set[int]] = []
+        self._sorted_faces: list[list[int]] | None = None
+        for facet in facets:
+            self.add_facet(facet)
+
+    @classmethod
+    def from_file(
+        cls, path: str | os.PathLike[str]
+    ) -> SimplicialComplex:
+        # One facet per line as integer vertex labels; "#" starts a comment
+        def facets() -> Iterator[list[int]]:
+            with open(path) as file:
+                for line in file:
+                    labels = line.split("#", 1)[0].split()
+                    if labels:
+                        yield [int(label) for label in labels]
+
+        return cls(facets())
+
+    def add_facet(self, facet: Iterable[Hashable]):
+        vertices = sorted(self._vertex(label) for label in facet)
+        if not vertices:
+            raise ValueError("facets must be non-empty")
+        if any(first == second
+               for first, second in zip(vertices, vertices[1:])):
+            raise ValueError("facets must not repeat vertices")
+
+        dimension = len(vertices) - 1
+        while len(self._faces) <= dimension:
+            self._faces.append(set())
+            self._binomials.append([
+                comb(vertex, len(self._binomials))
+                for vertex in range(len(self._labels))
+            ])
+        binomials = self._binomials
+        # Every nonempty subset of the facet, as a bitmask
+        for mask in range(1, 1 << len(vertices)):
+            index = 0
+            count = 0
+            for position, vertex in enumerate(vertices):
+                if mask >> position & 1:
+                    count += 1
+                    index += binomials[count][vertex]
+            self._faces[count - 1].add(index)
+        self._sorted_faces = None
+
+    def dimension(self) -> int:
+        return len(self._faces) - 1
+
+    def face_count(self, dimension: int) -> int:
+        if not 0 <= dimension < len(self._faces):
+            return 0
+        return len(self._faces[dimension])
+
+    def faces(self, dimension: int) -> Iterator[tuple[Hashable, ...]]:
+        if not 0 <= dimension < len(self._faces):
+            return iter(())
+        labels = self._labels
+        return (
+            tuple(labels[vertex] for vertex in self._face(index, dimension))
+            for index in self._sorted()[dimension]
+        )
+
+    def cochain_complex(self) -> CochainComplex:
+        """The simplicial cochain complex, with sparse coboundaries.
+
+        d_k sends a k-cochain f to the (k+1)-cochain whose value on
+        [v_0, ..., v_(k+1)] is the sum of (-1)^i f([..., v_i omitted, ...]).
+        """
+        if not self._faces:
+            raise ValueError("the complex has no faces")
+
+        faces = self._sorted()
+        modules = [ZModule.free(len(indices)) for indices in faces]
+        homomorphisms: list[Homomorphism] = []
+        for dimension in range(len(faces) - 1):
+            homomorphisms.append(Homomorphism.from_normalized_sparse_matrix(
+                SparseMatrix.from_entries(
+                    len(faces[dimension + 1]),
+                    len(faces[dimension]),
+                    self._coboundary_entries(dimension + 1)
+                ),
+                modules[dimension],
+                modules[dimension + 1]
+            ))
+        zero = ZModule.zero()
+        homomorphisms.append(Homomorphism.from_normalized_sparse_matrix(
+            SparseMatrix.from_entries(
+                zero.dimensions(), modules[-1].dimensions(), ()
+            ),
+            modules[-1],
+            zero
+        ))
+        return CochainComplex(modules, homomorphisms)
+
+    def _vertex(self, label: Hashable) -> int:
+        vertex = self._vertices.get(label)
+        if vertex is None:
+            vertex = self._vertices[label] = len(self._labels)
+            self._labels.append(label)
+            for size, binomials in enumerate(self._binomials):
+                binomials.append(comb(vertex, size))
+        return vertex
+
+    def _sorted(self) -> list[list[int]]:
+        if self._sorted_faces is None:
+            self._sorted_faces = [sorted(indices) for indices in self._faces]
+        return self._sorted_faces
+
+    def _face(self, index: int, dimension: int) -> list[int]:
+        # The greedy inverse of the combinatorial number system
+        vertices = [0] * (dimension + 1)
+        for position in range(dimension, -1, -1):
+            binomials = self._binomials[position + 1]
+            vertex = bisect_right(binomials, index) - 1
+            vertices[position] = vertex
+            index -= binomials[vertex]
+        return vertices
+
+    def _coboundary_entries(
+        self, dimension: int
+    ) -> Iterator[tuple[int, int, int]]:
+        # Entries of d_(dimension-1): one row per face of this dimension
+        lower = self._sorted()[dimension - 1]
+        binomials = self._binomials
+        for row, index in enumerate(self._sorted()[dimension]):
+            vertices = self._face(index, dimension)
+            # The face without v_i keeps the positions of v_0, ..., v_(i-1)
+            # and moves v_(i+1), ... one position down
+            suffix = sum(
+                binomials[position][vertex]
+                for position, vertex in enumerate(vertices) if position
+            )
+            prefix = 0
+            for position, vertex in enumerate(vertices):
+                if position:
+                    suffix -= binomials[position][vertex]
+                face = prefix + suffix
+                yield (row, bisect_left(lower, face),
+                       -1 if position & 1 else 1)
+                prefix += binomials[position + 1][vertex]
@@ -1,6 +1,13 @@
 from __future__ import annotations
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from array import array
+from itertools import repeat
 from math import gcd, lcm
+from typing import Any, ClassVar, Self, SupportsIndex
+from weakref import WeakValueDictionary
+import importlib.util
+import operator
+import threading
 
 DIRECT_SUM_SEPARATOR_SYMBOL = " ⊕ "
 Z_SYMBOL = "ℤ"
@@ -8,19 +15,100 @@ POWER_SYMBOL = "^"
 QUOTIENT_SYMBOL = "/"
 IDEAL_SEPARATOR_SYMBOL = " + "
 COORDINATE_SEPARATOR_SYMBOL = ", "
+# Entries of an ElementBatch are stored as int64 while strictly below this
+# bound, so that a sum of two of them cannot overflow
+BATCH_SAFE_MAGNITUDE = 2 ** 62
+# numpy is optional; with it, ElementBatch values are numpy arrays
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+_intern_lock = threading.Lock()
 
 
 class ZModule:
+    """A finitely generated abelian group Z^rank + Z/t_1 + ... + Z/t_k.
+
+    Modules are immutable. Plain ZModule instances are interned by rank and
+    torsion numbers, so equal ones are the same object. Subclasses carry
+    extra structure and are not interned, but each of them refers to the
+    interned module with its rank and torsion numbers, which makes
+    is_identical_to a pointer comparison in all cases.
+    """
+
+    __slots__ = (
+        "rank", "torsion_numbers", "_canonical", "_dimensions",
+        "_zero_element", "_canonical_generators", "__weakref__"
+    )
+    rank: int
+    torsion_numbers: tuple[int, ...]
+    _interned: ClassVar[
+        WeakValueDictionary[tuple[int, tuple[int, ...]], ZModule]
+    ] = WeakValueDictionary()
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> Self:
+        if cls is not ZModule:
+            return super().__new__(cls)
+        module = ZModule._intern(*args, **kwargs)
+        assert isinstance(module, cls)
+        return module
+
     def __init__(self,
                  rank: int,
                  torsion_numbers: Sequence[int]):
+        # Interned modules are initialized once, by __new__
+        if type(self) is not ZModule:
+            self._initialize(rank, tuple(torsion_numbers))
+            self._canonical: ZModule = ZModule(rank, self.torsion_numbers)
+
+    @staticmethod
+    def _intern(rank: int, torsion_numbers: Sequence[int]) -> ZModule:
+        key = (rank, tuple(torsion_numbers))
+        with _intern_lock:
+            module = ZModule._interned.get(key)
+            if module is None:
+                module = object.__new__(ZModule)
+                module._initialize(*key)
+                module._canonical = module
+                ZModule._interned[key] = module
+        return module
+
+    def _initialize(self, rank: int, torsion_numbers: tuple[int, ...]):
         if rank < 0:
             raise ValueError("rank must be non-negative")
         if any(value < 2 for value in torsion_numbers):
             raise ValueError("every Betti number must be at least 2")
 
-        self.rank: int = rank
-        self.torsion_numbers: tuple[int, ...] = tuple(torsion_numbers)
+        # Set past __setattr__, which rejects any later change
+        object.__setattr__(self, "rank", rank)
+        object.__setattr__(self, "torsion_numbers", torsion_numbers)
+        self._dimensions: int = max(rank + len(torsion_numbers), 1)
+        self._zero_element: ZModule.Element | None = None
+        self._canonical_generators: tuple[ZModule.Element, ...] | None = None
+
+    def __setattr__(self, name: str, value: object):
+        if name in ("rank", "torsion_numbers"):
+            raise AttributeError("ZModule is immutable")
+        super().__setattr__(name, value)
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> str | tuple[Any, ...]:
+        # Unpickled plain modules are interned again
+        if type(self) is ZModule:
+            return ZModule, (self.rank, self.torsion_numbers)
+        return super().__reduce_ex__(protocol)
+
+    def __setstate__(self, state: Any):
+        # Unpickled subclass instances are also set past __setattr__
+        if isinstance(state, tuple):
+            dictionary, slots = state
+        else:
+            dictionary, slots = state, None
+        for name, value in {**(dictionary or {}), **(slots or {})}.items():
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ZModule) and self.is_identical_to(other)
+
+    def __hash__(self) -> int:
+        return id(self._canonical)
 
     @staticmethod
     def zero() -> ZModule:
@@ -31,31 +119,39 @@ class ZModule:
         return ZModule(rank, ())
 
     def dimensions(self) -> int:
-        return max(self.rank + len(self.torsion_numbers), 1)
+        return self._dimensions
 
     def is_zero(self) -> bool:
         return self.rank == 0 and not self.torsion_numbers
 
     def is_identical_to(self, other: ZModule) -> bool:
-        return (self.rank == other.rank
-                and self.torsion_numbers == other.torsion_numbers)
+        return self._canonical is other._canonical
 
     def element(self, coordinates: Sequence[int]) -> ZModule.Element:
         return ZModule.Element(self, coordinates)
 
+    def element_batch(
+        self, coordinates: Sequence[Sequence[int]]
+    ) -> ZModule.ElementBatch:
+        return ZModule.ElementBatch(self, coordinates)
+
     def zero_element(self) -> ZModule.Element:
-        return self.element([0 for _ in range(self.dimensions())])
+        if self._zero_element is None:
+            self._zero_element = self.element([0] * self.dimensions())
+        return self._zero_element
 
     def canonical_generators(self) -> list[ZModule.Element]:
-        if self.is_zero():
-            return [self.zero_element()]
-
-        return [
-            self.element([
-                1 if coordinate == generator_index else 0
-                for coordinate in range(self.dimensions())
-            ]) for generator_index in range(self.dimensions())
-        ]
+        if self._canonical_generators is None:
+            if self.is_zero():
+                self._canonical_generators = (self.zero_element(),)
+            else:
+                self._canonical_generators = tuple(
+                    self.element([
+                        1 if coordinate == generator_index else 0
+                        for coordinate in range(self.dimensions())
+                    ]) for generator_index in range(self.dimensions())
+                )
+        return list(self._canonical_generators)
 
     def __repr__(self) -> str:
         free_part = None
@@ -95,6 +191,8 @@ class ZModule:
         )
 
     class Element:
+        __slots__ = ("module", "coordinates")
+
         def __init__(self, module: ZModule, coordinates: Sequence[int]):
             if len(coordinates) != module.dimensions():
                 raise ValueError("length of coordinates must be equal to " +
@@ -104,14 +202,22 @@ class ZModule:
             if self.module.is_zero():
                 self.coordinates: tuple[int, ...] = (0,)
             else:
-                self.coordinates = tuple(
-                    coordinates[:module.rank]
-                ) + tuple(
-                    coordinate % torsion for (coordinate, torsion) in zip(
-                        coordinates[module.rank:], module.torsion_numbers
-                    )
+                self.coordinates = _reduce_coordinates(
+                    module, tuple(coordinates)
                 )
 
+        @staticmethod
+        def from_normalized(
+            module: ZModule, coordinates: tuple[int, ...]
+        ) -> ZModule.Element:
+            # Trusted constructor for internal use: the coordinates must be
+            # reduced modulo the torsion of the module, since they are
+            # neither validated nor copied
+            element = ZModule.Element.__new__(ZModule.Element)
+            element.module = module
+            element.coordinates = coordinates
+            return element
+
         def is_zero(self) -> bool:
             return not any(self.coordinates)
 
@@ -132,17 +238,14 @@ class ZModule:
             return lcm(*quotients)
 
         def __add__(self, other: ZModule.Element) -> ZModule.Element:
-            if (
-                self.module.rank != other.module.rank or
-                self.module.torsion_numbers != other.module.torsion_numbers
-            ):
+            if not self.module.is_identical_to(other.module):
                 raise ValueError("Summands must belong to the same module")
 
-            return self.module.element([
-                left_summand_coordinate + right_summand_coordinate
-                for (left_summand_coordinate, right_summand_coordinate)
-                in zip(self.coordinates, other.coordinates)
-            ])
+            return ZModule.Element.from_normalized(
+                self.module, _reduce_coordinates(self.module, tuple(
+                    map(operator.add, self.coordinates, other.coordinates)
+                ))
+            )
 
         def __radd__(self, other: object) -> ZModule.Element:
             if isinstance(other, ZModule.Element):
@@ -152,8 +255,10 @@ class ZModule:
 
         def __mul__(self, other: object) -> ZModule.Element:
             if isinstance(other, int):
-                return self.module.element(
-                    [other * value for value in self.coordinates]
+                return ZModule.Element.from_normalized(
+                    self.module, _reduce_coordinates(self.module, tuple(
+                        other * value for value in self.coordinates
+                    ))
                 )
             else:
                 return self
@@ -186,3 +291,201 @@ class ZModule:
         @staticmethod
         def __ideal_repr(torsion_number: int) -> str:
             return IDEAL_SEPARATOR_SYMBOL + str(torsion_number) + Z_SYMBOL
+
+    class ElementBatch:
+        """Many elements of one module, one row of coordinates per element.
+
+        With numpy, the rows form a 2-D array of int64 while every value is
+        small enough, and arithmetic and the reduction of torsion columns
+        are array operations; larger values promote it to dtype=object.
+        Without numpy they are kept row-major in an array of int64, or in a
+        list of Python integers once promoted.
+        """
+
+        __slots__ = ("module", "_values")
+
+        def __init__(self, module: ZModule,
+                     coordinates: Sequence[Sequence[int]]):
+            dimensions = module.dimensions()
+            if any(len(row) != dimensions for row in coordinates):
+                raise ValueError("length of coordinates must be equal to " +
+                                 "the number of dimensions in module")
+
+            self.module: ZModule = module
+            if NUMPY_AVAILABLE:
+                import numpy
+                self._values: Any = numpy.array(
+                    [list(row) for row in coordinates], dtype=object
+                ).reshape(len(coordinates), dimensions)
+            else:
+                self._values = [value for row in coordinates for value in row]
+            self._normalize()
+
+        @staticmethod
+        def from_elements(
+            module: ZModule, elements: Sequence[ZModule.Element]
+        ) -> ZModule.ElementBatch:
+            if not all(element.module.is_identical_to(module)
+                       for element in elements):
+                raise ValueError("All elements must belong to the module")
+            return ZModule.ElementBatch(
+                module, [element.coordinates for element in elements]
+            )
+
+        def to_elements(self) -> list[ZModule.Element]:
+            return [self.module.element(row) for row in self.rows()]
+
+        def rows(self) -> Iterator[tuple[int, ...]]:
+            if NUMPY_AVAILABLE:
+                yield from map(tuple, self._values.tolist())
+                return
+            dimensions = self.module.dimensions()
+            for start in range(0, len(self._values), dimensions):
+                yield tuple(self._values[start:start + dimensions])
+
+        def is_promoted(self) -> bool:
+            if NUMPY_AVAILABLE:
+                return self._values.dtype == object
+            return isinstance(self._values, list)
+
+        def __len__(self) -> int:
+            if NUMPY_AVAILABLE:
+                return self._values.shape[0]
+            return len(self._values) // self.module.dimensions()
+
+        def __getitem__(self, index: int) -> ZModule.Element:
+            if not -len(self) <= index < len(self):
+                raise IndexError("element index out of range")
+            index %= len(self)
+            if NUMPY_AVAILABLE:
+                return self.module.element(self._values[index].tolist())
+            dimensions = self.module.dimensions()
+            start = index * dimensions
+            return self.module.element(
+                self._values[start:start + dimensions]
+            )
+
+        def is_zero(self) -> list[bool]:
+            if NUMPY_AVAILABLE:
+                return (~self._values.any(axis=1)).tolist()
+            return [not any(row) for row in self.rows()]
+
+        def order(self) -> list[int | None]:
+            rank = self.module.rank
+            torsion_numbers = self.module.torsion_numbers
+            orders: list[int | None] = []
+            for row in self.rows():
+                if any(row[:rank]):
+                    orders.append(None)
+                    continue
+                orders.append(lcm(*(
+                    torsion_number // gcd(torsion_number, coordinate)
+                    for coordinate, torsion_number
+                    in zip(row[rank:], torsion_numbers)
+                )))
+            return orders
+
+        def __add__(
+            self, other: ZModule.ElementBatch
+        ) -> ZModule.ElementBatch:
+            if not self.module.is_identical_to(other.module):
+                raise ValueError("Summands must belong to the same module")
+            if len(self) != len(other):
+                raise ValueError("Batches must have the same length")
+            if NUMPY_AVAILABLE:
+                # Normalized int64 values are below BATCH_SAFE_MAGNITUDE,
+                # so their sum cannot overflow
+                return self._with_values(self._values + other._values)
+            return self._with_values(
+                list(map(operator.add, self._values, other._values))
+            )
+
+        def __mul__(self, other: int) -> ZModule.ElementBatch:
+            if NUMPY_AVAILABLE:
+                values = self._values
+                # Bound the product in Python integers before multiplying
+                if not self.is_promoted() and (
+                    abs(other) >= BATCH_SAFE_MAGNITUDE
+                    or values.size and abs(other) * int(abs(values).max())
+                    >= BATCH_SAFE_MAGNITUDE
+                ):
+                    values = values.astype(object)
+                return self._with_values(values * other)
+            return self._with_values(
+                list(map(operator.mul, self._values, repeat(other)))
+            )
+
+        __rmul__ = __mul__
+
+        def __neg__(self) -> ZModule.ElementBatch:
+            return self * -1
+
+        def __sub__(
+            self, other: ZModule.ElementBatch
+        ) -> ZModule.ElementBatch:
+            return self + -other
+
+        def __repr__(self) -> str:
+            return "[" + COORDINATE_SEPARATOR_SYMBOL.join(
+                str(element) for element in self.to_elements()
+            ) + "]"
+
+        def _with_values(self, values: Any) -> ZModule.ElementBatch:
+            batch = ZModule.ElementBatch(self.module, ())
+            batch._values = values
+            batch._normalize()
+            return batch
+
+        def _normalize(self):
+            # Reduces torsion coordinates, then stores the values as int64
+            # when every one of them is small enough
+            if NUMPY_AVAILABLE:
+                self._normalize_array()
+                return
+            values = list(self._values)
+            if self.module.is_zero():
+                values = [0] * len(values)
+            dimensions = self.module.dimensions()
+            for index, torsion in enumerate(self.module.torsion_numbers):
+                column = self.module.rank + index
+                values[column::dimensions] = [
+                    value % torsion for value in values[column::dimensions]
+                ]
+            if all(-BATCH_SAFE_MAGNITUDE < value < BATCH_SAFE_MAGNITUDE
+                   for value in values):
+                self._values = array("q", values)
+            else:
+                self._values = values
+
+        def _normalize_array(self):
+            import numpy
+            values = self._values
+            if self.module.is_zero():
+                values = numpy.zeros(values.shape, dtype=numpy.int64)
+            torsion_numbers = self.module.torsion_numbers
+            if torsion_numbers and values.size:
+                if max(torsion_numbers) >= BATCH_SAFE_MAGNITUDE:
+                    values = values.astype(object)
+                # Every torsion column is reduced by its own modulus at once
+                values[:, self.module.rank:] %= numpy.array(
+                    torsion_numbers, dtype=values.dtype
+                )
+            if values.size and (
+                int(abs(values).max()) >= BATCH_SAFE_MAGNITUDE
+            ):
+                self._values = values.astype(object)
+            else:
+                self._values = values.astype(numpy.int64)
+
+
+def _reduce_coordinates(
+    module: ZModule, coordinates: tuple[int, ...]
+) -> tuple[int, ...]:
+    # Free modules need no reduction, so their tuples are not copied
+    if not module.torsion_numbers:
+        return coordinates
+    return coordinates[:module.rank] + tuple(
+        coordinate % torsion for (coordinate, torsion) in zip(
+            coordinates[module.rank:], module.torsion_numbers
+        )
+    )
@@ -0,0 +1,115 @@
+import unittest
+from module_theory._internal.matrix import Matrix
+from module_theory._internal.matrix_manipulator import ChangeMatrix
+from module_theory._internal.hermite_normal_form import (
+    HermiteNormalFormCalculator
+)
+from module_theory._internal.kernel_and_image import KernelAndImageCalculator
+from module_theory.homomorphism import Homomorphism
+
+
+class TestHermiteNormalForm(unittest.TestCase):
+    def test_hermite_normal_form(self):
+        array = [
+            [3, 2, 1, 4],
+            [2, 3, 1, -1],
+            [4, 4, -2, -2],
+        ]
+        calculator = HermiteNormalFormCalculator(Matrix(array))
+        self.assertEqual(calculator.row_echelon().array, [
+            [1, 0, 11, 16],
+            [0, 1, 11, 11],
+            [0, 0, 18, 22]
+        ])
+        self.assertEqual(calculator.row_rank(), 3)
+        self.assertEqual(
+            Homomorphism(calculator.inverse_change_matrix().array)
+            .compose(Homomorphism(array)).matrix,
+            calculator.row_echelon().immutable()
+        )
+        self.assertEqual(
+            Homomorphism(calculator.inverse_change_matrix().array)
+            .compose(Homomorphism(calculator.change_matrix().array)).matrix,
+            Homomorphism.identity(Homomorphism(array).codomain).matrix
+        )
+
+    def test_negative_pivot(self):
+        calculator = HermiteNormalFormCalculator(Matrix([
+            [0, -3, 5],
+            [0, 0, -2]
+        ]))
+        self.assertEqual(calculator.row_echelon().array, [
+            [0, 3, 1],
+            [0, 0, 2]
+        ])
+
+    def test_kernel_rows(self):
+        calculator = HermiteNormalFormCalculator(
+            Matrix([[3], [5], [7], [11]]), ChangeMatrix.INVERSE_ROW
+        )
+        self.assertEqual(calculator.row_echelon().array, [
+            [1], [0], [0], [0]
+        ])
+        # The left kernel is in Hermite normal form too
+        self.assertEqual(
+            calculator.inverse_change_matrix().array[1:], [
+                [1, 0, 9, -6],
+                [0, 1, 4, -3],
+                [0, 0, 11, -7]
+            ]
+        )
+
+    def test_rank_deficient(self):
+        array = [
+            [2, 4, 6],
+            [1, 2, 3],
+            [3, 6, 10],
+            [0, 0, 4]
+        ]
+        calculator = HermiteNormalFormCalculator(Matrix(array))
+        self.assertEqual(calculator.row_rank(), 2)
+        self.assertEqual(calculator.row_echelon().array, [
+            [1, 2, 0],
+            [0, 0, 1],
+            [0, 0, 0],
+            [0, 0, 0]
+        ])
+        # The Hermite normal form of [A | I]: the kernel rows are reduced,
+        # and so are the image rows above the kernel pivots
+        self.assertEqual(calculator.inverse_change_matrix().array, [
+            [0, 10, -3, 0],
+            [0, 9, -3, 1],
+            [1, 10, -4, 1],
+            [0, 12, -4, 1]
+        ])
+        self.assertEqual(
+            Homomorphism(calculator.inverse_change_matrix().array)
+            .compose(Homomorphism(array)).matrix,
+            calculator.row_echelon().immutable()
+        )
+        self.assertEqual(
+            Homomorphism(calculator.inverse_change_matrix().array)
+            .compose(Homomorphism(calculator.change_matrix().array)).matrix,
+            Homomorphism.identity(Homomorphism(array).codomain).matrix
+        )
+
+    def test_same_image_as_row_echelon(self):
+        matrix = [
+            [0, 2, 2],
+            [1, 0, -1],
+            [3, 4, 1],
+            [5, 3, -2]
+        ]
+        hermite = KernelAndImageCalculator(
+            matrix, echelon_calculator=HermiteNormalFormCalculator
+        )
+        echelon = KernelAndImageCalculator(matrix)
+        self.assertEqual(hermite.image, [
+            [2, 0, 4, 3],
+            [0, 1, 3, 5]
+        ])
+        self.assertEqual(len(hermite.image), len(echelon.image))
+
+
+if __name__ == '__main__':
+    unittest.main()
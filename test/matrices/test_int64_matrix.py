@@ -0,0 +1,148 @@
+import unittest
+import importlib.util
+from module_theory._internal.matrix import Matrix
+from module_theory._internal.row_echelon import RowEchelonCalculator
+from module_theory._internal.smith_normal_form import SmithNormalFormCalculator
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if HAS_NUMPY:
+    from module_theory._internal.int64_matrix import (
+        Int64Matrix, SAFE_MAGNITUDE
+    )
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestInt64Matrix(unittest.TestCase):
+    def test_elementary_operations(self):
+        matrix = Int64Matrix([
+            [1, 2, 3],
+            [4, 5, 6],
+            [7, 8, 9]
+        ])
+
+        matrix.exchange_rows(0, 2)
+        matrix.exchange_columns(0, 1)
+        matrix.multiply_row_by_negative_one(1)
+        matrix.multiply_column_by_negative_one(2)
+        matrix.add_multiple_of_row(0, 1, 100)
+        matrix.add_multiple_of_column(2, 1, 10)
+
+        self.assertEqual(matrix.array, [
+            [-492, -393, -3339],
+            [-5, -4, -34],
+            [2, 1, 7]
+        ])
+        self.assertFalse(matrix.is_promoted())
+
+    def test_transpose(self):
+        matrix = Int64Matrix([
+            [1, 2, 3],
+            [4, 5, 6]
+        ])
+
+        matrix.transpose()
+
+        self.assertEqual(matrix.immutable(), (
+            (1, 4),
+            (2, 5),
+            (3, 6)
+        ))
+
+    def test_nonzero_queries(self):
+        matrix = Int64Matrix([
+            [9, 8, 7],
+            [-4, 0, 3],
+            [0, -10, -2]
+        ])
+
+        self.assertEqual(matrix.nonzero_rows_in_column(0, 1), [1])
+        self.assertEqual(matrix.nonzero_columns_in_row(1), [0, 2])
+        self.assertEqual(matrix.minimal_nonzero_entry(1, 1), (2, 2))
+        self.assertEqual(list(matrix.nonzero_entries(1, 1)), [
+            (1, 2, 3), (2, 1, -10), (2, 2, -2)
+        ])
+        self.assertFalse(matrix.is_submatrix_zero(2, 2))
+        self.assertTrue(Int64Matrix([[0, 0], [0, 0]]).is_zero())
+
+    def test_promotion(self):
+        matrix = Int64Matrix([
+            [SAFE_MAGNITUDE // 2, 1],
+            [SAFE_MAGNITUDE // 2, 1]
+        ])
+
+        matrix.add_multiple_of_row(0, 1, 1)
+        self.assertTrue(matrix.is_promoted())
+        matrix.add_multiple_of_row(0, 1, 2 ** 70)
+
+        self.assertEqual(matrix.array, [
+            [SAFE_MAGNITUDE + 2 ** 131, 2 + 2 ** 70],
+            [SAFE_MAGNITUDE // 2, 1]
+        ])
+
+    def test_promotion_on_construction(self):
+        matrix = Int64Matrix([[2 ** 100]])
+
+        self.assertTrue(matrix.is_promoted())
+        self.assertEqual(matrix.entry(0, 0), 2 ** 100)
+
+    def test_multiply(self):
+        left = Int64Matrix([
+            [1, 2],
+            [0, -1]
+        ])
+        right = Int64Matrix([
+            [3, 0, 1],
+            [1, 1, 0]
+        ])
+
+        product = left.multiply(right)
+
+        self.assertEqual(product.array, [
+            [5, 2, 1],
+            [-1, -1, 0]
+        ])
+        self.assertFalse(product.is_promoted())
+
+    def test_multiply_promotes_large_products(self):
+        left = Int64Matrix([[2 ** 40, 2 ** 40]])
+        right = Int64Matrix([[2 ** 40], [1]])
+
+        product = left.multiply(right)
+
+        self.assertTrue(product.is_promoted())
+        self.assertEqual(product.array, [[2 ** 80 + 2 ** 40]])
+
+    def test_row_echelon_matches_list_backend(self):
+        array = [
+            [3, 2, 1, 4],
+            [2, 3, 1, -1],
+            [4, 4, -2, -2],
+        ]
+
+        expected = RowEchelonCalculator(Matrix(array))
+        result = RowEchelonCalculator(Int64Matrix(array))
+
+        self.assertEqual(result.row_echelon().array,
+                         expected.row_echelon().array)
+        self.assertEqual(result.inverse_change_matrix().array,
+                         expected.inverse_change_matrix().array)
+        self.assertEqual(result.row_rank(), expected.row_rank())
+
+    def test_smith_normal_form_matches_list_backend(self):
+        array = [
+            [3, 2, 3],
+            [0, 2, 0],
+            [2, 2, 2]
+        ]
+
+        expected = SmithNormalFormCalculator(array).smith_normal_form()
+        result = SmithNormalFormCalculator(
+            array, matrix_type=Int64Matrix
+        ).smith_normal_form()
+
+        self.assertEqual(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
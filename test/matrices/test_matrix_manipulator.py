@@ -1,6 +1,8 @@
 import unittest
 from module_theory._internal.matrix import Matrix
-from module_theory._internal.matrix_manipulator import MatrixManipulator
+from module_theory._internal.matrix_manipulator import (
+    ChangeMatrix, MatrixManipulator
+)
 
 
 class TestMatrixManipulator(unittest.TestCase):
@@ -132,5 +134,32 @@ class TestMatrixManipulator(unittest.TestCase):
         ])
 
 
+    def test_untracked_change_matrices(self):
+        array = [
+            [2, 3, 1, -1],
+            [3, 2, 1, 4],
+            [4, 4, -2, -2],
+        ]
+
+        matrix_manipulator = MatrixManipulator(
+            Matrix(array), ChangeMatrix.INVERSE_ROW
+        )
+
+        matrix_manipulator.reduce_rows_by_pivot(0, 0)
+        self.assertEqual(matrix_manipulator._array(), [
+            [2, 3, 1, -1],
+            [1, -1, 0, 5],
+            [0, -2, -4, 0]
+        ])
+        self.assertEqual(matrix_manipulator.inverse_row_change_matrix.array, [
+            [1, 0, 0],
+            [-1, 1, 0],
+            [-2, 0, 1]
+        ])
+        with self.assertRaises(RuntimeError):
+            matrix_manipulator.row_change_matrix
+        with self.assertRaises(RuntimeError):
+            matrix_manipulator.column_change_matrix
+
 if __name__ == '__main__':
     unittest.main()
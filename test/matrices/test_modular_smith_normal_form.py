@@ -0,0 +1,95 @@
+import unittest
+from module_theory._internal.modular_smith_normal_form import (
+    invariant_factors_modulo, maximal_minor_determinant
+)
+from module_theory._internal.matrix_manipulator import ChangeMatrix
+from module_theory._internal.smith_normal_form import (
+    SmithNormalFormCalculator, SmithNormalFormStrategy
+)
+
+
+class TestModularSmithNormalForm(unittest.TestCase):
+    def test_maximal_minor_determinant(self):
+        array = [
+            [3, 2, 3],
+            [0, 2, 0],
+            [2, 2, 2]
+        ]
+        self.assertEqual(maximal_minor_determinant(array), (2, 6))
+
+    def test_maximal_minor_determinant_zero(self):
+        self.assertEqual(maximal_minor_determinant([[0, 0], [0, 0]]), (0, 1))
+
+    def test_invariant_factors_modulo(self):
+        array = [
+            [2, 4, 4],
+            [-6, 6, 12],
+            [10, -4, -16]
+        ]
+        rank, determinant = maximal_minor_determinant(array)
+        self.assertEqual(
+            invariant_factors_modulo(array, rank, determinant), (2, 6, 12)
+        )
+
+    def test_invariant_factors_vanishing_modulo(self):
+        self.assertEqual(invariant_factors_modulo([[4]], 1, 4), (4,))
+        self.assertEqual(invariant_factors_modulo([[4, 0], [0, 4]], 2, 16),
+                         (4, 4))
+
+    def test_invariant_factors_modulo_large_primes(self):
+        # No prime factor of the modulus is found by trial division
+        first, second = 998244353, 1000000007
+        self.assertEqual(
+            invariant_factors_modulo([[first, 0], [0, second]], 2,
+                                     first * second),
+            (1, first * second)
+        )
+        self.assertEqual(
+            invariant_factors_modulo([[first, 0], [0, first * second]], 2,
+                                     first * first * second),
+            (first, first * second)
+        )
+
+    def test_strategy_matches_elimination(self):
+        array = [
+            [2, 0, 0, 0, 0, 0, 2],
+            [-1, 0, -1, 0, 1, 0, 0],
+            [2, 1, 0, -1, 3, 0, 0],
+            [1, -1, 0, -2, 3, -1, -2],
+            [-2, 0, 3, 2, 0, -1, -2]
+        ]
+        calculator = SmithNormalFormCalculator(
+            array,
+            change_matrices=ChangeMatrix.NONE,
+            strategy=SmithNormalFormStrategy.MODULAR
+        )
+        self.assertEqual(
+            calculator.invariants(),
+            SmithNormalFormCalculator(array).smith_normal_form().invariants()
+        )
+
+    def test_strategy_matches_elimination_large(self):
+        array = [
+            [(3 * row * row + 5 * column + row * column) % 11 - 5
+             for column in range(21)]
+            for row in range(20)
+        ]
+        calculator = SmithNormalFormCalculator(
+            array,
+            change_matrices=ChangeMatrix.NONE,
+            strategy=SmithNormalFormStrategy.MODULAR
+        )
+        self.assertEqual(
+            calculator.invariants(),
+            SmithNormalFormCalculator(array).smith_normal_form().invariants()
+        )
+
+    def test_strategy_requires_no_change_matrices(self):
+        with self.assertRaises(ValueError):
+            SmithNormalFormCalculator(
+                [[1]], strategy=SmithNormalFormStrategy.MODULAR
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
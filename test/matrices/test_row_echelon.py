@@ -1,5 +1,6 @@
 import unittest
 from module_theory._internal.matrix import Matrix
+from module_theory._internal.matrix_manipulator import ChangeMatrix
 from module_theory._internal.row_echelon import RowEchelonCalculator
 from module_theory.homomorphism import Homomorphism
 from module_theory.zmodule import ZModule
@@ -231,3 +232,21 @@ class TestRowEchelon(unittest.TestCase):
             [3, 1, 1],
         ])
         self.assertEqual(row_echelon_calculator.row_rank(), 2)
+
+    def test_row_echelon_without_change_matrices(self):
+        array = [
+            [3, 2, 1, 4],
+            [2, 3, 1, -1],
+            [4, 4, -2, -2],
+        ]
+
+        expected = RowEchelonCalculator(Matrix(array))
+        result = RowEchelonCalculator(Matrix(array), ChangeMatrix.NONE)
+
+        self.assertEqual(result.row_echelon().array,
+                         expected.row_echelon().array)
+        self.assertEqual(result.row_rank(), expected.row_rank())
+        with self.assertRaises(RuntimeError):
+            result.change_matrix()
+        with self.assertRaises(RuntimeError):
+            result.inverse_change_matrix()
@@ -1,6 +1,7 @@
 import unittest
 from module_theory._internal.matrix import Matrix
 from module_theory._internal.smith_normal_form import SmithNormalFormCalculator
+from module_theory._internal.matrix_manipulator import ChangeMatrix
 # from module_theory.homomorphism import Homomorphism
 
 
@@ -170,6 +171,71 @@ class TestSmithNormalForm(unittest.TestCase):
         self.assertEqual(smith_normal_form.rank, 2)
         self.assertEqual(smith_normal_form.unit_entry_count, 1)
 
+    def test_smith_normal_form_nondivisible_entry(self):
+        array = [
+            [0, 0, 2, 2],
+            [5, -3, -8, 0]
+        ]
+        calculator = SmithNormalFormCalculator(array)
+        smith_normal_form = calculator.smith_normal_form()
+        self.assertEqual(smith_normal_form.matrix, (
+            (1, 0, 0, 0),
+            (0, 2, 0, 0)
+        ))
+
+    def test_invariants_only(self):
+        array = [
+            [3, 2, 3],
+            [0, 2, 0],
+            [2, 2, 2]
+        ]
+        calculator = SmithNormalFormCalculator(
+            array, change_matrices=ChangeMatrix.NONE
+        )
+        invariants = calculator.invariants()
+        self.assertEqual(invariants.diagonal, (1, 2))
+        self.assertEqual(invariants.rank, 2)
+        self.assertEqual(invariants.unit_entry_count, 1)
+        self.assertEqual(
+            invariants,
+            SmithNormalFormCalculator(array).smith_normal_form().invariants()
+        )
+        with self.assertRaises(RuntimeError):
+            calculator.smith_normal_form()
+        with self.assertRaises(RuntimeError):
+            calculator.change_matrix(ChangeMatrix.ROW)
+
+    def test_single_change_matrix(self):
+        array = [
+            [3, 2, 3],
+            [0, 2, 0],
+            [2, 2, 2]
+        ]
+        calculator = SmithNormalFormCalculator(
+            array, change_matrices=ChangeMatrix.INVERSE_ROW
+        )
+        self.assertEqual(calculator.change_matrix(ChangeMatrix.INVERSE_ROW), (
+            (1, 0, 0),
+            (0, 0, 1),
+            (2, 1, -3)
+        ))
+
+    def test_change_matrix_entries(self):
+        array = [
+            [3, 2, 3],
+            [0, 2, 0],
+            [2, 2, 2]
+        ]
+        calculator = SmithNormalFormCalculator(
+            array, change_matrices=ChangeMatrix.INVERSE_ROW
+        )
+        self.assertEqual(
+            list(calculator.change_matrix_entries(ChangeMatrix.INVERSE_ROW)),
+            [(0, 0, 1), (1, 2, 1), (2, 0, 2), (2, 1, 1), (2, 2, -3)]
+        )
+        with self.assertRaises(RuntimeError):
+            calculator.change_matrix_entries(ChangeMatrix.ROW)
+
 
 if __name__ == '__main__':
     unittest.main()
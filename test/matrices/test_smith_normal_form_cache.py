@@ -0,0 +1,185 @@
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory._internal.smith_normal_form import SmithNormalFormCalculator
+from module_theory._internal.smith_normal_form_cache import (
+    SmithNormalFormCache, active_cache, cached_smith_normal_form, set_cache
+)
+from module_theory._internal.kernel_and_image import KernelAndImageCalculator
+from module_theory.homomorphism import Homomorphism
+
+
+def store_and_load(directory: str, index: int) -> tuple[tuple[int, ...], ...]:
+    cache = SmithNormalFormCache(directory)
+    matrix = ((index % 3, 2 ** 80), (-1, 0))
+    for _ in range(20):
+        cache.store(cache.key("test", ((1,),)), [matrix])
+        loaded = cache.load(cache.key("test", ((1,),)))
+        assert loaded is not None
+    return loaded[0]
+
+
+class TestSmithNormalFormCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = SmithNormalFormCache(self.directory.name)
+        self.previous_cache = active_cache()
+
+    def tearDown(self):
+        set_cache(self.previous_cache)
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        matrices = [
+            ((1, -2, 3), (0, 2 ** 100, -(2 ** 70))),
+            ((),),
+            ()
+        ]
+        key = self.cache.key("test", ((1, 2), (3, 4)))
+
+        self.assertIsNone(self.cache.load(key))
+        self.cache.store(key, matrices)
+
+        self.assertEqual(self.cache.load(key), matrices)
+
+    def test_sparse_round_trip(self):
+        identity = tuple(
+            tuple(int(row == column) for column in range(200))
+            for row in range(200)
+        )
+        dense = tuple(
+            tuple(row + column + 1 for column in range(200))
+            for row in range(200)
+        )
+        key = self.cache.key("test", ((1,),))
+        self.cache.store(key, [identity, ((0, 0), (0, -5))])
+        sparse_size = self.cache.size()
+        self.cache.store(key, [dense])
+
+        self.assertEqual(self.cache.load(key), [dense])
+        self.cache.store(key, [identity, ((0, 0), (0, -5))])
+        self.assertEqual(self.cache.load(key),
+                         [identity, ((0, 0), (0, -5))])
+        self.assertLess(sparse_size, 200 * 200 // 8)
+
+    def test_store_scans_only_past_limit(self):
+        keys = [self.cache.key("test", ((index,),)) for index in range(3)]
+        self.cache.store(keys[0], [((1, 2),)])
+        scans: list[None] = []
+        entries = self.cache._entries
+
+        def counting_entries():
+            scans.append(None)
+            return entries()
+
+        self.cache._entries = counting_entries  # type: ignore[method-assign]
+        self.cache.store(keys[1], [((1, 2),)])
+        self.assertEqual(scans, [])
+
+        self.cache.max_bytes = self.cache.size() + 1
+        scans.clear()
+        self.cache.store(keys[2], [((1, 2),)])
+        self.assertEqual(len(scans), 1)
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+
+    def test_key_depends_on_kind_and_content_only(self):
+        array = [
+            [0, 2, 0],
+            [1, 0, 0]
+        ]
+
+        self.assertEqual(self.cache.key("a", array),
+                         self.cache.key("a", SparseMatrix(array)))
+        self.assertNotEqual(self.cache.key("a", array),
+                            self.cache.key("b", array))
+        self.assertNotEqual(self.cache.key("a", array),
+                            self.cache.key("a", [[0, 2], [1, 0]]))
+
+    def test_corrupt_entry_is_a_miss(self):
+        key = self.cache.key("test", ((1,),))
+        self.cache.store(key, [((1,),)])
+        path = os.path.join(self.directory.name, key + ".snf")
+        with open(path, "wb") as file:
+            file.write(b"SNF1 garbage")
+
+        self.assertIsNone(self.cache.load(key))
+        self.assertFalse(os.path.exists(path))
+
+    def test_least_recently_used_eviction(self):
+        matrix = tuple(
+            tuple(row * 1000 + column for column in range(50))
+            for row in range(50)
+        )
+        keys = [self.cache.key("test", ((index,),)) for index in range(3)]
+        self.cache.store(keys[0], [matrix])
+        entry_size = self.cache.size()
+        self.cache.max_bytes = 2 * entry_size
+        self.cache.store(keys[1], [matrix])
+        # Make the first entry the most recently used one
+        time.sleep(0.01)
+        self.cache.load(keys[0])
+
+        self.cache.store(keys[2], [matrix])
+
+        self.assertIsNotNone(self.cache.load(keys[0]))
+        self.assertIsNone(self.cache.load(keys[1]))
+        self.assertIsNotNone(self.cache.load(keys[2]))
+        self.assertLessEqual(self.cache.size(), 2 * entry_size)
+
+    def test_concurrent_access(self):
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                store_and_load, [self.directory.name] * 8, range(8)
+            ))
+
+        for result in results:
+            self.assertEqual(result[1], (-1, 0))
+        self.assertFalse(any(
+            name.endswith(".tmp") for name in os.listdir(self.directory.name)
+        ))
+
+    def test_cached_smith_normal_form_is_not_recalculated(self):
+        set_cache(self.cache)
+        array = [
+            [3, 2, 3],
+            [0, 2, 0],
+            [2, 2, 2]
+        ]
+        calls: list[None] = []
+
+        def calculate():
+            calls.append(None)
+            return SmithNormalFormCalculator(array).smith_normal_form()
+
+        first = cached_smith_normal_form("test", array, calculate)
+        second = cached_smith_normal_form("test", array, calculate)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first, calculate())
+
+    def test_consumers_use_cache(self):
+        set_cache(self.cache)
+        array = [
+            [2, 4, 4],
+            [-6, 6, 12],
+            [10, -4, -16]
+        ]
+
+        expected_kernel = KernelAndImageCalculator(array).kernel
+        Homomorphism(array).smith_normal_form_invariants()
+        Homomorphism(array).preimage(Homomorphism(array).codomain.element(
+            [2, -6, 10]
+        ))
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+
+        self.assertEqual(KernelAndImageCalculator(array).kernel,
+                         expected_kernel)
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
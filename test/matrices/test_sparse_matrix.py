@@ -0,0 +1,140 @@
+import unittest
+from module_theory._internal.matrix import Matrix
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory._internal.matrix_manipulator import MatrixManipulator
+from module_theory._internal.row_echelon import RowEchelonCalculator
+from module_theory._internal.smith_normal_form import SmithNormalFormCalculator
+
+
+class TestSparseMatrix(unittest.TestCase):
+    def test_from_entries(self):
+        matrix = SparseMatrix.from_entries(2, 3, [(0, 1, 5), (1, 2, -1),
+                                                  (0, 1, -5)])
+
+        self.assertEqual(matrix.array, [
+            [0, 0, 0],
+            [0, 0, -1]
+        ])
+        self.assertEqual(matrix.nonzero_count(), 1)
+
+    def test_from_entries_out_of_bounds(self):
+        with self.assertRaises(ValueError):
+            SparseMatrix.from_entries(2, 2, [(2, 0, 1)])
+
+    def test_elementary_operations(self):
+        array = [
+            [1, 0, 3],
+            [0, 5, 0],
+            [7, 0, 9]
+        ]
+        dense = Matrix(array)
+        sparse = SparseMatrix(array)
+
+        for matrix in (dense, sparse):
+            matrix.exchange_rows(0, 1)
+            matrix.exchange_columns(0, 2)
+            matrix.multiply_row_by_negative_one(2)
+            matrix.multiply_column_by_negative_one(1)
+            matrix.add_multiple_of_row(0, 2, 3)
+            matrix.add_multiple_of_column(1, 0, -2)
+            matrix.add_multiple_of_row(1, 1, -1)
+
+        self.assertEqual(sparse.array, dense.array)
+        self.assertEqual(sparse.nonzero_rows_in_column(2),
+                         dense.nonzero_rows_in_column(2))
+        self.assertEqual(sparse.nonzero_columns_in_row(0),
+                         dense.nonzero_columns_in_row(0))
+        self.assertEqual(list(sparse.nonzero_entries(1, 1)),
+                         list(dense.nonzero_entries(1, 1)))
+
+    def test_cancellation_removes_entries(self):
+        matrix = SparseMatrix([
+            [1, 2],
+            [1, 2]
+        ])
+
+        matrix.add_multiple_of_row(1, 0, -1)
+
+        self.assertEqual(matrix.nonzero_count(), 2)
+        self.assertEqual(matrix.nonzero_rows_in_column(1), [0])
+        self.assertTrue(matrix.is_submatrix_zero(1, 0))
+
+    def test_transpose(self):
+        matrix = SparseMatrix([
+            [1, 0, 3],
+            [0, 5, 0]
+        ])
+
+        matrix.transpose()
+
+        self.assertEqual(matrix.immutable(), (
+            (1, 0),
+            (0, 5),
+            (3, 0)
+        ))
+        self.assertEqual(matrix.nonzero_rows_in_column(0), [0, 2])
+
+    def test_multiply(self):
+        left = SparseMatrix([
+            [1, 2],
+            [0, 1]
+        ])
+        right = SparseMatrix([
+            [1, 0, -2],
+            [0, 3, 1]
+        ])
+
+        self.assertEqual(left.multiply(right).array, [
+            [1, 6, 0],
+            [0, 3, 1]
+        ])
+
+    def test_manipulator_change_matrices_are_sparse(self):
+        manipulator = MatrixManipulator(SparseMatrix([
+            [2, 3, 1, -1],
+            [3, 2, 1, 4],
+            [4, 4, -2, -2],
+        ]))
+
+        manipulator.reduce_rows_by_pivot(0, 0)
+
+        self.assertIsInstance(manipulator.row_change_matrix, SparseMatrix)
+        self.assertEqual(manipulator.inverse_row_change_matrix.array, [
+            [1, 0, 0],
+            [-1, 1, 0],
+            [-2, 0, 1]
+        ])
+
+    def test_row_echelon_matches_dense(self):
+        array = [
+            [3, 2, 1, 4],
+            [2, 3, 1, -1],
+            [4, 4, -2, -2],
+        ]
+
+        expected = RowEchelonCalculator(Matrix(array))
+        result = RowEchelonCalculator(SparseMatrix(array))
+
+        self.assertEqual(result.row_echelon().array,
+                         expected.row_echelon().array)
+        self.assertEqual(result.change_matrix().array,
+                         expected.change_matrix().array)
+
+    def test_smith_normal_form_matches_dense(self):
+        array = [
+            [3, 2, 3],
+            [0, 2, 0],
+            [2, 2, 2]
+        ]
+        matrix = SparseMatrix(array)
+
+        expected = SmithNormalFormCalculator(array).smith_normal_form()
+        result = SmithNormalFormCalculator(matrix).smith_normal_form()
+
+        self.assertEqual(result, expected)
+        # The calculator works on a copy
+        self.assertEqual(matrix.array, array)
+
+
+if __name__ == '__main__':
+    unittest.main()
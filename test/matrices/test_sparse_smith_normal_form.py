@@ -0,0 +1,77 @@
+import unittest
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory._internal.smith_normal_form import SmithNormalFormCalculator
+from module_theory._internal.sparse_smith_normal_form import (
+    SparseSmithNormalFormCalculator
+)
+from module_theory.homomorphism import Homomorphism
+
+
+class TestSparseSmithNormalForm(unittest.TestCase):
+    def test_unit_pivots(self):
+        # Coboundary of a triangle: vertices to edges
+        array = [
+            [-1, 1, 0],
+            [0, -1, 1],
+            [-1, 0, 1]
+        ]
+        calculator = SparseSmithNormalFormCalculator(array)
+        smith_normal_form = calculator.smith_normal_form()
+        self.assertEqual(smith_normal_form.diagonal, (1, 1))
+        self.assertEqual(smith_normal_form.rank, 2)
+        self.assertEqual(smith_normal_form.unit_entry_count, 2)
+
+    def test_matches_dense(self):
+        array = [
+            [2, 0, 0, 0, 0, 0, 2],
+            [-1, 0, -1, 0, 1, 0, 0],
+            [2, 1, 0, -1, 3, 0, 0],
+            [1, -1, 0, -2, 3, -1, -2],
+            [-2, 0, 3, 2, 0, -1, -2]
+        ]
+        expected = SmithNormalFormCalculator(array).smith_normal_form()
+        result = SparseSmithNormalFormCalculator(
+            SparseMatrix(array)
+        ).smith_normal_form()
+        self.assertEqual(result.diagonal, expected.diagonal)
+        self.assertEqual(result.diagonal, (1, 1, 1, 1, 2))
+        self.assertEqual(result.unit_entry_count, 4)
+
+    def test_change_matrices(self):
+        array = [
+            [0, 0, 2, 2],
+            [1, 0, 0, -1],
+            [5, -3, -8, 0]
+        ]
+        smith_normal_form = SparseSmithNormalFormCalculator(
+            array
+        ).smith_normal_form()
+
+        homomorphism = Homomorphism(array)
+        inverse_row_change = Homomorphism(
+            smith_normal_form.inverse_row_change_matrix
+        )
+        row_change = Homomorphism(smith_normal_form.row_change_matrix)
+        column_change = Homomorphism(smith_normal_form.column_change_matrix)
+
+        self.assertEqual(smith_normal_form.diagonal, (1, 1, 2))
+        self.assertEqual(
+            inverse_row_change.compose(homomorphism)
+                              .compose(column_change).matrix,
+            smith_normal_form.matrix
+        )
+        self.assertEqual(
+            inverse_row_change.compose(row_change).matrix,
+            Homomorphism.identity(row_change.domain).matrix
+        )
+
+    def test_zero(self):
+        smith_normal_form = SparseSmithNormalFormCalculator(
+            SparseMatrix.from_entries(3, 2, ())
+        ).smith_normal_form()
+        self.assertEqual(smith_normal_form.rank, 0)
+        self.assertEqual(smith_normal_form.diagonal, ())
+
+
+if __name__ == '__main__':
+    unittest.main()
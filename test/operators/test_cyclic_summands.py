@@ -1,7 +1,9 @@
 import unittest
 from module_theory.zmodule import ZModule
 from module_theory.cyclic_zmodule import FreeCyclicZModule, TorsionCyclicZModule
-from module_theory.operators.cyclic_summands import cyclic_summands
+from module_theory.operators.cyclic_summands import (
+    CyclicBlock, cyclic_blocks, cyclic_summands
+)
 
 
 class TestCyclicSummands(unittest.TestCase):
@@ -26,6 +28,16 @@ class TestCyclicSummands(unittest.TestCase):
         self.assertEqual(summands[4].torsion, 4)
         self.assertEqual(summands[5].torsion, 100)
 
+    def test_cyclic_blocks(self):
+        module = ZModule(3, [2, 2, 4, 2])
+        self.assertEqual(cyclic_blocks(module), [
+            CyclicBlock(0, 3),
+            CyclicBlock(2, 2),
+            CyclicBlock(4, 1),
+            CyclicBlock(2, 1)
+        ])
+        self.assertEqual(cyclic_blocks(ZModule.zero()), [])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from module_theory.zmodule import ZModule
 from module_theory.homomorphism import Homomorphism
 from module_theory.operators.direct_sum import direct_sum
+from module_theory._internal.sparse_matrix import SparseMatrix
 
 
 class TestDirectSum(unittest.TestCase):
@@ -77,6 +78,58 @@ class TestDirectSum(unittest.TestCase):
                                                 (0, 1, 0),
                                                 (0, 0, 1)))
 
+    def test_embeddings_and_projections_match_their_matrices(self):
+        A = ZModule(0, [2])
+        B = ZModule(2, [])
+        C = ZModule(1, [2, 3])
+        sum_module, embeddings = direct_sum(A, ZModule.zero(), B, C)
+        element = sum_module.element([4, -1, 7, 1, 1, 2])
+        homomorphism = Homomorphism([
+            [1, 2, 0, 1, 0, 3],
+            [0, -1, 5, 0, 1, 0]
+        ], sum_module)
+
+        for embedding in embeddings:
+            dense_embedding = Homomorphism(
+                embedding.matrix, embedding.domain, embedding.codomain
+            )
+            projection = embedding.projection()
+            dense_projection = Homomorphism(
+                projection.matrix, projection.domain, projection.codomain
+            )
+            summand_element = dense_projection.apply(element)
+
+            self.assertEqual(projection.apply(element).coordinates,
+                             summand_element.coordinates)
+            self.assertEqual(
+                embedding.apply(summand_element).coordinates,
+                dense_embedding.apply(summand_element).coordinates
+            )
+            self.assertEqual(embedding.compose(projection).matrix,
+                             dense_embedding.compose(dense_projection).matrix)
+            self.assertEqual(
+                projection.compose(Homomorphism.identity(sum_module)).matrix,
+                dense_projection.matrix
+            )
+            self.assertEqual(homomorphism.compose(embedding).matrix,
+                             homomorphism.compose(dense_embedding).matrix)
+            self.assertEqual(embedding.is_zero(), dense_embedding.is_zero())
+
+    def test_embeddings_are_not_materialized(self):
+        sum_module, embeddings = direct_sum(*[ZModule.free(1)] * 500)
+        homomorphism = Homomorphism(SparseMatrix.from_entries(
+            1, 500, [(0, index, index) for index in range(500)]
+        ), sum_module)
+
+        images = [
+            homomorphism.compose(embedding).matrix for embedding in embeddings
+        ]
+
+        self.assertEqual(images[7], ((7,),))
+        self.assertTrue(all(
+            embedding._matrix is None for embedding in embeddings
+        ))
+
 
 if __name__ == '__main__':
     unittest.main()
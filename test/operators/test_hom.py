@@ -2,6 +2,7 @@ import unittest
 from module_theory.zmodule import ZModule
 from module_theory.cyclic_zmodule import FreeCyclicZModule, TorsionCyclicZModule
 from module_theory.homomorphism import Homomorphism
+from module_theory._internal.sparse_matrix import SparseMatrix
 from module_theory.cochain_complex import CochainComplex
 from module_theory.operators.direct_sum import direct_sum
 from module_theory.operators.hom import Hom, left_hom, right_hom
@@ -50,6 +51,21 @@ class TestHom(unittest.TestCase):
         self.assertEqual(homAB.rank, 0)
         self.assertEqual(homAB.torsion_numbers, (5,))
 
+    def test_hom_of_blocks(self):
+        A = ZModule(2, [4, 4, 6])
+        B = ZModule(1, [6, 8])
+        homAB = Hom(A, B)
+        self.assertEqual(homAB.rank, 2)
+        self.assertEqual(
+            homAB.torsion_numbers,
+            (6, 6, 2, 2, 6, 8, 8, 4, 4, 2)
+        )
+        self.assertEqual(
+            [(summand.row, summand.column, summand.scale)
+             for summand in homAB.summands()[2:7]],
+            [(1, 0, 1), (1, 1, 1), (1, 2, 3), (1, 3, 3), (1, 4, 1)]
+        )
+
     def test_conversions(self):
         A = ZModule(1, [2, 4])
         B = ZModule(2, [5, 10])
@@ -59,13 +75,53 @@ class TestHom(unittest.TestCase):
         matrix = ((1, 0, 0),
                   (2, 0, 0),
                   (3, 0, 0),
-                  (4, 1, 1))
+                  (4, 5, 5))
         homomorphism = Homomorphism(matrix, A, B)
         hom_element = homAB.element_from_homomorphism(homomorphism)
         self.assertEqual(hom_element.coordinates, (1, 2, 3, 4, 1, 1))
         restored_homomorphism = homAB.homomorphism_from_element(hom_element)
         self.assertEqual(restored_homomorphism.matrix, matrix)
 
+    def test_conversions_scale_torsion_summands(self):
+        A = ZModule(0, [4])
+        B = ZModule(1, [6])
+        homAB = Hom(A, B)
+        self.assertEqual(homAB.torsion_numbers, (2,))
+        # The generator of Hom(Z/4, Z/6) sends 1 to 3
+        generator = homAB.canonical_generators()[0]
+        self.assertEqual(homAB.homomorphism_from_element(generator).matrix,
+                         ((0,), (3,)))
+        self.assertEqual(homAB.element_from_homomorphism(
+            Homomorphism(SparseMatrix([[0], [3]]), A, B)
+        ).coordinates, (1,))
+        with self.assertRaises(ValueError):
+            homAB.element_from_homomorphism(Homomorphism([[0], [2]], A, B))
+
+    def test_batched_conversions(self):
+        A = ZModule(1, [2, 4])
+        B = ZModule(2, [5, 10])
+        homAB = Hom(A, B)
+        elements = [
+            homAB.element([1, 2, 3, 4, 1, 1]),
+            homAB.element([0, -1, 0, 2, 0, 1]),
+            homAB.zero_element()
+        ]
+
+        homomorphisms = homAB.homomorphisms_from_elements(elements)
+
+        self.assertEqual(
+            [homomorphism.matrix for homomorphism in homomorphisms],
+            [homAB.homomorphism_from_element(element).matrix
+             for element in elements]
+        )
+        self.assertEqual(homomorphisms[1].matrix,
+                         ((0, 0, 0), (-1, 0, 0), (0, 0, 0), (2, 0, 5)))
+        self.assertEqual(
+            [element.coordinates for element
+             in homAB.elements_from_homomorphisms(homomorphisms)],
+            [element.coordinates for element in elements]
+        )
+
     def test_left_hom_Z_to_Z(self):
         Z = ZModule.free(1)
         cochain_complex = CochainComplex([Z, Z], [Homomorphism([[2]], Z, Z)])
@@ -151,7 +207,9 @@ class TestHom(unittest.TestCase):
         self.assertEqual(hom_cochain_complex.modules[1].rank, 0)
         self.assertEqual(hom_cochain_complex.modules[1].torsion_numbers, (10,))
         self.assertEqual(len(hom_cochain_complex.homomorphisms), 2)
-        self.assertEqual(hom_cochain_complex.homomorphisms[0].matrix, ((2,),))
+        # The generator of Hom(Z/5, Z/10) sends 1 to 2, so its pullback
+        # sends 1 to 4
+        self.assertEqual(hom_cochain_complex.homomorphisms[0].matrix, ((4,),))
         self.assertEqual(hom_cochain_complex.homomorphisms[1].matrix, ((0,),))
 
     def test_right_hom_splitting(self):
@@ -196,6 +254,67 @@ class TestHom(unittest.TestCase):
         )
         self.assertTrue(hom_cochain_complex.homomorphisms[2].is_zero())
 
+    def test_induced_homomorphisms_match_generator_images(self):
+        A = ZModule(1, [4, 6])
+        B = ZModule(1, [6, 12])
+        D = ZModule(1, [2, 9])
+        differential = Homomorphism([
+            [1, 0, 0],
+            [5, 3, 1],
+            [7, 9, 4]
+        ], A, B)
+        cochain_complex = CochainComplex([A, B], [differential])
+
+        left = left_hom(cochain_complex, D)
+        right = right_hom(cochain_complex, D)
+
+        for this_hom, next_hom, induced, mapping in (
+            (left.modules[0], left.modules[1], left.homomorphisms[0],
+             lambda f: differential.compose(f)),
+            (right.modules[0], right.modules[1], right.homomorphisms[0],
+             lambda f: f.compose(differential)),
+        ):
+            assert isinstance(this_hom, Hom) and isinstance(next_hom, Hom)
+            for generator in this_hom.canonical_generators():
+                image = next_hom.element_from_homomorphism(
+                    mapping(this_hom.homomorphism_from_element(generator))
+                )
+                self.assertEqual(induced.apply(generator).coordinates,
+                                 image.coordinates)
+
+    def test_induced_homomorphisms_of_sparse_differential(self):
+        A = ZModule(1, [4, 6])
+        B = ZModule(1, [6, 12])
+        D = ZModule(1, [2, 9])
+        array = [
+            [1, 0, 0],
+            [5, 3, 1],
+            [7, 9, 4]
+        ]
+        dense = CochainComplex([A, B], [Homomorphism(array, A, B)])
+        sparse = CochainComplex(
+            [A, B], [Homomorphism(SparseMatrix(array), A, B)]
+        )
+
+        for hom in (left_hom, right_hom):
+            self.assertEqual(
+                hom(sparse, D).homomorphisms[0].matrix,
+                hom(dense, D).homomorphisms[0].matrix
+            )
+
+    def test_induced_homomorphism_from_zero_hom(self):
+        A = ZModule.free(2)
+        B = TorsionCyclicZModule(3)
+        cochain_complex = CochainComplex(
+            [A, B], [Homomorphism([[1, 2]], A, B)]
+        )
+
+        hom_cochain_complex = right_hom(cochain_complex, ZModule.free(1))
+
+        self.assertTrue(hom_cochain_complex.modules[0].is_zero())
+        self.assertEqual(hom_cochain_complex.homomorphisms[0].matrix,
+                         ((0,), (0,)))
+
 
 if __name__ == '__main__':
     unittest.main()
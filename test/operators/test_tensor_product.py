@@ -2,7 +2,11 @@ import unittest
 from module_theory.zmodule import ZModule
 from module_theory.homomorphism import Homomorphism
 from module_theory.cyclic_zmodule import FreeCyclicZModule, TorsionCyclicZModule
-from module_theory.operators.tensor_product import TensorProduct
+from module_theory.cochain_complex import CochainComplex
+from module_theory._internal.sparse_matrix import SparseMatrix
+from module_theory.operators.tensor_product import (
+    TensorProduct, left_tensor_product, tensor_product
+)
 
 
 class TestTensorProduct(unittest.TestCase):
@@ -130,6 +134,65 @@ class TestTensorProduct(unittest.TestCase):
             "6 + 8ℤ"
         )
 
+    def test_pure_tensors_with_interleaved_summands(self):
+        A = ZModule(2, [12, 4])
+        B = ZModule(1, [12])
+        C = TensorProduct(A, B)
+
+        self.assertEqual(C.rank, 2)
+        self.assertEqual(C.torsion_numbers, (12, 12, 12, 12, 4, 4))
+        self.assertEqual(
+            C.pure_tensor(A.element([1, 2, 5, 3]),
+                          B.element([7, 11])).coordinates,
+            (7, 14, 11 % 12, 22 % 12, 35 % 12, 55 % 12, 21 % 4, 33 % 4)
+        )
+
+    def test_large_tensor_product(self):
+        tensor_product = TensorProduct(
+            ZModule.free(100), ZModule.free(100), ZModule(0, [2])
+        )
+        self.assertEqual(tensor_product.rank, 0)
+        self.assertEqual(tensor_product.torsion_numbers, (2,) * 10000)
+
+    def test_trivial_combinations_are_pruned(self):
+        tensor_product = TensorProduct(
+            ZModule.free(1000),
+            ZModule.free(1000),
+            ZModule(0, [2]),
+            ZModule(0, [3]),
+            ZModule.free(1000),
+        )
+        self.assertTrue(tensor_product.is_zero())
+        self.assertEqual(
+            tensor_product.pure_tensor(*(
+                module.element([1] * module.dimensions())
+                for module in tensor_product.multipliers
+            )).coordinates,
+            tensor_product.zero_element().coordinates
+        )
+
+    def test_pure_tensors_of_dense_elements(self):
+        A = ZModule(2, [6])
+        B = ZModule(0, [2, 3, 4])
+        C = ZModule(1, [10])
+        D = TensorProduct(A, B, C, A)
+
+        self.assertEqual(D.rank, 0)
+        self.assertEqual(D.torsion_numbers.count(2), 32)
+        self.assertEqual(D.torsion_numbers.count(3), 9)
+        self.assertEqual(D.torsion_numbers.count(4), 4)
+        pure_tensor = D.pure_tensor(
+            A.element([1, 2, 5]),
+            B.element([1, 2, 3]),
+            C.element([3, 7]),
+            A.element([-1, 1, 1])
+        )
+        self.assertEqual(pure_tensor.coordinates, (
+            1, 1, 1, 1, 1, 1, 0, 0, 0, 3, 1, 1, 1, 1, 1,
+            0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 2, 0, 0, 0, 0,
+            1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1
+        ))
+
     def test_homomorphism_easy(self):
         A = ZModule(1, [7])
         B = ZModule(1, [8])
@@ -194,6 +257,58 @@ class TestTensorProduct(unittest.TestCase):
             (56, 56, 56)
         )
 
+    def test_homomorphism_codomain_is_shared(self):
+        A = ZModule(1, [4])
+        B = ZModule(2, [6])
+        f = Homomorphism([[2], [1]], FreeCyclicZModule(), A)
+        g = Homomorphism(SparseMatrix([[0, 1, 0], [1, 0, 0], [0, 0, 5]]), B, B)
+        domain = TensorProduct(FreeCyclicZModule(), B)
+
+        first = domain.homomorphism(f, g)
+        second = domain.homomorphism(f, g)
+
+        self.assertIs(first.codomain, second.codomain)
+        self.assertEqual(first.codomain.torsion_numbers, (6, 4, 4, 2))
+        self.assertEqual(first.matrix, (
+            (0, 2, 0),
+            (2, 0, 0),
+            (0, 0, 4),
+            (0, 1, 0),
+            (1, 0, 0),
+            (0, 0, 1)
+        ))
+
+    def test_shared_product_keeps_its_multipliers(self):
+        B = ZModule(0, [4])
+        plain = tensor_product(ZModule.free(1), B)
+        cyclic = FreeCyclicZModule()
+        self.assertEqual(cyclic, ZModule.free(1))
+
+        product = tensor_product(cyclic, B)
+
+        self.assertIsNot(product, plain)
+        self.assertIs(product.multipliers[0], cyclic)
+        self.assertIs(tensor_product(cyclic, B), product)
+
+    def test_left_tensor_product(self):
+        A = ZModule(1, [2])
+        B = ZModule(2, [])
+        cochain_complex = CochainComplex(
+            [A, B], [Homomorphism([[3, 0], [1, 0]], A, B)]
+        )
+
+        tensor_complex = left_tensor_product(cochain_complex, ZModule(1, [4]))
+
+        self.assertIs(tensor_complex.homomorphisms[0].codomain,
+                      tensor_complex.modules[1])
+        self.assertEqual(tensor_complex.modules[1].torsion_numbers, (4, 4))
+        self.assertEqual(tensor_complex.homomorphisms[0].matrix, (
+            (3, 0, 0, 0),
+            (1, 0, 0, 0),
+            (0, 0, 3, 0),
+            (0, 0, 1, 0)
+        ))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,9 @@ import unittest
 import textwrap
 from module_theory.zmodule import ZModule
 from module_theory.homomorphism import Homomorphism
-from module_theory.cochain_complex import CochainComplex
+from module_theory.cochain_complex import (
+    CochainComplex, StreamingCochainComplex
+)
 
 
 class TestCochainComplex(unittest.TestCase):
@@ -74,5 +76,72 @@ class TestCochainComplex(unittest.TestCase):
                          Homomorphism.zero(module, module).matrix)
 
 
+
+class TestStreamingCochainComplex(unittest.TestCase):
+    def test_from_complex(self):
+        A = ZModule(1, [])
+        B = ZModule(1, [2])
+        cochain_complex = CochainComplex(
+            [A, B], [Homomorphism.zero(A, B)]
+        )
+        stream = StreamingCochainComplex.from_complex(cochain_complex)
+        self.assertEqual(list(stream), list(cochain_complex.homomorphisms))
+        self.assertEqual(
+            [module.is_identical_to(expected) for module, expected
+             in zip(stream.modules(), cochain_complex.modules)],
+            [True, True]
+        )
+
+    def test_from_callback(self):
+        Z = ZModule.free(1)
+        stream = StreamingCochainComplex.from_callback(
+            lambda degree: Homomorphism([[degree + 1]], Z, Z)
+            if degree < 3 else None
+        )
+        self.assertEqual(
+            [homomorphism.matrix for homomorphism in stream],
+            [((1,),), ((2,),), ((3,),)]
+        )
+
+    def test_mismatch(self):
+        A = ZModule(1, [])
+        B = ZModule(1, [2])
+        stream = StreamingCochainComplex([
+            Homomorphism.zero(A, B), Homomorphism.zero(A, A)
+        ])
+        iterator = iter(stream)
+        next(iterator)
+        with self.assertRaises(ValueError):
+            next(iterator)
+
+    def test_padding(self):
+        Z = ZModule.free(1)
+        cochain_complex = CochainComplex(
+            [Z, Z], [Homomorphism([[3]], Z, Z)]
+        )
+        stream = StreamingCochainComplex.from_complex(cochain_complex)
+        expected = cochain_complex.left_pad(2)
+        homomorphisms = list(stream.left_pad(2).right_pad())
+        self.assertEqual(len(homomorphisms), 5)
+        for homomorphism, expected_homomorphism in zip(
+            homomorphisms, expected.homomorphisms
+        ):
+            self.assertTrue(homomorphism.domain.is_identical_to(
+                expected_homomorphism.domain
+            ))
+            self.assertEqual(homomorphism.matrix,
+                             expected_homomorphism.matrix)
+        self.assertTrue(homomorphisms[-1].domain.is_zero())
+        with self.assertRaises(ValueError):
+            stream.left_pad(0)
+
+    def test_padding_empty(self):
+        stream = StreamingCochainComplex([]).left_pad(2)
+        self.assertEqual(
+            [homomorphism.domain.is_zero() for homomorphism in stream],
+            [True, True]
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
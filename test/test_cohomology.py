@@ -4,8 +4,16 @@ from module_theory.cyclic_zmodule import (
     FreeCyclicZModule, TorsionCyclicZModule
 )
 from module_theory.homomorphism import Homomorphism
-from module_theory.cochain_complex import CochainComplex
-from module_theory.cohomology import cohomology
+import pickle
+import weakref
+from module_theory.cochain_complex import (
+    CochainComplex, StreamingCochainComplex
+)
+from module_theory import cohomology as cohomology_module
+from module_theory.cohomology import (
+    CohomologySession, cohomology, cohomology_stream
+)
+from module_theory._internal.sparse_matrix import SparseMatrix
 
 
 class TestCohomology(unittest.TestCase):
@@ -217,6 +225,362 @@ class TestCohomology(unittest.TestCase):
         self.assertTrue(H[1].is_zero())
         self.assertTrue(H[2].is_identical_to(TorsionCyclicZModule(4)))
 
+    def test_padded(self):
+        Z = FreeCyclicZModule()
+        cochain_complex = CochainComplex(
+            modules=[Z, Z],
+            homomorphisms=[Homomorphism([
+                [3]
+            ], Z, Z)]
+        ).left_pad().right_pad()
+        H = cohomology(cochain_complex)
+        self.assertEqual(len(H), 4)
+        self.assertTrue(H[0].is_zero())
+        self.assertTrue(H[1].is_zero())
+        self.assertTrue(H[2].is_identical_to(TorsionCyclicZModule(3)))
+        self.assertTrue(H[3].is_zero())
+
+    def test_sparse(self):
+        Zsquare = ZModule.free(2)
+        Zcube = ZModule.free(3)
+        cochain_complex = CochainComplex(
+            modules=[Zsquare, Zcube],
+            homomorphisms=[Homomorphism(SparseMatrix([
+                [2, 0],
+                [0, 0],
+                [0, 4]
+            ]), Zsquare, Zcube)]
+        )
+        H = cohomology(cochain_complex)
+        self.assertTrue(H[0].is_zero())
+        self.assertTrue(H[1].is_identical_to(ZModule(1, [2, 4])))
+
+    def test_representative_cocycles(self):
+        C0 = ZModule(1, [2])
+        C1 = ZModule(2, [2, 4])
+        C2 = ZModule(1, [4])
+        d1 = Homomorphism((
+            (2, 0),
+            (0, 0),
+            (0, 1),
+            (0, 0)
+        ), C0, C1)
+        d2 = Homomorphism((
+            (0, 1, 0, 0),
+            (0, 0, 0, 1)
+        ), C1, C2)
+        cochain_complex = CochainComplex(
+            modules=[C0, C1, C2],
+            homomorphisms=[d1, d2]
+        )
+        H = cohomology(cochain_complex)
+        representatives = H[1].representative_cocycles()
+        self.assertEqual(len(representatives), 1)
+        self.assertTrue(d2.apply(representatives[0]).is_zero())
+        # The representative is not a coboundary, but twice it is
+        self.assertIsNone(d1.preimage(representatives[0]))
+        self.assertIsNotNone(d1.preimage(2 * representatives[0]))
+
+    def test_representative_cocycles_free(self):
+        Zsquare = ZModule.free(2)
+        cochain_complex = CochainComplex(
+            modules=[Zsquare, Zsquare],
+            homomorphisms=[Homomorphism([
+                [-2, 2],
+                [0, 0],
+            ], Zsquare, Zsquare)]
+        )
+        H = cohomology(cochain_complex)
+        self.assertEqual(
+            [element.coordinates
+             for element in H[0].representative_cocycles()],
+            [(1, 1)]
+        )
+        self.assertEqual(len(H[1].representative_cocycles()), 2)
+
+    def test_representative_cocycles_sparse(self):
+        C0 = ZModule(1, [2])
+        C1 = ZModule(2, [2, 4])
+        C2 = ZModule(1, [4])
+        d1 = Homomorphism(SparseMatrix((
+            (2, 0),
+            (0, 0),
+            (0, 1),
+            (0, 0)
+        )), C0, C1)
+        d2 = Homomorphism(SparseMatrix((
+            (0, 1, 0, 0),
+            (0, 0, 0, 1)
+        )), C1, C2)
+        cochain_complex = CochainComplex(
+            modules=[C0, C1, C2],
+            homomorphisms=[d1, d2]
+        )
+        H = cohomology(cochain_complex)
+        self.assertTrue(H[1].is_identical_to(TorsionCyclicZModule(2)))
+        representatives = H[1].representative_cocycles()
+        self.assertEqual(len(representatives), 1)
+        self.assertTrue(d2.apply(representatives[0]).is_zero())
+        self.assertIsNone(d1.preimage(representatives[0]))
+        self.assertIsNotNone(d1.preimage(2 * representatives[0]))
+
+    def test_quotient_generators(self):
+        Zsquare = ZModule.free(2)
+        cochain_complex = CochainComplex(
+            modules=[Zsquare, Zsquare],
+            homomorphisms=[Homomorphism([
+                [-2, 2],
+                [0, 0],
+            ], Zsquare, Zsquare)]
+        )
+        H = cohomology(cochain_complex)
+        self.assertIs(H[0].original_module, Zsquare)
+        self.assertEqual(
+            [element.coordinates for element in H[0].quotient_generators],
+            [(1, 1)]
+        )
+
+    def test_pickle(self):
+        C0 = ZModule(1, [2])
+        C1 = ZModule(2, [2, 4])
+        C2 = ZModule(1, [4])
+        d1 = Homomorphism((
+            (2, 0),
+            (0, 0),
+            (0, 1),
+            (0, 0)
+        ), C0, C1)
+        d2 = Homomorphism((
+            (0, 1, 0, 0),
+            (0, 0, 0, 1)
+        ), C1, C2)
+        cochain_complex = CochainComplex(
+            modules=[C0, C1, C2],
+            homomorphisms=[d1, d2]
+        )
+        # Representatives are found only after unpickling
+        H = pickle.loads(pickle.dumps(cohomology(cochain_complex)))
+        self.assertTrue(H[1].is_identical_to(TorsionCyclicZModule(2)))
+        representatives = H[1].representative_cocycles()
+        self.assertEqual(len(representatives), 1)
+        self.assertTrue(d2.apply(representatives[0]).is_zero())
+        self.assertIsNone(d1.preimage(representatives[0]))
+
+    def test_workers(self):
+        Z = ZModule.free(1)
+        Zsquare = ZModule.free(2)
+        C2 = ZModule(1, [4])
+        d1 = Homomorphism([
+            [2],
+            [0],
+        ], Z, Zsquare)
+        d2 = Homomorphism([
+            [0, 1],
+            [0, 0],
+        ], Zsquare, C2)
+        cochain_complex = CochainComplex(
+            modules=[Z, Zsquare, C2],
+            homomorphisms=[d1, d2]
+        )
+        expected = cohomology(cochain_complex)
+        H = cohomology(cochain_complex, workers=2)
+        self.assertEqual(len(H), 3)
+        for group, expected_group in zip(H, expected):
+            self.assertTrue(group.is_identical_to(expected_group))
+        self.assertTrue(H[1].is_identical_to(TorsionCyclicZModule(2)))
+        self.assertTrue(H[2].is_identical_to(TorsionCyclicZModule(4)))
+
+    def test_workers_memoize_invariants(self):
+        Zsquare = ZModule.free(2)
+        d = Homomorphism([
+            [2, 0],
+            [0, 0]
+        ], Zsquare, Zsquare)
+        cochain_complex = CochainComplex([Zsquare, Zsquare], [d])
+        self.assertFalse(d.has_smith_normal_form_invariants())
+
+        cohomology(cochain_complex, workers=2, collapse=False)
+
+        self.assertTrue(d.has_smith_normal_form_invariants())
+        self.assertEqual(d.smith_normal_form_invariants().diagonal, (2,))
+
+    def test_workers_without_tasks_start_no_pool(self):
+        Zsquare = ZModule.free(2)
+        d = Homomorphism([
+            [2, 0],
+            [0, 0]
+        ], Zsquare, Zsquare)
+        cochain_complex = CochainComplex([Zsquare, Zsquare], [d])
+        expected = cohomology(cochain_complex, collapse=False)
+        executor = cohomology_module.ProcessPoolExecutor
+
+        def no_executor(*args, **kwargs):
+            raise AssertionError("a pool was started without tasks")
+
+        cohomology_module.ProcessPoolExecutor = no_executor  # type: ignore
+        try:
+            H = cohomology(cochain_complex, workers=4, collapse=False)
+        finally:
+            cohomology_module.ProcessPoolExecutor = executor
+        for group, expected_group in zip(H, expected):
+            self.assertTrue(group.is_identical_to(expected_group))
+
+    def test_workers_invalid(self):
+        Z = FreeCyclicZModule()
+        cochain_complex = CochainComplex(
+            modules=[Z],
+            homomorphisms=[]
+        )
+        with self.assertRaises(ValueError):
+            cohomology(cochain_complex, workers=0)
+
+
+    def test_stream(self):
+        C0 = ZModule(1, [2])
+        C1 = ZModule(2, [2, 4])
+        C2 = ZModule(1, [4])
+        Z = FreeCyclicZModule()
+        free = CochainComplex(
+            modules=[Z, Z], homomorphisms=[Homomorphism([[3]], Z, Z)]
+        ).left_pad()
+        torsion = CochainComplex(
+            modules=[C0, C1, C2],
+            homomorphisms=[
+                Homomorphism(((2, 0), (0, 0), (0, 1), (0, 0)), C0, C1),
+                Homomorphism(((0, 1, 0, 0), (0, 0, 0, 1)), C1, C2)
+            ]
+        )
+        for cochain_complex in (free, torsion):
+            expected = cohomology(cochain_complex)
+            H = list(cohomology_stream(
+                StreamingCochainComplex.from_complex(cochain_complex)
+            ))
+            self.assertEqual(len(H), len(expected))
+            for group, expected_group in zip(H, expected):
+                self.assertTrue(group.is_identical_to(expected_group))
+
+    def test_stream_representatives(self):
+        Zsquare = ZModule.free(2)
+        d = Homomorphism([
+            [-2, 2],
+            [0, 0],
+        ], Zsquare, Zsquare)
+        H = list(cohomology_stream([d, Homomorphism.zero(Zsquare, Zsquare)],
+                                   representatives=True))
+        self.assertEqual(
+            [element.coordinates
+             for element in H[0].representative_cocycles()],
+            [(1, 1)]
+        )
+        self.assertEqual(len(H[1].representative_cocycles()), 2)
+
+        H = list(cohomology_stream([d]))
+        with self.assertRaises(RuntimeError):
+            H[0].representative_cocycles()
+
+    def test_stream_torsion_representatives(self):
+        C0 = ZModule(1, [2])
+        C1 = ZModule(1, [4])
+        d = Homomorphism([
+            [2, 0],
+            [0, 2]
+        ], C0, C1)
+        H = list(cohomology_stream([d, Homomorphism.zero(C1, C1)]))
+        self.assertTrue(H[1].is_identical_to(ZModule(0, [2, 2])))
+        for group in H:
+            with self.assertRaises(RuntimeError):
+                group.representative_cocycles()
+
+        H = list(cohomology_stream([d, Homomorphism.zero(C1, C1)],
+                                   representatives=True))
+        self.assertEqual(len(H[1].representative_cocycles()), 2)
+
+    def test_stream_releases_differentials(self):
+        Z = ZModule.free(1)
+        references: list[weakref.ref[Homomorphism]] = []
+
+        def differential(degree: int) -> Homomorphism | None:
+            if degree == 4:
+                return None
+            homomorphism = Homomorphism([[0]], Z, Z)
+            references.append(weakref.ref(homomorphism))
+            return homomorphism
+
+        H = cohomology_stream(
+            StreamingCochainComplex.from_callback(differential)
+        )
+        for degree, group in enumerate(H):
+            self.assertTrue(group.is_identical_to(Z))
+            # Only d_{n-1} and d_n are alive while H^n is looked at
+            self.assertEqual(
+                [reference() is not None for reference in references],
+                [index >= degree - 1 for index in range(degree + 1)]
+            )
+
+
+    def test_session(self):
+        Z = FreeCyclicZModule()
+        C1 = ZModule(1, [4])
+        d0 = Homomorphism([[0]], Z, Z)
+        d1 = Homomorphism([[2], [0]], Z, C1)
+        d2 = Homomorphism([[0, 1]], C1, ZModule(0, [4]))
+        cochain_complex = CochainComplex(
+            modules=[Z, Z, C1], homomorphisms=[d0, d1, d2]
+        ).left_pad()
+        session = CohomologySession(cochain_complex)
+        before = session.cohomology()
+        for group, expected in zip(before, cohomology(cochain_complex)):
+            self.assertTrue(group.is_identical_to(expected))
+
+        session.replace(2, Homomorphism([[3], [0]], Z, C1))
+        after = session.cohomology()
+        expected = cohomology(session.cochain_complex)
+        for group, expected_group in zip(after, expected):
+            self.assertTrue(group.is_identical_to(expected_group))
+        # Only the degrees next to the replaced differential are new
+        self.assertEqual(
+            [group is previous for group, previous in zip(after, before)],
+            [True, True, False, False]
+        )
+        self.assertTrue(after[3].is_identical_to(TorsionCyclicZModule(3)))
+        self.assertFalse(before[3].is_identical_to(after[3]))
+
+    def test_session_representatives(self):
+        Zsquare = ZModule.free(2)
+        session = CohomologySession(CochainComplex(
+            modules=[Zsquare, Zsquare],
+            homomorphisms=[Homomorphism([
+                [-2, 2],
+                [0, 0],
+            ], Zsquare, Zsquare)]
+        ))
+        before = session.cohomology()
+        session.replace(0, Homomorphism([
+            [1, 0],
+            [0, 0],
+        ], Zsquare, Zsquare))
+        after = session.cohomology()
+        self.assertEqual(
+            [element.coordinates
+             for element in before[0].representative_cocycles()],
+            [(1, 1)]
+        )
+        self.assertEqual(
+            [element.coordinates
+             for element in after[0].representative_cocycles()],
+            [(0, 1)]
+        )
+
+    def test_session_invalid(self):
+        Z = FreeCyclicZModule()
+        session = CohomologySession(CochainComplex(
+            modules=[Z, Z], homomorphisms=[Homomorphism([[3]], Z, Z)]
+        ))
+        with self.assertRaises(ValueError):
+            session.replace(0, Homomorphism([[3, 0]]))
+        with self.assertRaises(ValueError):
+            session.replace(2, Homomorphism.zero(Z, Z))
+
 
 if __name__ == '__main__':
     unittest.main()
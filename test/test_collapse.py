@@ -0,0 +1,137 @@
+import unittest
+from module_theory.zmodule import ZModule
+from module_theory.homomorphism import Homomorphism
+from module_theory.cochain_complex import CochainComplex
+from module_theory.collapse import collapse_unit_pairs, has_unit_pair
+from module_theory.cohomology import cohomology
+from module_theory._internal.sparse_matrix import SparseMatrix
+
+
+class TestCollapse(unittest.TestCase):
+    def test_schur_complement(self):
+        Zsquare = ZModule.free(2)
+        d = Homomorphism([
+            [1, 2],
+            [3, 4]
+        ], Zsquare, Zsquare)
+        collapsed = collapse_unit_pairs(
+            CochainComplex([Zsquare, Zsquare], [d])
+        )
+        Z = ZModule.free(1)
+        self.assertEqual(collapsed.collapsed_pair_count(), 1)
+        self.assertTrue(collapsed.modules[0].is_identical_to(Z))
+        self.assertTrue(collapsed.modules[1].is_identical_to(Z))
+        self.assertEqual(collapsed.homomorphisms[0].matrix, ((-2,),))
+        self.assertEqual(
+            collapsed.lift(0, Z.element([1])).coordinates, (-2, 1)
+        )
+        self.assertEqual(
+            collapsed.lift(1, Z.element([1])).coordinates, (0, 1)
+        )
+
+    def test_torsion_rows(self):
+        Zsquare = ZModule.free(2)
+        C1 = ZModule(1, [4])
+        d = Homomorphism([
+            [1, 3],
+            [3, 2]
+        ], Zsquare, C1)
+        collapsed = collapse_unit_pairs(CochainComplex([Zsquare, C1], [d]))
+        self.assertTrue(collapsed.modules[1].is_identical_to(ZModule(0, [4])))
+        self.assertEqual(collapsed.homomorphisms[0].matrix, ((1,),))
+
+    def test_cycle_graph(self):
+        # The coboundary of a cycle with six vertices and six edges
+        size = 6
+        module = ZModule.free(size)
+        d = Homomorphism(SparseMatrix.from_entries(size, size, [
+            entry for edge in range(size)
+            for entry in ((edge, edge, -1), (edge, (edge + 1) % size, 1))
+        ]), module, module)
+        cochain_complex = CochainComplex([module, module], [d])
+        collapsed = collapse_unit_pairs(cochain_complex)
+
+        self.assertEqual(collapsed.collapsed_pair_count(), size - 1)
+        self.assertTrue(collapsed.homomorphisms[0].is_sparse())
+        self.assertTrue(collapsed.homomorphisms[0].is_zero())
+        for group, expected in zip(
+            cohomology(cochain_complex),
+            cohomology(cochain_complex, collapse=False)
+        ):
+            self.assertTrue(group.is_identical_to(expected))
+
+        H = cohomology(cochain_complex)
+        cocycles = H[0].representative_cocycles()
+        self.assertEqual(len(cocycles), 1)
+        self.assertTrue(d.apply(cocycles[0]).is_zero())
+        self.assertNotEqual(cocycles[0].coordinates, (0,) * size)
+        cocycles = H[1].representative_cocycles()
+        self.assertEqual(len(cocycles), 1)
+        self.assertTrue(cocycles[0].module.is_identical_to(module))
+        self.assertIsNone(d.preimage(cocycles[0]))
+
+    def test_no_unit_pairs(self):
+        Z = ZModule.free(1)
+        cochain_complex = CochainComplex(
+            [Z, Z], [Homomorphism([[2]], Z, Z)]
+        )
+        collapsed = collapse_unit_pairs(cochain_complex)
+        self.assertEqual(collapsed.collapsed_pair_count(), 0)
+        self.assertEqual(collapsed.homomorphisms[0].matrix, ((2,),))
+        self.assertIs(collapsed.original, cochain_complex)
+
+    def test_has_unit_pair(self):
+        Z = ZModule.free(1)
+        C1 = ZModule(1, [4])
+        self.assertFalse(has_unit_pair(CochainComplex(
+            [Z, Z], [Homomorphism([[2]], Z, Z)]
+        )))
+        # Units into torsion generators or in the last differential do not
+        # pair free generators
+        self.assertFalse(has_unit_pair(CochainComplex(
+            [Z, ZModule(0, [4])], [Homomorphism([[1]], Z, ZModule(0, [4]))]
+        )))
+        self.assertFalse(has_unit_pair(CochainComplex(
+            [Z], [Homomorphism([[1]], Z, Z)]
+        )))
+        self.assertTrue(has_unit_pair(CochainComplex(
+            [ZModule.free(2), C1], [Homomorphism([[3, -1], [1, 2]],
+                                                 ZModule.free(2), C1)]
+        )))
+        self.assertTrue(has_unit_pair(CochainComplex(
+            [Z, Z], [Homomorphism(SparseMatrix([[-1]]), Z, Z)]
+        )))
+
+    def test_cohomology_skips_collapse_without_unit_pairs(self):
+        Z = ZModule.free(1)
+        cochain_complex = CochainComplex(
+            [Z, Z], [Homomorphism([[2]], Z, Z)]
+        )
+        cohomology(cochain_complex)
+        self.assertIsNone(cochain_complex._collapsed)
+
+    def test_collapse_is_memoized(self):
+        Zsquare = ZModule.free(2)
+        cochain_complex = CochainComplex([Zsquare, Zsquare], [Homomorphism([
+            [1, 2],
+            [3, 4]
+        ], Zsquare, Zsquare)])
+        collapsed = cochain_complex.collapsed()
+        self.assertIs(cochain_complex.collapsed(), collapsed)
+
+        cohomology(cochain_complex)
+        self.assertTrue(
+            collapsed.homomorphisms[0].has_smith_normal_form_invariants()
+        )
+
+    def test_lift_invalid(self):
+        Z = ZModule.free(1)
+        collapsed = collapse_unit_pairs(CochainComplex(
+            [Z, Z], [Homomorphism([[1]], Z, Z)]
+        ))
+        with self.assertRaises(ValueError):
+            collapsed.lift(0, Z.element([1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
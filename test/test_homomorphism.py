@@ -1,6 +1,7 @@
 import unittest
 from module_theory.zmodule import ZModule
 from module_theory.homomorphism import Homomorphism
+from module_theory._internal.sparse_matrix import SparseMatrix
 
 
 class TestHomomorphism(unittest.TestCase):
@@ -113,6 +114,36 @@ class TestHomomorphism(unittest.TestCase):
         image_of_preimage = homomorphism.apply(preimage)
         self.assertEqual(image_of_preimage.coordinates, image.coordinates)
 
+    def test_preimage_many(self):
+        module = ZModule.free(3)
+        homomorphism = Homomorphism((
+            (1, 2, 3),
+            (4, 5, 6),
+            (7, 8, 9)
+        ))
+        images = [
+            homomorphism.apply(module.element(coordinates))
+            for coordinates in ((1, 2, 3), (0, -1, 4), (2, 0, 0))
+        ]
+        elements = [images[0], module.element([1, 0, 0]), *images[1:]]
+
+        preimages = homomorphism.preimage_many(elements)
+
+        self.assertIsNone(preimages[1])
+        for element, preimage in zip(elements, preimages):
+            if preimage is None:
+                continue
+            self.assertEqual(homomorphism.apply(preimage).coordinates,
+                             element.coordinates)
+        self.assertEqual(
+            [preimage and preimage.coordinates for preimage in preimages],
+            [
+                preimage and preimage.coordinates
+                for preimage in map(homomorphism.preimage, elements)
+            ]
+        )
+        self.assertEqual(homomorphism.preimage_many([]), [])
+
     def test_torsion_submatrix_trivial(self):
         module = ZModule.free(4)
         homomorphism = Homomorphism.identity(module)
@@ -216,5 +247,136 @@ class TestHomomorphism(unittest.TestCase):
         )
 
 
+    def test_sparse_normalize(self):
+        A = ZModule(2, [2, 4, 8])
+        B = ZModule(1, [2, 4])
+        matrix = [[1, 2, 3, 4, 5],
+                  [6, 7, 8, 9, 10],
+                  [-1, -2, -3, -4, -5]]
+        homomorphism = Homomorphism(SparseMatrix(matrix), A, B)
+        self.assertTrue(homomorphism.is_sparse())
+        self.assertEqual(homomorphism.sparse_matrix().nonzero_count(), 11)
+        self.assertEqual(homomorphism.matrix, ((1, 2, 3, 4, 5),
+                                               (0, 1, 0, 1, 0),
+                                               (3, 2, 1, 0, 3)))
+
+    def test_sparse_dimension_mismatch(self):
+        with self.assertRaises(ValueError):
+            Homomorphism(SparseMatrix.identity(2), ZModule.free(3))
+
+    def test_sparse_matches_dense(self):
+        domain = ZModule(1, [4])
+        codomain = ZModule(1, [2])
+        matrix = (
+            (2, 0),
+            (0, 1)
+        )
+        dense = Homomorphism(matrix, domain, codomain)
+        sparse = Homomorphism(SparseMatrix(matrix), domain, codomain)
+        element = domain.element([3, 1])
+
+        self.assertEqual(sparse.apply(element).coordinates,
+                         dense.apply(element).coordinates)
+        self.assertEqual(
+            [generator.coordinates for generator
+             in sparse.kernel_generators()],
+            [generator.coordinates for generator
+             in dense.kernel_generators()]
+        )
+        preimage = sparse.preimage(codomain.element([4, 1]))
+        self.assertIsNotNone(preimage)
+        if preimage is None:
+            raise RuntimeError
+        self.assertEqual(sparse.apply(preimage).coordinates, (4, 1))
+
+    def test_sparse_compose(self):
+        module = ZModule.free(2)
+        left = Homomorphism(SparseMatrix([[1, 2], [0, 1]]), module, module)
+        right = Homomorphism(SparseMatrix([[1, -2], [0, 1]]), module, module)
+        composition = left.compose(right)
+        self.assertTrue(composition.is_sparse())
+        self.assertEqual(composition.matrix,
+                         Homomorphism.identity(module).matrix)
+
+    def test_smith_normal_form_invariants(self):
+        homomorphism = Homomorphism((
+            (3, 2, 3),
+            (0, 2, 0),
+            (2, 2, 2)
+        ))
+        invariants = homomorphism.smith_normal_form_invariants()
+        self.assertEqual(invariants.diagonal, (1, 2))
+        self.assertEqual(invariants.rank, 2)
+        sparse_homomorphism = Homomorphism(SparseMatrix(homomorphism.matrix))
+        self.assertEqual(sparse_homomorphism.smith_normal_form_invariants(),
+                         invariants)
+
+    def test_from_normalized_matrix(self):
+        domain = ZModule(1, [4])
+        codomain = ZModule(1, [6])
+        # The Z/4 generator goes to 3 in Z/6, which 4 sends to 0
+        matrix = ((1, 0), (2, 3))
+        homomorphism = Homomorphism.from_normalized_matrix(
+            matrix, domain, codomain
+        )
+        self.assertIs(homomorphism.matrix, matrix)
+        self.assertEqual(
+            homomorphism.compose(Homomorphism.identity(domain)).matrix,
+            Homomorphism(matrix, domain, codomain).matrix
+        )
+        self.assertFalse(hasattr(homomorphism, "__dict__"))
+
+    def test_from_normalized_sparse_matrix(self):
+        domain = ZModule(1, [4])
+        codomain = ZModule(1, [6])
+        matrix = SparseMatrix(((1, 0), (2, 3)))
+        homomorphism = Homomorphism.from_normalized_sparse_matrix(
+            matrix, domain, codomain
+        )
+        self.assertIs(homomorphism.sparse_matrix(), matrix)
+        self.assertEqual(homomorphism.matrix, ((1, 0), (2, 3)))
+
+    def test_zero_is_shared(self):
+        domain = ZModule(1, [2])
+        codomain = ZModule.free(2)
+        self.assertIs(Homomorphism.zero(domain, codomain),
+                      Homomorphism.zero(ZModule(1, [2]), ZModule.free(2)))
+
+    def test_compose_reduces_torsion(self):
+        module = ZModule(1, [4])
+        homomorphism = Homomorphism(((1, 0), (3, 3)), module, module)
+        self.assertEqual(homomorphism.compose(homomorphism).matrix,
+                         ((1, 0), (0, 1)))
+
+    def test_apply_many(self):
+        domain = ZModule(2, [6])
+        codomain = ZModule(1, [4, 3])
+        matrix = (
+            (1, 2, 0),
+            (3, -1, 2),
+            (0, 1, 1)
+        )
+        dense = Homomorphism(matrix, domain, codomain)
+        sparse = Homomorphism(SparseMatrix(matrix), domain, codomain)
+        # Enough elements for the vectorized path as well
+        coordinates = [
+            (index, 2 * index - 7, index % 6) for index in range(40)
+        ]
+        expected = [
+            dense.apply(domain.element(row)).coordinates
+            for row in coordinates
+        ]
+
+        self.assertEqual(dense.apply_many(coordinates), expected)
+        self.assertEqual(dense.apply_many(coordinates[:3]), expected[:3])
+        self.assertEqual(sparse.apply_many(coordinates), expected)
+        self.assertEqual(dense.apply_many([]), [])
+
+    def test_apply_many_dimension_mismatch(self):
+        homomorphism = Homomorphism(((1, 2),))
+        with self.assertRaises(ValueError):
+            homomorphism.apply_many([(1, 2), (1, 2, 3)])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from module_theory.zmodule import ZModule
+from module_theory.simplicial_complex import SimplicialComplex
+from module_theory.cohomology import cohomology
+
+# The six-vertex triangulation of the real projective plane
+PROJECTIVE_PLANE = [
+    (1, 2, 3), (1, 3, 4), (1, 4, 5), (1, 5, 6), (1, 6, 2),
+    (2, 3, 5), (3, 4, 6), (4, 5, 2), (5, 6, 3), (6, 2, 4)
+]
+
+
+class TestSimplicialComplex(unittest.TestCase):
+    def test_triangle(self):
+        complex_ = SimplicialComplex([("a", "b", "c")])
+        self.assertEqual(complex_.dimension(), 2)
+        self.assertEqual(
+            [complex_.face_count(dimension) for dimension in range(4)],
+            [3, 3, 1, 0]
+        )
+        self.assertEqual(list(complex_.faces(0)), [("a",), ("b",), ("c",)])
+        self.assertEqual(list(complex_.faces(1)),
+                         [("a", "b"), ("a", "c"), ("b", "c")])
+        self.assertEqual(list(complex_.faces(2)), [("a", "b", "c")])
+
+        cochain_complex = complex_.cochain_complex()
+        self.assertTrue(all(homomorphism.is_sparse()
+                            for homomorphism in cochain_complex.homomorphisms))
+        self.assertEqual(cochain_complex.homomorphisms[0].matrix, (
+            (-1, 1, 0),
+            (-1, 0, 1),
+            (0, -1, 1)
+        ))
+        self.assertEqual(cochain_complex.homomorphisms[1].matrix,
+                         ((1, -1, 1),))
+
+    def test_shared_faces(self):
+        complex_ = SimplicialComplex([(0, 1, 2), (1, 2, 3), (3, 4)])
+        self.assertEqual(
+            [complex_.face_count(dimension) for dimension in range(3)],
+            [5, 6, 2]
+        )
+        self.assertIn((3, 4), list(complex_.faces(1)))
+
+    def test_sphere(self):
+        complex_ = SimplicialComplex(
+            facet for facet in [(0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)]
+        )
+        H = cohomology(complex_.cochain_complex())
+        self.assertTrue(H[0].is_identical_to(ZModule.free(1)))
+        self.assertTrue(H[1].is_zero())
+        self.assertTrue(H[2].is_identical_to(ZModule.free(1)))
+
+    def test_torus(self):
+        size = 4
+        complex_ = SimplicialComplex(
+            facet
+            for row in range(size) for column in range(size)
+            for facet in (
+                ((row, column), ((row + 1) % size, column),
+                 ((row + 1) % size, (column + 1) % size)),
+                ((row, column), (row, (column + 1) % size),
+                 ((row + 1) % size, (column + 1) % size))
+            )
+        )
+        H = cohomology(complex_.cochain_complex())
+        self.assertTrue(H[0].is_identical_to(ZModule.free(1)))
+        self.assertTrue(H[1].is_identical_to(ZModule.free(2)))
+        self.assertTrue(H[2].is_identical_to(ZModule.free(1)))
+
+    def test_projective_plane(self):
+        cochain_complex = SimplicialComplex(
+            PROJECTIVE_PLANE
+        ).cochain_complex()
+        H = cohomology(cochain_complex)
+        self.assertTrue(H[0].is_identical_to(ZModule.free(1)))
+        self.assertTrue(H[1].is_zero())
+        self.assertTrue(H[2].is_identical_to(ZModule(0, [2])))
+        for group, expected in zip(
+            H, cohomology(cochain_complex, collapse=False)
+        ):
+            self.assertTrue(group.is_identical_to(expected))
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "facets.txt")
+            with open(path, "w") as file:
+                file.write("# The real projective plane\n\n")
+                for facet in PROJECTIVE_PLANE:
+                    file.write(" ".join(map(str, facet)) + "\n")
+            complex_ = SimplicialComplex.from_file(path)
+        self.assertEqual(
+            [complex_.face_count(dimension) for dimension in range(3)],
+            [6, 15, 10]
+        )
+        self.assertEqual(list(complex_.faces(0))[:2], [(1,), (2,)])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            SimplicialComplex([(0, 1, 1)])
+        with self.assertRaises(ValueError):
+            SimplicialComplex([()])
+        with self.assertRaises(ValueError):
+            SimplicialComplex().cochain_complex()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
+import pickle
 import unittest
 from module_theory.zmodule import ZModule
+from module_theory.cyclic_zmodule import TorsionCyclicZModule
 
 
 class TestZModule(unittest.TestCase):
@@ -139,6 +141,105 @@ class TestZModule(unittest.TestCase):
         element = module.element([0, 0, 1, 3])
         self.assertEqual(element.order(), 12)
 
+    def test_element_is_slotted(self):
+        module = ZModule(1, [3])
+        element = module.element([1, 2])
+        self.assertFalse(hasattr(module, "__dict__"))
+        self.assertFalse(hasattr(element, "__dict__"))
+        self.assertEqual((element + element).coordinates, (2, 1))
+        self.assertEqual((2 * element).coordinates, (2, 1))
+
+    def test_interned(self):
+        module = ZModule(2, [3, 4])
+        self.assertIs(ZModule(2, (3, 4)), module)
+        self.assertIs(ZModule.free(2), ZModule(rank=2, torsion_numbers=[]))
+        self.assertIs(ZModule.zero(), ZModule(0, ()))
+        self.assertIs(pickle.loads(pickle.dumps(module)), module)
+        self.assertEqual(len({module, ZModule(2, [3, 4]), ZModule.zero()}),
+                         2)
+
+    def test_immutable(self):
+        module = ZModule(2, [3])
+        with self.assertRaises(AttributeError):
+            module.rank = 3
+        with self.assertRaises(ValueError):
+            ZModule(1, [1])
+
+    def test_subclass_shares_interned_base(self):
+        cyclic = TorsionCyclicZModule(4)
+        self.assertIsNot(cyclic, ZModule(0, [4]))
+        self.assertEqual(cyclic.torsion, 4)
+        self.assertTrue(cyclic.is_identical_to(ZModule(0, [4])))
+        self.assertEqual(cyclic, ZModule(0, [4]))
+        self.assertEqual(hash(cyclic), hash(ZModule(0, [4])))
+        self.assertFalse(cyclic.is_identical_to(TorsionCyclicZModule(2)))
+
+    def test_derived_data_memoized(self):
+        module = ZModule(1, [3])
+        self.assertIs(module.zero_element(), module.zero_element())
+        generators = module.canonical_generators()
+        generators.pop()
+        self.assertEqual(len(module.canonical_generators()), 2)
+        self.assertIs(module.canonical_generators()[0], generators[0])
+
+    def test_element_batch_round_trip(self):
+        module = ZModule(1, [3, 4])
+        elements = [
+            module.element([5, 4, -1]),
+            module.element([0, 0, 0]),
+            module.element([-2, 3, 6])
+        ]
+        batch = ZModule.ElementBatch.from_elements(module, elements)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(
+            [element.coordinates for element in batch.to_elements()],
+            [element.coordinates for element in elements]
+        )
+        self.assertEqual(batch[-1].coordinates, (-2, 0, 2))
+
+    def test_element_batch_arithmetic(self):
+        module = ZModule(1, [3, 4])
+        left = module.element_batch([[1, 2, 3], [0, 1, 1]])
+        right = module.element_batch([[2, 2, 2], [0, 2, 3]])
+        self.assertEqual(list((left + right).rows()),
+                         [(3, 1, 1), (0, 0, 0)])
+        self.assertEqual(list((3 * left).rows()),
+                         [(3, 0, 1), (0, 0, 3)])
+        self.assertEqual(list((left - right).rows()),
+                         [(-1, 0, 1), (0, 2, 2)])
+
+    def test_element_batch_masks(self):
+        module = ZModule(2, [3, 3, 18])
+        batch = module.element_batch([
+            [0, 0, 0, 0, 0],
+            [-3, 0, 1, 2, 3],
+            [0, 0, 0, 0, 15],
+            [0, 0, 1, 0, 0]
+        ])
+        self.assertEqual(batch.is_zero(), [True, False, False, False])
+        self.assertEqual(batch.order(), [1, None, 6, 3])
+
+    def test_element_batch_promotion(self):
+        module = ZModule.free(1)
+        batch = module.element_batch([[2 ** 61], [1]])
+        self.assertFalse(batch.is_promoted())
+        batch = batch * 4
+        self.assertTrue(batch.is_promoted())
+        self.assertEqual(list(batch.rows()), [(2 ** 63,), (4,)])
+
+    def test_element_batch_large_multiplier(self):
+        module = ZModule(1, [5])
+        batch = module.element_batch([[0, 0], [1, 3]]) * 2 ** 64
+        self.assertTrue(batch.is_promoted())
+        self.assertEqual(list(batch.rows()), [(0, 0), (2 ** 64, 3)])
+        # Small values are stored as int64 again
+        self.assertFalse((batch * 0).is_promoted())
+
+    def test_element_batch_dimension_mismatch(self):
+        with self.assertRaises(ValueError):
+            ZModule.free(2).element_batch([[1, 2], [3]])
+
+
 
 if __name__ == '__main__':
     unittest.main()